@@ -1,6 +1,36 @@
+import functools
+
 import streamlit as st
 from src.pipeline.predict_pipeline import CustomData, PredictPipeline
 
+PREDICTION_MEMO_SIZE = 4096
+
+@st.cache_resource
+def get_predict_pipeline():
+    # One pipeline (and loaded model) shared by every session of this server.
+    predict_pipeline = PredictPipeline()
+    predict_pipeline.load_artifacts()
+    return predict_pipeline
+
+
+@st.cache_resource
+def get_memoized_predict():
+    predict_pipeline = get_predict_pipeline()
+
+    # The model version is part of the key, so a retrain never serves stale
+    # predictions; old entries just age out of the LRU.
+    @functools.lru_cache(maxsize=PREDICTION_MEMO_SIZE)
+    def memoized_predict(model_version, key):
+        return float(predict_pipeline.predict_record(dict(key))[0])
+
+    return memoized_predict
+
+
+def predict_with_memo(data):
+    predict_pipeline = get_predict_pipeline()
+    return get_memoized_predict()(predict_pipeline.model_version(), data.normalized_key())
+
+
 # --- Page Configuration ---
 st.set_page_config(
     page_title="EduPredict — Math Score Predictor",
@@ -218,9 +248,8 @@ if submitted:
             )
             pred_df = data.get_data_as_data_frame()
 
-            predict_pipeline = PredictPipeline()
             with st.spinner('🔍 Analyzing student data...'):
-                results = predict_pipeline.predict(pred_df)
+                results = [predict_with_memo(data)]
 
             st.markdown(f"""
                 <div class="success-prediction">
@@ -243,6 +272,17 @@ if submitted:
             with st.expander("📊 Show prediction details"):
                 st.write("Model Input Data:", pred_df)
                 st.write("Raw Prediction Output:", results)
+                memo_info = get_memoized_predict().cache_info()
+                artifact_stats = get_predict_pipeline().registry.stats()
+                st.write("Cache Statistics:", {
+                    "prediction_memo_hits": memo_info.hits,
+                    "prediction_memo_misses": memo_info.misses,
+                    "prediction_memo_size": f"{memo_info.currsize} / {memo_info.maxsize}",
+                    "artifact_cache_hits": artifact_stats["hits"],
+                    "artifact_cache_misses": artifact_stats["misses"],
+                    "artifact_reloads": artifact_stats["reloads"],
+                    "last_artifact_load_ms": round(artifact_stats["last_load_seconds"] * 1000, 1),
+                })
 
         except Exception as e:
             err_str = str(e)
@@ -0,0 +1,156 @@
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from aiohttp import web
+
+from src.exception import InvalidInputError
+from src.logger import logging
+from src.pipeline.predict_pipeline import FEATURE_COLUMNS, PredictPipeline
+
+
+@dataclass
+class AsyncAppConfig:
+    host: str = "0.0.0.0"
+    port: int = 8080
+    # "thread" shares one process-wide artifact cache; "process" sidesteps
+    # the GIL at the cost of one model copy per worker.
+    executor: str = "thread"
+    max_workers: int = os.cpu_count() or 1
+    # Requests allowed in flight (running or waiting for a worker). Beyond
+    # this requests are turned away with 503 instead of queueing unboundedly.
+    max_pending: int = 256
+    max_batch_records: int = 100000
+    keepalive_timeout: float = 75.0
+
+
+_worker_pipeline = None
+
+
+def _predict_records(records):
+    # Runs inside the executor; each worker process keeps its own pipeline.
+    global _worker_pipeline
+    if _worker_pipeline is None:
+        _worker_pipeline = PredictPipeline()
+    if len(records) == 1:
+        return _worker_pipeline.predict_record(records[0]).tolist()
+    return _worker_pipeline.predict_batch(records).tolist()
+
+
+def _validate(record):
+    if not isinstance(record, dict):
+        raise ValueError("Each record must be a JSON object")
+    missing = [column for column in FEATURE_COLUMNS if record.get(column) is None]
+    if missing:
+        raise ValueError(f"Missing fields: {', '.join(missing)}")
+    for column in ("reading_score", "writing_score"):
+        if not 0 <= float(record[column]) <= 100:
+            raise ValueError(f"{column} must be between 0 and 100")
+    return record
+
+
+class ServerBusy(Exception):
+    pass
+
+
+async def _run(request, records):
+    app = request.app
+    if app["pending"].locked():
+        raise ServerBusy()
+    async with app["pending"]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(app["executor"], _predict_records, records)
+
+
+async def predict(request):
+    try:
+        record = _validate(await request.json())
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=400)
+    try:
+        preds = await _run(request, [record])
+    except ServerBusy:
+        return web.json_response({"error": "Server busy, retry later"}, status=503)
+    except InvalidInputError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except Exception as e:
+        logging.info(f"Async prediction failed: {e}")
+        return web.json_response({"error": "Internal error during prediction"}, status=500)
+    return web.json_response({"prediction": preds[0]})
+
+
+async def predict_batch(request):
+    try:
+        payload = await request.json()
+        records = payload.get("records") if isinstance(payload, dict) else payload
+        if not isinstance(records, list) or not records:
+            raise ValueError("Send a non-empty JSON list of records")
+        if len(records) > request.app["config"].max_batch_records:
+            raise ValueError(f"At most {request.app['config'].max_batch_records} records per request")
+        records = [_validate(record) for record in records]
+    except Exception as e:
+        return web.json_response({"error": str(e)}, status=400)
+    try:
+        preds = await _run(request, records)
+    except ServerBusy:
+        return web.json_response({"error": "Server busy, retry later"}, status=503)
+    except InvalidInputError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except Exception as e:
+        logging.info(f"Async batch prediction failed: {e}")
+        return web.json_response({"error": "Internal error during batch prediction"}, status=500)
+    return web.json_response({"predictions": preds, "rows": len(preds)})
+
+
+async def health(request):
+    return web.json_response({"status": "ok"})
+
+
+async def _on_startup(app):
+    # Load the artifacts before the first request instead of during it.
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(app["executor"], PredictPipeline().load_artifacts)
+
+
+async def _on_cleanup(app):
+    app["executor"].shutdown(wait=True)
+
+
+def create_app(config=None):
+    config = config or AsyncAppConfig()
+    app = web.Application()
+    app["config"] = config
+    if config.executor == "process":
+        app["executor"] = ProcessPoolExecutor(max_workers=config.max_workers)
+    else:
+        app["executor"] = ThreadPoolExecutor(max_workers=config.max_workers)
+    app["pending"] = asyncio.Semaphore(config.max_pending)
+
+    app.router.add_get("/health", health)
+    app.router.add_post("/predict", predict)
+    app.router.add_post("/predict_batch", predict_batch)
+    if config.executor == "thread":
+        app.on_startup.append(_on_startup)
+    app.on_cleanup.append(_on_cleanup)
+    return app
+
+
+def main(argv=None):
+    config = AsyncAppConfig()
+    parser = argparse.ArgumentParser(description="Async JSON prediction service.")
+    parser.add_argument("--host", default=config.host)
+    parser.add_argument("--port", type=int, default=config.port)
+    parser.add_argument("--executor", choices=("thread", "process"), default=config.executor)
+    parser.add_argument("--workers", type=int, default=config.max_workers)
+    parser.add_argument("--max-pending", type=int, default=config.max_pending)
+    args = parser.parse_args(argv)
+
+    config.host, config.port = args.host, args.port
+    config.executor, config.max_workers, config.max_pending = args.executor, args.workers, args.max_pending
+    web.run_app(create_app(config), host=config.host, port=config.port, keepalive_timeout=config.keepalive_timeout)
+
+
+if __name__ == "__main__":
+    main()
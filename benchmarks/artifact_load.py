@@ -0,0 +1,105 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.components.compiled_trees import CompiledTreeEnsemble  # noqa: E402
+from src.utils import save_object, save_object_mmap  # noqa: E402
+
+# Load time and memory of the pickled model vs the memory-mapped export the
+# trainer writes for it (the compiled node arrays, which prediction reads in
+# place), for the tree-based models the trainer can select. Every load, plus
+# one prediction, happens in a fresh interpreter so imports and caches don't
+# leak between runs; RssAnon is private heap, RssFile is file-backed (page
+# cache) memory that other processes mapping the same file share.
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, {root!r})
+from src.utils import load_object, load_object_mmap
+import numpy
+
+def rss():
+    fields = {{}}
+    with open("/proc/self/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            if key in ("RssAnon", "RssFile"):
+                fields[key] = int(value.split()[0]) / 1024
+    return fields
+
+before = rss()
+start = time.perf_counter()
+obj = load_object_mmap({path!r}) if {mmap} else load_object({path!r})
+obj.predict(numpy.zeros((1, {n_features})))
+elapsed = time.perf_counter() - start
+after = rss()
+print(json.dumps({{"load_seconds": elapsed,
+                   "rss_anon_mb": after.get("RssAnon", 0) - before.get("RssAnon", 0),
+                   "rss_file_mb": after.get("RssFile", 0) - before.get("RssFile", 0)}}))
+"""
+
+
+N_FEATURES = 19
+
+
+def build_models(n_rows, random_state=0):
+    from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.tree import DecisionTreeRegressor
+
+    rng = np.random.RandomState(random_state)
+    X = rng.rand(n_rows, N_FEATURES)
+    y = X @ rng.rand(N_FEATURES) + rng.normal(scale=0.1, size=n_rows)
+    return {
+        "Decision Tree": DecisionTreeRegressor(random_state=random_state).fit(X, y),
+        "Random Forest": RandomForestRegressor(n_estimators=64, random_state=random_state).fit(X, y),
+        "Gradient Boosting": GradientBoostingRegressor(random_state=random_state).fit(X, y),
+        "AdaBoost Regressor": AdaBoostRegressor(random_state=random_state).fit(X, y),
+    }
+
+
+def measure(path, mmap, repeats):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    code = CHILD.format(root=root, path=path, mmap=mmap, n_features=N_FEATURES)
+    runs = [
+        json.loads(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout)
+        for _ in range(repeats)
+    ]
+    return {key: float(np.median([r[key] for r in runs])) for key in runs[0]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare pickle vs memory-mapped artifact loading.")
+    parser.add_argument("--rows", type=int, default=200000, help="training rows for the synthetic models")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in build_models(args.rows).items():
+            pickle_path = os.path.join(tmp, "model.pkl")
+            manifest_path = os.path.join(tmp, "model_mmap", "model.json")
+            save_object(pickle_path, model)
+            save_object_mmap(manifest_path, CompiledTreeEnsemble.from_model(model))
+
+            results[name] = {
+                "pickle": measure(pickle_path, False, args.repeats),
+                "mmap": measure(manifest_path, True, args.repeats),
+            }
+            for fmt, r in results[name].items():
+                print(f"{name:18s} {fmt:6s} load {r['load_seconds'] * 1000:8.1f} ms  "
+                      f"private {r['rss_anon_mb']:8.1f} MB  shared {r['rss_file_mb']:8.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump(results, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
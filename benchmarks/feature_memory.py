@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from synthetic_data import generate_students  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Memory of the transformation -> training handoff: the legacy concatenated
+# [X | y] float64 arrays vs FeatureMatrix variants. Every variant runs in a
+# fresh interpreter so ru_maxrss is that variant's own peak.
+CHILD = r"""
+import json, os, resource, sys, threading, time
+sys.path.insert(0, {root!r})
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.linear_model import LinearRegression
+from src.components.data_transformation import DataTransformation
+
+def rss_mb():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+baseline = rss_mb()
+transformation = DataTransformation()
+config = transformation.data_transformation_config
+config.preprocessor_obj_file_path = {preprocessor_path!r}
+config.compiled_preprocessor_file_path = {compiled_path!r}
+config.sparse_one_hot = {sparse}
+config.feature_dtype = {dtype!r}
+
+start = time.perf_counter()
+if {legacy}:
+    train_arr, test_arr, _ = transformation.initiate_data_transformation({train_path!r}, {test_path!r})
+    X, y = train_arr[:, :-1], train_arr[:, -1]
+    retained = train_arr.nbytes + test_arr.nbytes
+else:
+    train_fm, test_fm, _ = transformation.initiate_feature_transformation({train_path!r}, {test_path!r})
+    X, y = train_fm.X, train_fm.y
+    retained = train_fm.nbytes + test_fm.nbytes
+transform_seconds = time.perf_counter() - start
+peak_transform = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 - baseline
+del transformation
+handoff = rss_mb()
+
+# Sample RSS while fitting: copies the estimator makes of X show up here.
+peak_fit, done = [handoff], threading.Event()
+def sample():
+    while not done.wait(0.005):
+        peak_fit.append(rss_mb())
+sampler = threading.Thread(target=sample)
+sampler.start()
+start = time.perf_counter()
+{{"Decision Tree": DecisionTreeRegressor(max_depth=12, random_state=0),
+  "Linear Regression": LinearRegression()}}[{model!r}].fit(X, y)
+fit_seconds = time.perf_counter() - start
+done.set()
+sampler.join()
+
+print(json.dumps({{"transform_seconds": transform_seconds, "fit_seconds": fit_seconds,
+                   "retained_mb": retained / 2**20, "peak_transform_mb": peak_transform,
+                   "rss_at_handoff_mb": handoff - baseline, "fit_extra_mb": max(peak_fit) - handoff}}))
+"""
+
+VARIANTS = {
+    "legacy [X|y] float64": dict(legacy=True, sparse=False, dtype="float64"),
+    "FeatureMatrix float64": dict(legacy=False, sparse=False, dtype="float64"),
+    "FeatureMatrix float32": dict(legacy=False, sparse=False, dtype="float32"),
+    "FeatureMatrix float32 sparse": dict(legacy=False, sparse=True, dtype="float32"),
+}
+
+
+def measure(variant, paths, model):
+    code = CHILD.format(root=ROOT, model=model, **paths, **VARIANTS[variant])
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=paths["tmp"])
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Memory of the transformation -> training handoff.")
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--model", default="Decision Tree", choices=["Decision Tree", "Linear Regression"])
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        df = generate_students(args.rows)
+        split = int(len(df) * 0.8)
+        paths = {
+            "tmp": tmp,
+            "train_path": os.path.join(tmp, "train.csv"),
+            "test_path": os.path.join(tmp, "test.csv"),
+            "preprocessor_path": os.path.join(tmp, "preprocessor.pkl"),
+            "compiled_path": os.path.join(tmp, "preprocessor_compiled.npz"),
+        }
+        df.iloc[:split].to_csv(paths["train_path"], index=False)
+        df.iloc[split:].to_csv(paths["test_path"], index=False)
+        del df
+
+        for variant in VARIANTS:
+            r = results[variant] = measure(variant, paths, args.model)
+            print(f"{variant:30s} arrays {r['retained_mb']:7.1f} MB  rss at handoff {r['rss_at_handoff_mb']:7.1f} MB  "
+                  f"fit extra {r['fit_extra_mb']:7.1f} MB  transform peak {r['peak_transform_mb']:7.1f} MB  "
+                  f"transform {r['transform_seconds']:5.2f} s  fit {r['fit_seconds']:5.2f} s")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump({"rows": args.rows, "model": args.model, "results": results}, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
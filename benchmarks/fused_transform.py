@@ -0,0 +1,91 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_students  # noqa: E402
+from src.components.compiled_preprocessor import CompiledPreprocessor  # noqa: E402
+from src.components.data_storage import to_categorical  # noqa: E402
+from src.components.data_transformation import DataTransformation  # noqa: E402
+from src.components.fused_preprocessor import FusedPreprocessor  # noqa: E402
+
+# Frame -> feature matrix with the fitted ColumnTransformer, the compiled
+# preprocessor and the fused single-pass transformer (per-thread buffer
+# reused across calls; "categorical input" is a frame as read back from
+# Parquet/Feather). Memory is what tracemalloc sees NumPy/pandas allocate
+# inside one call: the peak above the starting point, and how much of it
+# the call still holds on return (its result).
+
+
+def throughput(transform, df, min_seconds):
+    transform(df)
+    calls, start = 0, time.perf_counter()
+    while True:
+        transform(df)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return calls * len(df) / elapsed, elapsed / calls
+
+
+def allocations(transform, df):
+    transform(df)
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = transform(df)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"peak_mb": (peak - before) / 2**20, "retained_mb": (after - before) / 2**20}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="ColumnTransformer vs compiled vs fused preprocessing.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 100, 10000, 1000000])
+    parser.add_argument("--min-seconds", type=float, default=1.0)
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    df = generate_students(max(args.rows), seed=0).drop(columns=["math_score"])
+    preprocessor = DataTransformation().get_data_transformer_object().fit(df.head(100000))
+    compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+    fused = FusedPreprocessor(compiled)
+    categorical_df = to_categorical(df.copy())
+
+    variants = {
+        "ColumnTransformer": (preprocessor.transform, df),
+        "CompiledPreprocessor": (compiled.transform, df),
+        "FusedPreprocessor": (fused.transform, df),
+        "FusedPreprocessor, categorical input": (fused.transform, categorical_df),
+    }
+    results = {}
+    for n_rows in args.rows:
+        expected = preprocessor.transform(df.head(n_rows))
+        results[str(n_rows)] = {}
+        for name, (transform, frame) in variants.items():
+            frame = frame.head(n_rows)
+            rows_per_sec, seconds_per_call = throughput(transform, frame, args.min_seconds)
+            r = results[str(n_rows)][name] = {
+                "rows_per_sec": rows_per_sec,
+                "seconds_per_call": seconds_per_call,
+                "identical": bool(np.array_equal(transform(frame), expected)),
+                **allocations(transform, frame),
+            }
+            print(f"{n_rows:>8d} rows  {name:38s} {r['seconds_per_call'] * 1e6:12.1f} us/call  "
+                  f"{r['rows_per_sec']:12.0f} rows/s  peak {r['peak_mb']:8.2f} MB  "
+                  f"retained {r['retained_mb']:7.2f} MB  identical {r['identical']}")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump(results, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
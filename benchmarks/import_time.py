@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold-start cost of the serving and training entry points. Each import runs
+# in a fresh interpreter under `python -X importtime`; the report keeps the
+# entry module's cumulative time, the heaviest top-level packages by self time
+# and which of the heavy ML libraries got loaded at all. "first prediction"
+# additionally loads the artifacts and scores one record, i.e. everything a new
+# serving worker pays before its first response.
+TARGETS = [
+    "src.pipeline.predict_pipeline",
+    "flask_app",
+    "async_app",
+    "src.pipeline.train_pipeline",
+]
+
+HEAVY_PACKAGES = ["sklearn", "scipy", "xgboost", "catboost", "dill", "joblib", "pandas", "pyarrow"]
+
+FIRST_PREDICTION = r"""
+import time
+start = time.perf_counter()
+from src.pipeline.predict_pipeline import PredictPipeline
+PredictPipeline().predict_record({
+    "gender": "female", "race_ethnicity": "group B", "parental_level_of_education": "bachelor's degree",
+    "lunch": "standard", "test_preparation_course": "none", "reading_score": 72, "writing_score": 74,
+})
+print("first prediction", time.perf_counter() - start)
+"""
+
+
+def parse_importtime(stderr):
+    # Lines look like "import time:      self [us] | cumulative | imported package".
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run_child(args, root, cwd):
+    env = dict(os.environ, PYTHONPATH=root)
+    out = subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True, cwd=cwd, env=env)
+    return out
+
+
+def measure_import(target, root, cwd, repeats, top):
+    cumulative, runs = [], []
+    for _ in range(repeats):
+        modules = parse_importtime(run_child(["-X", "importtime", "-c", f"import {target}"], root, cwd).stderr)
+        runs.append(modules)
+        cumulative.append(next(c for name, _, c in reversed(modules) if name == target) / 1e6)
+
+    # Package breakdown from the median run.
+    modules = runs[int(np.argsort(cumulative)[len(cumulative) // 2])]
+    packages = {}
+    for name, self_us, _ in modules:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us / 1e6
+    return {
+        "seconds": float(np.median(cumulative)),
+        "modules": len(modules),
+        "loaded": [p for p in HEAVY_PACKAGES if p in packages],
+        "top_packages": dict(sorted(packages.items(), key=lambda item: -item[1])[:top]),
+    }
+
+
+def measure_first_prediction(root, repeats):
+    samples = []
+    for _ in range(repeats):
+        # Artifact paths are relative to the repo root.
+        out = run_child(["-c", FIRST_PREDICTION], root, root).stdout
+        samples.append(float(out.strip().splitlines()[-1].split()[-1]))
+    return float(np.median(samples))
+
+
+def measure_tree(root, targets, repeats, top):
+    results = {}
+    with tempfile.TemporaryDirectory() as cwd:
+        for target in targets:
+            r = results[target] = measure_import(target, root, cwd, repeats, top)
+            print(f"import {target:32s} {r['seconds']:6.3f} s  {r['modules']:5d} modules  "
+                  f"loads {', '.join(r['loaded']) or '-'}")
+    if os.path.exists(os.path.join(root, "artifacts", "model.pkl")):
+        seconds = results["first prediction"] = measure_first_prediction(root, repeats)
+        print(f"{'first prediction':39s} {seconds:6.3f} s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Import time of the serving and training entry points.")
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="packages listed per target")
+    parser.add_argument("--baseline-ref", default=None,
+                        help="also measure this git revision (checked out to a temporary worktree)")
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    report = {}
+    if args.baseline_ref:
+        worktree = tempfile.mkdtemp()
+        try:
+            subprocess.run(["git", "worktree", "add", "--detach", worktree, args.baseline_ref],
+                           cwd=ROOT, check=True, capture_output=True)
+            print(f"baseline {args.baseline_ref}")
+            report["baseline"] = measure_tree(worktree, args.targets, args.repeats, args.top)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=ROOT, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+        print("current tree")
+    report["current"] = measure_tree(ROOT, args.targets, args.repeats, args.top)
+
+    if args.baseline_ref:
+        for target, current in report["current"].items():
+            baseline = report["baseline"].get(target)
+            if baseline is not None:
+                before = baseline if isinstance(baseline, float) else baseline["seconds"]
+                after = current if isinstance(current, float) else current["seconds"]
+                print(f"{target:39s} {before:6.3f} s -> {after:6.3f} s  ({before / after:4.1f}x)")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump(report, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
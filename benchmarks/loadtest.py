@@ -0,0 +1,111 @@
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+import numpy as np
+
+SAMPLE_RECORD = {
+    "gender": "female",
+    "race_ethnicity": "group C",
+    "parental_level_of_education": "bachelor's degree",
+    "lunch": "standard",
+    "test_preparation_course": "none",
+    "reading_score": 79,
+    "writing_score": 74,
+}
+
+# The Flask form route names the ethnicity field differently.
+SAMPLE_FORM = dict(SAMPLE_RECORD, ethnicity=SAMPLE_RECORD["race_ethnicity"])
+
+
+async def _worker(session, send, deadline, remaining, latencies, errors):
+    while time.perf_counter() < deadline and remaining[0] > 0:
+        remaining[0] -= 1
+        start = time.perf_counter()
+        try:
+            async with send(session) as response:
+                await response.read()
+                # Redirects aren't followed: the Flask form route answers a
+                # failed prediction with a 302 back to the form.
+                if not 200 <= response.status < 300:
+                    errors.append(response.status)
+                    continue
+        except aiohttp.ClientError as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(url, kind, concurrency, duration, max_requests):
+    if kind == "form":
+        def send(session):
+            return session.post(url, data=SAMPLE_FORM, allow_redirects=False)
+    else:
+        def send(session):
+            return session.post(url, json=SAMPLE_RECORD, allow_redirects=False)
+
+    latencies, errors = [], []
+    remaining = [max_requests or float("inf")]
+    # One session with a connection pool: connections are reused (keep-alive)
+    # instead of paying a TCP handshake per request.
+    connector = aiohttp.TCPConnector(limit=concurrency, force_close=False)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*[
+            _worker(session, send, deadline, remaining, latencies, errors) for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    report = {
+        "url": url,
+        "kind": kind,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "error_kinds": {str(kind): errors.count(kind) for kind in set(errors)},
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+    }
+    for q in (50, 90, 99):
+        report[f"p{q}_ms"] = float(np.percentile(latencies_ms, q)) if len(latencies_ms) else None
+    report["max_ms"] = float(latencies_ms.max()) if len(latencies_ms) else None
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure RPS and latency percentiles of the prediction services.")
+    parser.add_argument("--json-url", action="append", default=[],
+                        help="JSON endpoint, e.g. http://127.0.0.1:8080/predict (repeatable)")
+    parser.add_argument("--form-url", action="append", default=[],
+                        help="Flask form endpoint, e.g. http://127.0.0.1:5000/predictdata (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per target")
+    parser.add_argument("--requests", type=int, default=None, help="stop after this many requests per target")
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    targets = [(url, "json") for url in args.json_url] + [(url, "form") for url in args.form_url]
+    if not targets:
+        parser.error("give at least one --json-url or --form-url")
+
+    reports = []
+    for url, kind in targets:
+        report = asyncio.run(run_load(url, kind, args.concurrency, args.duration, args.requests))
+        reports.append(report)
+        percentiles = ", ".join(
+            f"p{q} {report[f'p{q}_ms']:.1f} ms" for q in (50, 90, 99) if report[f"p{q}_ms"] is not None
+        )
+        print(f"{url} [{kind}] {report['requests']} ok / {report['errors']} errors, "
+              f"{report['rps']:.0f} req/s, {percentiles}")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump(reports, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_students  # noqa: E402
+from src.components.data_transformation import DataTransformation  # noqa: E402
+from src.components.native_model import NativeBoosterPredictor, export_native_model  # noqa: E402
+from src.utils import load_object, save_object  # noqa: E402
+
+# Pickled sklearn-wrapper booster (what artifact_format="pickle" serves) vs the
+# native export loaded into NativeBoosterPredictor (artifact_format="native"):
+# single-row latency, batch time and agreement of the predictions. Models are
+# trained on the transformed synthetic student data with the trainer's
+# default hyperparameters.
+
+
+def build_models(names):
+    models = {}
+    if "XGBRegressor" in names:
+        from xgboost import XGBRegressor
+        models["XGBRegressor"] = XGBRegressor()
+    if "CatBoosting Regressor" in names:
+        from catboost import CatBoostRegressor
+        models["CatBoosting Regressor"] = CatBoostRegressor(verbose=False, allow_writing_files=False)
+    return models
+
+
+def latency(predict, X, samples, rng):
+    rows = rng.integers(0, X.shape[0], samples)
+    predict(X[:1])
+    timings = []
+    for i in rows:
+        start = time.perf_counter()
+        predict(X[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    return {"p50_us": float(np.percentile(timings, 50)), "p99_us": float(np.percentile(timings, 99))}
+
+
+def batch_seconds(predict, X, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pickled wrapper vs native booster prediction latency.")
+    parser.add_argument("--models", nargs="+", default=["XGBRegressor", "CatBoosting Regressor"])
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--batch-rows", type=int, nargs="+", default=[1000, 100000])
+    parser.add_argument("--latency-samples", type=int, default=2000)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    df = generate_students(args.train_rows + max(args.batch_rows), seed=0)
+    y = df.pop("math_score").to_numpy(dtype=np.float64)
+    X = DataTransformation().get_data_transformer_object().fit(df.iloc[:args.train_rows]).transform(df)
+    X_train, y_train, X_eval = X[:args.train_rows], y[:args.train_rows], X[args.train_rows:]
+    rng = np.random.default_rng(0)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in build_models(args.models).items():
+            model.fit(X_train, y_train)
+            pickle_path = os.path.join(tmp, "model.pkl")
+            manifest_path = os.path.join(tmp, "model_native.json")
+            save_object(pickle_path, model)
+            export_native_model(manifest_path, model)
+
+            start = time.perf_counter()
+            wrapper = load_object(pickle_path)
+            wrapper_load = time.perf_counter() - start
+            start = time.perf_counter()
+            native = NativeBoosterPredictor.load(manifest_path)
+            native_load = time.perf_counter() - start
+
+            r = results[name] = {
+                "max_abs_diff": float(np.abs(wrapper.predict(X_eval) - native.predict(X_eval)).max()),
+                "pickle": {"load_seconds": wrapper_load, **latency(wrapper.predict, X_eval, args.latency_samples, rng)},
+                "native": {"load_seconds": native_load, **latency(native.predict, X_eval, args.latency_samples, rng)},
+            }
+            for backend, predict in (("pickle", wrapper.predict), ("native", native.predict)):
+                for n_rows in args.batch_rows:
+                    r[backend][f"batch_{n_rows}_seconds"] = batch_seconds(predict, X_eval[:n_rows], args.repeats)
+
+            print(f"{name}  (max |diff| {r['max_abs_diff']:.2e})")
+            for backend in ("pickle", "native"):
+                b = r[backend]
+                batches = "  ".join(f"batch {n}: {b[f'batch_{n}_seconds'] * 1000:8.2f} ms" for n in args.batch_rows)
+                print(f"  {backend:7s} load {b['load_seconds'] * 1000:7.1f} ms  single row p50 {b['p50_us']:7.1f} us  "
+                      f"p99 {b['p99_us']:7.1f} us  {batches}")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump({"train_rows": args.train_rows, "cpu_count": os.cpu_count(), "results": results},
+                      file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import write_students_csv  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_COLUMN = "math_score"
+REPORT_VERSION = 2
+
+# End-to-end benchmark of the training and prediction pipeline on synthetic
+# datasets. Each stage records wall time and the peak RSS above what the
+# process held when the stage started; the JSON report carries the commit and
+# environment so two reports can be diffed with --compare.
+
+
+class PeakRSS:
+    # Samples RSS from a background thread; ru_maxrss is process-lifetime
+    # monotonic, so it can't attribute a peak to an individual stage.
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self.peak = self.start = 0
+        self.stop_event = threading.Event()
+
+    def rss(self):
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * self.page_size
+        except OSError:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def sample(self):
+        while not self.stop_event.wait(self.interval):
+            self.peak = max(self.peak, self.rss())
+
+    def __enter__(self):
+        self.start = self.peak = self.rss()
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop_event.set()
+        self.thread.join()
+        self.peak = max(self.peak, self.rss())
+
+    @property
+    def peak_mb(self):
+        return (self.peak - self.start) / 2**20
+
+
+def run_stage(results, name, fn, **fields):
+    with PeakRSS() as mem:
+        start = time.perf_counter()
+        value = fn()
+        elapsed = time.perf_counter() - start
+    results[name] = {"seconds": elapsed, "peak_rss_mb": mem.peak_mb, **fields}
+    print(f"  {name:34s} {elapsed:10.4f} s  peak +{mem.peak_mb:8.1f} MB", file=sys.stderr)
+    return value
+
+
+def latency_stats(samples):
+    samples = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(samples, 50)),
+        "p95_ms": float(np.percentile(samples, 95)),
+        "p99_ms": float(np.percentile(samples, 99)),
+        "mean_ms": float(samples.mean()),
+        "samples": int(len(samples)),
+    }
+
+
+def build_models(names):
+    from catboost import CatBoostRegressor
+    from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import LinearRegression
+    from sklearn.tree import DecisionTreeRegressor
+    from xgboost import XGBRegressor
+
+    # Same families as ModelTrainer, at default hyperparameters: this times
+    # one fit per model, not the search.
+    models = {
+        "Random Forest": lambda: RandomForestRegressor(),
+        "Decision Tree": lambda: DecisionTreeRegressor(),
+        "Gradient Boosting": lambda: GradientBoostingRegressor(),
+        "Linear Regression": lambda: LinearRegression(),
+        "XGBRegressor": lambda: XGBRegressor(),
+        "CatBoosting Regressor": lambda: CatBoostRegressor(verbose=False, allow_writing_files=False),
+        "AdaBoost Regressor": lambda: AdaBoostRegressor(),
+    }
+    unknown = set(names) - set(models)
+    if unknown:
+        raise ValueError(f"Unknown models {sorted(unknown)}; choose from {list(models)}")
+    return {name: models[name]() for name in names}
+
+
+def bench_size(n_rows, args, workdir):
+    import pandas as pd
+    from sklearn.metrics import r2_score
+
+    from src.components.data_ingestion import DataIngestion, DataIngestionConfig
+    from src.components.data_storage import read_frame
+    from src.components.data_transformation import DataTransformation
+    from src.pipeline.artifact_registry import ArtifactRegistry
+    from src.pipeline.predict_pipeline import FEATURE_COLUMNS, PredictPipeline
+    from src.utils import save_object
+
+    results = {}
+    source_path = os.path.join(workdir, f"students_{n_rows}.csv")
+    artifacts = os.path.join(workdir, "artifacts")
+    os.makedirs(artifacts, exist_ok=True)
+
+    run_stage(results, "generate", lambda: write_students_csv(source_path, n_rows, seed=args.seed))
+
+    # The production components, with their configs pointed at the workdir.
+    ingestion = DataIngestion()
+    ingestion.ingestion_config = DataIngestionConfig(
+        source_data_path=source_path,
+        train_data_path=os.path.join(artifacts, "train.csv"),
+        test_data_path=os.path.join(artifacts, "test.csv"),
+        raw_data_path=os.path.join(artifacts, "data.csv"),
+    )
+    train_path, test_path = run_stage(results, "ingestion", ingestion.initiate_data_ingestion, rows=n_rows)
+
+    transformation = DataTransformation()
+    transformation_config = transformation.data_transformation_config
+    transformation_config.preprocessor_obj_file_path = os.path.join(artifacts, "preprocessor.pkl")
+    transformation_config.compiled_preprocessor_file_path = os.path.join(artifacts, "preprocessor_compiled.npz")
+    train_fm, test_fm, preprocessor_path = run_stage(
+        results, "transformation", lambda: transformation.initiate_feature_transformation(train_path, test_path),
+        rows=n_rows)
+    compiled_path = transformation_config.compiled_preprocessor_file_path
+    X_train, y_train, X_test, y_test = train_fm.X, train_fm.y, test_fm.X, test_fm.y
+    X_test_df = read_frame(test_path).drop(columns=[TARGET_COLUMN])
+
+    trained = {}
+    for name, model in build_models(args.models).items():
+        if n_rows > args.max_rows_per_model.get(name, float("inf")):
+            results[f"train[{name}]"] = {"skipped": f"more than {args.max_rows_per_model[name]} rows"}
+            continue
+        trained[name] = run_stage(results, f"train[{name}]", lambda: model.fit(X_train, y_train),
+                                  rows=len(X_train))
+        results[f"train[{name}]"]["test_r2"] = float(r2_score(y_test, model.predict(X_test)))
+
+    serve_name = args.serve_model if args.serve_model in trained else next(iter(trained), None)
+    if serve_name is None:
+        return results
+    model_path = os.path.join(artifacts, "model.pkl")
+    save_object(model_path, trained[serve_name])
+
+    pipeline = PredictPipeline(registry=ArtifactRegistry())
+    config = pipeline.predict_pipeline_config
+    config.model_path = model_path
+    config.preprocessor_path = preprocessor_path
+    config.compiled_preprocessor_path = compiled_path
+    run_stage(results, "predict_load_artifacts",
+              lambda: (pipeline.load_artifacts(), pipeline.load_compiled_preprocessor()), model=serve_name)
+
+    # Single-row latency on both request paths: the DataFrame + ColumnTransformer
+    # path and the compiled-preprocessor path the web apps use.
+    records = X_test_df[FEATURE_COLUMNS].head(args.latency_samples).to_dict("records")
+    for label, predict in (("predict_single_dataframe",
+                            lambda r: pipeline.predict(pd.DataFrame([r], columns=FEATURE_COLUMNS))),
+                           ("predict_single_record", pipeline.predict_record)):
+        for record in records[:10]:
+            predict(record)
+        samples = []
+        for record in records:
+            start = time.perf_counter()
+            predict(record)
+            samples.append(time.perf_counter() - start)
+        results[label] = {"model": serve_name, **latency_stats(samples)}
+        print(f"  {label:34s} p50 {results[label]['p50_ms']:8.3f} ms  p99 {results[label]['p99_ms']:8.3f} ms",
+              file=sys.stderr)
+
+    batch = X_test_df[FEATURE_COLUMNS]
+    run_stage(results, "predict_batch", lambda: pipeline.predict_batch(batch), model=serve_name, rows=len(batch))
+    results["predict_batch"]["rows_per_second"] = len(batch) / results["predict_batch"]["seconds"]
+    return results
+
+
+def environment():
+    import sklearn
+
+    def git(*cmd):
+        try:
+            return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        except OSError:
+            return None
+
+    return {
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(git("status", "--porcelain", "--untracked-files=no")),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(current, baseline, threshold, min_seconds):
+    # Stage-by-stage ratio of the two reports; anything slower than
+    # (1 + threshold) times the baseline counts as a regression. Stages
+    # shorter than min_seconds in both reports are too noisy to flag.
+    regressions = []
+    for size, stages in current["results"].items():
+        base_stages = baseline["results"].get(size, {})
+        for stage, r in stages.items():
+            base = base_stages.get(stage, {})
+            for key in ("seconds", "p50_ms", "p99_ms"):
+                if key in r and base.get(key):
+                    ratio = r[key] / base[key]
+                    floor = min_seconds * (1000 if key.endswith("_ms") else 1)
+                    noisy = max(r[key], base[key]) < floor
+                    flag = "REGRESSION" if ratio > 1 + threshold and not noisy else ""
+                    print(f"{size:>10s} {stage:34s} {key:8s} {base[key]:10.4f} -> {r[key]:10.4f}  "
+                          f"x{ratio:5.2f} {flag}")
+                    if flag:
+                        regressions.append((size, stage, key, ratio))
+    return regressions
+
+
+def parse_row_limits(values):
+    limits = {}
+    for value in values or []:
+        name, _, rows = value.rpartition("=")
+        limits[name] = int(rows)
+    return limits
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark on synthetic student data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000],
+                        help="dataset sizes in rows (1K to 10M)")
+    parser.add_argument("--models", nargs="+",
+                        default=["Linear Regression", "Decision Tree", "XGBRegressor", "Random Forest"])
+    parser.add_argument("--max-rows-per-model", nargs="*", default=["Random Forest=1000000"],
+                        help='skip a model above a size, e.g. "Gradient Boosting=100000"')
+    parser.add_argument("--serve-model", default="Linear Regression",
+                        help="model used for the prediction-latency stages")
+    parser.add_argument("--latency-samples", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--workdir", default=None, help="keep generated data here instead of a temp dir")
+    parser.add_argument("--output", default="benchmark_report.json")
+    parser.add_argument("--compare", default=None, help="baseline report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before flagging")
+    parser.add_argument("--min-seconds", type=float, default=0.05,
+                        help="ignore stages faster than this when flagging regressions")
+    args = parser.parse_args(argv)
+    args.max_rows_per_model = parse_row_limits(args.max_rows_per_model)
+
+    report = {"version": REPORT_VERSION, "environment": environment(),
+              "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "workdir")},
+              "results": {}}
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        for n_rows in args.sizes:
+            print(f"{n_rows} rows", file=sys.stderr)
+            report["results"][str(n_rows)] = bench_size(n_rows, args, workdir)
+
+    with open(args.output, "w") as file_obj:
+        json.dump(report, file_obj, indent=2)
+    print(f"Report written to {args.output}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as file_obj:
+            baseline = json.load(file_obj)
+        if compare(report, baseline, args.threshold, args.min_seconds):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from loadtest import run_load  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except OSError:
+            time.sleep(0.25)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+
+def measure(workers, port, concurrency, duration):
+    env = dict(os.environ, EDUPREDICT_WORKERS=str(workers), EDUPREDICT_BIND=f"127.0.0.1:{port}",
+               EDUPREDICT_ARTIFACT_POLL_SECONDS="0")
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_until_up(f"http://127.0.0.1:{port}/")
+        url = f"http://127.0.0.1:{port}/predictdata"
+        return asyncio.run(run_load(url, "form", concurrency, duration, None))
+    finally:
+        server.terminate()
+        server.wait(30)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput of the pre-fork server vs worker count.")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    reports = []
+    for workers in args.workers:
+        report = measure(workers, args.port, args.concurrency, args.duration)
+        report["workers"] = workers
+        if report["errors"]:
+            # Throughput of failing (e.g. redirected) requests says nothing
+            # about scaling.
+            sys.exit(f"{workers} workers: {report['errors']} failed requests {report['error_kinds']}; "
+                     f"fix the server before comparing throughput")
+        reports.append(report)
+        baseline = reports[0]["rps"] / reports[0]["workers"]
+        efficiency = report["rps"] / (baseline * workers) if baseline else 0.0
+        print(f"{workers:3d} workers: {report['rps']:8.0f} req/s  p99 {report['p99_ms']:.1f} ms  "
+              f"scaling efficiency {efficiency:.0%}")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump(reports, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
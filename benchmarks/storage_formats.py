@@ -0,0 +1,66 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_students  # noqa: E402
+from src.components.data_storage import STORAGE_FORMATS, read_frame, write_frame  # noqa: E402
+
+# Write/read time, file size and in-memory footprint of the ingested split in
+# each storage format. "read" is what DataTransformation does with the file;
+# "read columns" loads just two of the eight columns, which only the columnar
+# formats can do without parsing the rest.
+
+
+def timed_median(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - start)
+    return float(np.median(samples)), result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare CSV, Parquet and Feather for the ingested splits.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100000, 1000000])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in args.rows:
+            df = generate_students(n_rows)
+            results[str(n_rows)] = {}
+            for fmt, extension in STORAGE_FORMATS.items():
+                path = os.path.join(tmp, f"train{extension}")
+                write_seconds, _ = timed_median(lambda: write_frame(df, path), args.repeats)
+                read_seconds, loaded = timed_median(lambda: read_frame(path), args.repeats)
+                columns_seconds, _ = timed_median(
+                    lambda: read_frame(path, columns=["reading_score", "writing_score"]), args.repeats)
+                r = results[str(n_rows)][fmt] = {
+                    "write_seconds": write_seconds,
+                    "read_seconds": read_seconds,
+                    "read_columns_seconds": columns_seconds,
+                    "file_mb": os.path.getsize(path) / 2**20,
+                    "memory_mb": loaded.memory_usage(deep=True).sum() / 2**20,
+                }
+                print(f"{n_rows:>9d} {fmt:8s} write {r['write_seconds']:7.3f} s  read {r['read_seconds']:7.3f} s  "
+                      f"read 2 cols {r['read_columns_seconds']:7.3f} s  file {r['file_mb']:7.1f} MB  "
+                      f"in memory {r['memory_mb']:7.1f} MB")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump(results, file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
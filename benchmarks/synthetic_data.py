@@ -0,0 +1,93 @@
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REFERENCE_PATH = os.path.join(ROOT, "artifacts", "data.csv")
+
+CATEGORICAL_COLUMNS = [
+    "gender",
+    "race_ethnicity",
+    "parental_level_of_education",
+    "lunch",
+    "test_preparation_course",
+]
+SCORE_COLUMNS = ["math_score", "reading_score", "writing_score"]
+
+
+class StudentGenerator:
+    # Synthetic rows with the schema and rough statistics of artifacts/data.csv:
+    # categoricals are drawn from their observed frequencies and the three
+    # scores from a Gaussian whose mean depends linearly on the categoricals,
+    # with the residual covariance of the reference data (so reading/writing
+    # stay correlated with math and the models have something to learn).
+    def __init__(self, reference_path=REFERENCE_PATH):
+        df = pd.read_csv(reference_path)
+        self.frequencies = {
+            column: df[column].value_counts(normalize=True).sort_index()
+            for column in CATEGORICAL_COLUMNS
+        }
+
+        design = self.design_matrix(df)
+        scores = df[SCORE_COLUMNS].to_numpy(dtype=float)
+        self.coef, *_ = np.linalg.lstsq(design, scores, rcond=None)
+        residuals = scores - design @ self.coef
+        self.cholesky = np.linalg.cholesky(np.cov(residuals, rowvar=False))
+
+    def design_matrix(self, df):
+        blocks = [np.ones((len(df), 1))]
+        for column in CATEGORICAL_COLUMNS:
+            categories = self.frequencies[column].index
+            # Drop the first level so the least-squares system is full rank.
+            blocks.append((df[column].to_numpy()[:, None] == categories.to_numpy()[None, 1:]).astype(float))
+        return np.hstack(blocks)
+
+    def sample(self, n_rows, rng):
+        df = pd.DataFrame({
+            column: rng.choice(freq.index.to_numpy(), size=n_rows, p=freq.to_numpy())
+            for column, freq in self.frequencies.items()
+        })
+        noise = rng.standard_normal((n_rows, len(SCORE_COLUMNS))) @ self.cholesky.T
+        scores = np.clip(np.rint(self.design_matrix(df) @ self.coef + noise), 0, 100).astype(np.int64)
+        for i, column in enumerate(SCORE_COLUMNS):
+            df[column] = scores[:, i]
+        # Same column order as the reference CSV.
+        return df[CATEGORICAL_COLUMNS + SCORE_COLUMNS]
+
+    def iter_chunks(self, n_rows, seed=42, chunk_size=500000):
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_rows, chunk_size):
+            yield self.sample(min(chunk_size, n_rows - start), rng)
+
+
+def generate_students(n_rows, seed=42, reference_path=REFERENCE_PATH):
+    return pd.concat(list(StudentGenerator(reference_path).iter_chunks(n_rows, seed)), ignore_index=True)
+
+
+def write_students_csv(path, n_rows, seed=42, chunk_size=500000, reference_path=REFERENCE_PATH):
+    # Written chunk by chunk so 10M-row files never have to fit in memory.
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    generator = StudentGenerator(reference_path)
+    with open(path, "w", newline="") as file_obj:
+        for i, chunk in enumerate(generator.iter_chunks(n_rows, seed, chunk_size)):
+            chunk.to_csv(file_obj, index=False, header=(i == 0))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic student dataset shaped like artifacts/data.csv.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=500000)
+    args = parser.parse_args(argv)
+
+    write_students_csv(args.output, args.rows, seed=args.seed, chunk_size=args.chunk_size)
+    print(f"Wrote {args.rows} rows to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
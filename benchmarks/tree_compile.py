@@ -0,0 +1,94 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from synthetic_data import generate_students  # noqa: E402
+from src.components.compiled_trees import CompiledTreeEnsemble  # noqa: E402
+from src.components.data_transformation import DataTransformation  # noqa: E402
+
+# sklearn predict vs CompiledTreeEnsemble for the tree-based models the
+# trainer can select, with the trainer's default hyperparameters: single-row
+# latency, one large batch and whether the predictions are identical.
+
+
+def build_models(names):
+    from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.tree import DecisionTreeRegressor
+
+    factories = {
+        "Decision Tree": lambda: DecisionTreeRegressor(random_state=0),
+        "Random Forest": lambda: RandomForestRegressor(random_state=0),
+        "Gradient Boosting": lambda: GradientBoostingRegressor(random_state=0),
+        "AdaBoost Regressor": lambda: AdaBoostRegressor(random_state=0),
+    }
+    return {name: factories[name]() for name in names}
+
+
+def latency(predict, X, samples, rng):
+    rows = rng.integers(0, X.shape[0], samples)
+    predict(X[:1])
+    timings = []
+    for i in rows:
+        start = time.perf_counter()
+        predict(X[i:i + 1])
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1e6
+    return {"p50_us": float(np.percentile(timings, 50)), "p99_us": float(np.percentile(timings, 99))}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="sklearn tree ensembles vs the compiled flat-array engine.")
+    parser.add_argument("--models", nargs="+",
+                        default=["Decision Tree", "Random Forest", "Gradient Boosting", "AdaBoost Regressor"])
+    parser.add_argument("--train-rows", type=int, default=20000)
+    parser.add_argument("--batch-rows", type=int, default=1000000)
+    parser.add_argument("--latency-samples", type=int, default=1000)
+    parser.add_argument("--output", default=None, help="optional JSON report path")
+    args = parser.parse_args(argv)
+
+    df = generate_students(args.train_rows + args.batch_rows, seed=0)
+    y = df.pop("math_score").to_numpy(dtype=np.float64)
+    X = DataTransformation().get_data_transformer_object().fit(df.iloc[:args.train_rows]).transform(df)
+    X_train, y_train, X_eval = X[:args.train_rows], y[:args.train_rows], X[args.train_rows:]
+    del df, X
+    rng = np.random.default_rng(0)
+
+    results = {}
+    for name, model in build_models(args.models).items():
+        model.fit(X_train, y_train)
+        start = time.perf_counter()
+        compiled = CompiledTreeEnsemble.from_model(model)
+        compile_seconds = time.perf_counter() - start
+
+        r = results[name] = {"trees": len(compiled.roots), "nodes": compiled.n_nodes,
+                             "max_depth": compiled.max_depth, "compile_seconds": compile_seconds}
+        for backend, predict in (("sklearn", model.predict), ("compiled", compiled.predict)):
+            start = time.perf_counter()
+            preds = predict(X_eval)
+            r[backend] = {"batch_seconds": time.perf_counter() - start,
+                          **latency(predict, X_eval, args.latency_samples, rng)}
+            r[backend + "_preds"] = preds
+        r["identical"] = bool(np.array_equal(r.pop("sklearn_preds"), r.pop("compiled_preds")))
+
+        print(f"{name}  ({r['trees']} trees, {r['nodes']} nodes, depth {r['max_depth']}, "
+              f"identical: {r['identical']})")
+        for backend in ("sklearn", "compiled"):
+            b = r[backend]
+            print(f"  {backend:8s} single row p50 {b['p50_us']:9.1f} us  p99 {b['p99_us']:9.1f} us  "
+                  f"{args.batch_rows} rows {b['batch_seconds']:7.2f} s")
+
+    if args.output:
+        with open(args.output, "w") as file_obj:
+            json.dump({"train_rows": args.train_rows, "batch_rows": args.batch_rows, "results": results},
+                      file_obj, indent=2)
+
+
+if __name__ == "__main__":
+    main()
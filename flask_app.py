@@ -1,9 +1,15 @@
 import pickle
-from flask import Flask, request, render_template, flash, redirect, url_for
+import io
+import os
+from flask import Flask, request, render_template, flash, redirect, url_for, jsonify, Response
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
 from src.pipeline.predict_pipeline import CustomData, PredictPipeline
+from src.pipeline.batch_predict import PREDICTION_COLUMN
+from src.pipeline.micro_batcher import MicroBatcher
+from src.pipeline.artifact_registry import artifact_registry
+from src.instrumentation import metrics
+from src.exception import InvalidInputError
 
 application = Flask(__name__)
 app = application
@@ -11,6 +17,15 @@ app = application
 # Configure secret key for session management
 app.secret_key = 'your-secret-key-here'
 
+# Micro-batching server mode: concurrent form posts are queued and scored
+# together. Enable with EDUPREDICT_MICRO_BATCH=1.
+micro_batcher = None
+if os.environ.get('EDUPREDICT_MICRO_BATCH') == '1':
+    micro_batcher = MicroBatcher(
+        max_batch_size=int(os.environ.get('EDUPREDICT_MAX_BATCH_SIZE', 64)),
+        max_wait_ms=float(os.environ.get('EDUPREDICT_MAX_WAIT_MS', 2.0)),
+    ).start()
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -39,9 +54,11 @@ def predict_datapoint():
                 writing_score=writing_score
             )
             
-            pred_df = data.get_data_as_data_frame()
-            predict_pipeline = PredictPipeline()
-            results = predict_pipeline.predict(pred_df)
+            if micro_batcher is not None:
+                results = micro_batcher.predict(data.get_data_as_dict(), timeout=30)
+            else:
+                predict_pipeline = PredictPipeline()
+                results = predict_pipeline.predict_record(data.get_data_as_dict())
             
             # Format the result nicely
             result_message = f"Predicted Math Score: {results[0]:.1f}"
@@ -56,5 +73,62 @@ def predict_datapoint():
             flash('An error occurred during prediction. Please try again.', 'error')
             return redirect(url_for('predict_datapoint'))
 
+@app.route('/predict_batch', methods=['POST'])
+def predict_batch():
+    # Accepts a CSV upload (multipart field "file" or a text/csv body) and
+    # answers with the same CSV plus a prediction column, or a JSON list of
+    # records (optionally wrapped as {"records": [...]}) and answers with JSON.
+    try:
+        predict_pipeline = PredictPipeline()
+
+        csv_file = request.files.get('file')
+        if csv_file is not None or request.mimetype == 'text/csv':
+            source = csv_file if csv_file is not None else io.BytesIO(request.get_data())
+            df = pd.read_csv(source)
+            df[PREDICTION_COLUMN] = predict_pipeline.predict_batch(df)
+            stats = predict_pipeline.last_batch_stats
+            return Response(
+                df.to_csv(index=False),
+                mimetype='text/csv',
+                headers={
+                    'X-Rows': str(stats['rows']),
+                    'X-Rows-Per-Sec': f"{stats['rows_per_sec']:.0f}",
+                },
+            )
+
+        payload = request.get_json(silent=True)
+        records = payload.get('records') if isinstance(payload, dict) else payload
+        if not isinstance(records, list):
+            return jsonify(error='Send a CSV file or a JSON list of records'), 400
+
+        preds = predict_pipeline.predict_batch(records)
+        return jsonify(predictions=preds.tolist(), **predict_pipeline.last_batch_stats)
+
+    except (InvalidInputError, pd.errors.ParserError, pd.errors.EmptyDataError, UnicodeDecodeError) as e:
+        return jsonify(error=str(e)), 400
+    except Exception as e:
+        # Details stay in the server log; callers get no paths or internals.
+        app.logger.error(f"Error during batch prediction: {str(e)}")
+        return jsonify(error='Internal error during batch prediction'), 500
+
+@app.route('/batching_stats')
+def batching_stats():
+    if micro_batcher is None:
+        return jsonify(enabled=False)
+    return jsonify(enabled=True, **micro_batcher.stats())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    # Per-process view: under gunicorn each worker reports its own numbers.
+    lines = [metrics.prometheus_text().rstrip("\n")]
+    for key, value in artifact_registry.stats().items():
+        lines.append(f"edupredict_artifact_registry_{key} {value}")
+    if micro_batcher is not None:
+        stats = micro_batcher.stats()
+        for key in ("requests", "batches", "mean_batch_size", "queue_depth",
+                    "queue_ms_p50", "queue_ms_p95", "queue_ms_p99"):
+            lines.append(f"edupredict_micro_batcher_{key} {stats[key]}")
+    return Response("\n".join(lines) + "\n", mimetype='text/plain; version=0.0.4')
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", debug=True)
\ No newline at end of file
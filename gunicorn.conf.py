@@ -0,0 +1,89 @@
+# Production serving for the Flask app: gunicorn -c gunicorn.conf.py
+#
+# The master imports the app and loads the model/preprocessor once
+# (preload_app + when_ready); workers are forked afterwards and share those
+# pages copy-on-write. A watcher thread in the master polls artifacts/ and
+# sends the master SIGHUP when a retrain lands, which reloads the artifacts
+# in the master and replaces the workers with freshly forked ones while the
+# old ones finish their in-flight requests.
+import gc
+import os
+import signal
+import threading
+
+wsgi_app = "flask_app:app"
+bind = os.environ.get("EDUPREDICT_BIND", "0.0.0.0:8000")
+# Prediction is CPU-bound, so one sync worker per core.
+workers = int(os.environ.get("EDUPREDICT_WORKERS", os.cpu_count() or 1))
+worker_class = "sync"
+preload_app = True
+graceful_timeout = 30
+timeout = 60
+keepalive = 5
+
+ARTIFACT_POLL_SECONDS = float(os.environ.get("EDUPREDICT_ARTIFACT_POLL_SECONDS", 5))
+WATCHED_ARTIFACTS = [
+    os.path.join("artifacts", "model.pkl"),
+    os.path.join("artifacts", "preprocessor.pkl"),
+    os.path.join("artifacts", "preprocessor_compiled.npz"),
+    os.path.join("artifacts", "model_mmap", "model.json"),
+    os.path.join("artifacts", "model_native.json"),
+    os.path.join("artifacts", "model_compiled.npz"),
+]
+
+
+def _artifact_fingerprints():
+    fingerprints = {}
+    for path in WATCHED_ARTIFACTS:
+        try:
+            stat = os.stat(path)
+            fingerprints[path] = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            fingerprints[path] = None
+    return fingerprints
+
+
+def _preload(server):
+    from src.pipeline.predict_pipeline import PredictPipeline
+
+    predict_pipeline = PredictPipeline()
+    predict_pipeline.load_artifacts()
+    predict_pipeline.load_compiled_preprocessor()
+    # Move everything allocated so far out of the collector's generations so
+    # GC passes in the workers don't write to (and un-share) those pages.
+    gc.collect()
+    gc.freeze()
+    server.log.info("Preloaded model and preprocessor in master %s", os.getpid())
+
+
+def _watch_artifacts(server):
+    # Only stats files and signals the master; all loading happens on the
+    # master's main thread, so nothing holds a lock while it forks.
+    seen = _artifact_fingerprints()
+    while True:
+        threading.Event().wait(ARTIFACT_POLL_SECONDS)
+        current = _artifact_fingerprints()
+        if current == seen:
+            continue
+        # Wait one more poll so a multi-file retrain has finished writing.
+        threading.Event().wait(ARTIFACT_POLL_SECONDS)
+        if _artifact_fingerprints() != current:
+            continue
+        seen = current
+        server.log.info("Artifacts changed; rolling workers")
+        os.kill(server.pid, signal.SIGHUP)
+
+
+def when_ready(server):
+    _preload(server)
+    # The config file is re-executed on every reload; start the watcher once.
+    if ARTIFACT_POLL_SECONDS > 0 and not getattr(server, "artifact_watcher", None):
+        server.artifact_watcher = threading.Thread(
+            target=_watch_artifacts, args=(server,), name="artifact-watcher", daemon=True
+        )
+        server.artifact_watcher.start()
+
+
+def on_reload(server):
+    gc.unfreeze()
+    _preload(server)
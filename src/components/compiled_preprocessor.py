@@ -0,0 +1,245 @@
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import write_atomic
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+# Precomputed form of the fitted ColumnTransformer built in
+# DataTransformation.get_data_transformer_object. Numeric blocks keep their
+# imputation fill, mean and scale vectors; categorical blocks keep a
+# category -> (output column, value) table where the value is the one-hot 1.0
+# already divided by the scaler. The arithmetic is the same sklearn performs,
+# so the output is bit-for-bit identical.
+class CompiledPreprocessor:
+    def __init__(self, input_features, blocks, n_output):
+        self.input_features = list(input_features)
+        self.blocks = blocks
+        self.n_output = n_output
+        self._build_lookups()
+
+    def _build_lookups(self):
+        self._input_index = {name: i for i, name in enumerate(self.input_features)}
+        for block in self.blocks:
+            if block["kind"] == "categorical":
+                block["lookup"] = [
+                    {category: (block["offsets"][j] + k, value)
+                     for k, (category, value) in enumerate(zip(categories, hot_values))}
+                    for j, (categories, hot_values) in enumerate(zip(block["categories"], block["hot_values"]))
+                ]
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor):
+        try:
+            # sklearn is only needed to compile; transforming with the result
+            # (the serving path) runs on numpy/pandas alone.
+            from sklearn.impute import SimpleImputer
+            from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+            blocks = []
+            for name, pipeline, columns in preprocessor.transformers_:
+                if name == "remainder":
+                    continue
+                steps = dict(pipeline.steps)
+                imputer = next(s for s in steps.values() if isinstance(s, SimpleImputer))
+                scaler = next((s for s in steps.values() if isinstance(s, StandardScaler)), None)
+                encoder = next((s for s in steps.values() if isinstance(s, OneHotEncoder)), None)
+                start = preprocessor.output_indices_[name].start
+
+                if encoder is None:
+                    n = len(columns)
+                    blocks.append({
+                        "kind": "numerical",
+                        "features": list(columns),
+                        "start": start,
+                        "fill": np.asarray(imputer.statistics_, dtype=np.float64),
+                        "mean": np.asarray(scaler.mean_ if scaler is not None and scaler.with_mean else np.zeros(n), dtype=np.float64),
+                        "scale": np.asarray(scaler.scale_ if scaler is not None and scaler.with_std else np.ones(n), dtype=np.float64),
+                    })
+                    continue
+
+                if scaler is not None and scaler.with_mean:
+                    raise ValueError("Centering one-hot columns cannot be compiled into a lookup table")
+                if encoder.drop_idx_ is not None or encoder.handle_unknown != "error":
+                    raise ValueError("Only OneHotEncoder(drop=None, handle_unknown='error') can be compiled")
+
+                width = sum(len(c) for c in encoder.categories_)
+                scale = scaler.scale_ if scaler is not None and scaler.with_std else np.ones(width)
+                offsets, hot_values, position = [], [], start
+                for categories in encoder.categories_:
+                    offsets.append(position)
+                    hot_values.append(np.ones(len(categories)) / scale[position - start:position - start + len(categories)])
+                    position += len(categories)
+
+                blocks.append({
+                    "kind": "categorical",
+                    "features": list(columns),
+                    "start": start,
+                    "fill": [str(v) for v in imputer.statistics_],
+                    "categories": [[str(c) for c in categories] for categories in encoder.categories_],
+                    "offsets": offsets,
+                    "hot_values": hot_values,
+                })
+
+            n_output = max(s.stop for s in preprocessor.output_indices_.values())
+            return cls(preprocessor.feature_names_in_, blocks, n_output)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def transform_record(self, record, out=None):
+        # record: dict keyed by feature name, or a sequence/NumPy record in
+        # input_features order. Returns a (1, n_output) float64 row.
+        if out is None:
+            out = np.zeros((1, self.n_output))
+        else:
+            out[:] = 0.0
+        row = out[0]
+
+        if not isinstance(record, dict):
+            record = dict(zip(self.input_features, record))
+
+        for block in self.blocks:
+            if block["kind"] == "numerical":
+                for j, feature in enumerate(block["features"]):
+                    value = record.get(feature)
+                    value = block["fill"][j] if _is_missing(value) else float(value)
+                    row[block["start"] + j] = (value - block["mean"][j]) / block["scale"][j]
+            else:
+                for j, feature in enumerate(block["features"]):
+                    value = record.get(feature)
+                    value = block["fill"][j] if _is_missing(value) else str(value)
+                    try:
+                        column, hot_value = block["lookup"][j][value]
+                    except KeyError:
+                        raise ValueError(
+                            f"Found unknown categories [{value!r}] in column {j} during transform"
+                        ) from None
+                    row[column] = hot_value
+        return out
+
+    def transform(self, df, out=None):
+        # Vectorized equivalent for a DataFrame; `out` may be a preallocated
+        # (len(df), n_output) float64 buffer that is overwritten in place.
+        n_rows = len(df)
+        if out is None:
+            out = np.zeros((n_rows, self.n_output))
+        else:
+            out[:] = 0.0
+        rows = np.arange(n_rows)
+
+        for block in self.blocks:
+            if block["kind"] == "numerical":
+                for j, feature in enumerate(block["features"]):
+                    values = pd.to_numeric(df[feature]).to_numpy(dtype=np.float64, na_value=np.nan)
+                    values = np.where(np.isnan(values), block["fill"][j], values)
+                    out[:, block["start"] + j] = (values - block["mean"][j]) / block["scale"][j]
+            else:
+                for j, feature in enumerate(block["features"]):
+                    column = df[feature]
+                    column = column.astype(object).where(column.notna(), block["fill"][j])
+                    codes = pd.Categorical(column, categories=block["categories"][j]).codes
+                    if (codes < 0).any():
+                        unknown = sorted(set(column[codes < 0].astype(str)))
+                        raise ValueError(f"Found unknown categories {unknown} in column {j} during transform")
+                    out[rows, block["offsets"][j] + codes] = block["hot_values"][j][codes]
+        return out
+
+    def validate_against(self, preprocessor, df):
+        from scipy import sparse
+
+        expected = preprocessor.transform(df)
+        if sparse.issparse(expected):
+            expected = expected.toarray()
+        if not np.array_equal(expected, self.transform(df)):
+            return False
+        records = df[self.input_features].to_dict("records")
+        return all(
+            np.array_equal(expected[i:i + 1], self.transform_record(record))
+            for i, record in enumerate(records)
+        )
+
+    def save(self, file_path):
+        try:
+            arrays, meta_blocks = {}, []
+            for b, block in enumerate(self.blocks):
+                meta = {k: block[k] for k in ("kind", "features", "start")}
+                if block["kind"] == "numerical":
+                    for key in ("fill", "mean", "scale"):
+                        arrays[f"b{b}_{key}"] = block[key]
+                else:
+                    meta.update({k: block[k] for k in ("fill", "categories", "offsets")})
+                    for j, hot_values in enumerate(block["hot_values"]):
+                        arrays[f"b{b}_hot{j}"] = hot_values
+                meta_blocks.append(meta)
+
+            meta = {"input_features": self.input_features, "n_output": self.n_output, "blocks": meta_blocks}
+            write_atomic(file_path, lambda file_obj: np.savez(file_obj, meta=np.array(json.dumps(meta)), **arrays))
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                blocks = []
+                for b, block in enumerate(meta["blocks"]):
+                    if block["kind"] == "numerical":
+                        for key in ("fill", "mean", "scale"):
+                            block[key] = data[f"b{b}_{key}"]
+                    else:
+                        block["hot_values"] = [data[f"b{b}_hot{j}"] for j in range(len(block["features"]))]
+                    blocks.append(block)
+            return cls(meta["input_features"], blocks, meta["n_output"])
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def validation_rows(compiled, df, max_rows):
+    # Per-record validation is a Python loop, so on large training sets check
+    # one row per distinct categorical combination plus a random sample.
+    if len(df) <= max_rows:
+        return df
+    categorical = [f for block in compiled.blocks if block["kind"] == "categorical" for f in block["features"]]
+    covering = df.drop_duplicates(subset=categorical).head(max_rows)
+    sample = df.sample(n=max(max_rows - len(covering), 0), random_state=0)
+    return pd.concat([covering, sample])
+
+
+def export_compiled_preprocessor(preprocessor, validation_df, file_path, max_validation_rows=5000):
+    # Any preprocessor that can't be compiled, or whose compiled form doesn't
+    # reproduce sklearn exactly, removes an earlier export, so the single-row
+    # path can never pair a stale encoding with a newly trained model.
+    try:
+        try:
+            compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+            matches = compiled.validate_against(
+                preprocessor, validation_rows(compiled, validation_df, max_validation_rows)
+            )
+        except Exception as e:
+            matches = False
+            logging.info(f"Not compiling the preprocessor: {e}")
+        if not matches:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            logging.info("Compiled preprocessor unavailable or not matching sklearn output; not exporting it")
+            return None
+
+        compiled.save(file_path)
+        logging.info(f"Exported compiled preprocessor to {file_path}")
+        return file_path
+
+    except Exception as e:
+        raise CustomException(e, sys)
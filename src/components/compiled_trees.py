@@ -0,0 +1,286 @@
+import json
+import os
+import sys
+
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import write_atomic
+
+
+def _threshold_float32(threshold):
+    # sklearn compares float32 features against float64 thresholds. For a
+    # float32 x, x <= t holds exactly when x <= (largest float32 <= t), so the
+    # thresholds can be stored at the features' precision without changing
+    # a single split.
+    t32 = threshold.astype(np.float32)
+    above = t32.astype(np.float64) > threshold
+    t32[above] = np.nextafter(t32[above], np.float32(-np.inf))
+    return t32
+
+
+# Fitted sklearn tree ensemble flattened into contiguous node arrays: split
+# feature, float32 threshold, (left, right) children, missing-value direction
+# and leaf value, with every tree's nodes appended after the previous tree's.
+# Leaves point to themselves, so a row can take more steps than its path is
+# long without moving. The per-tree leaf values are then combined in the same
+# order and precision as the estimator's own predict:
+#   "tree"            DecisionTreeRegressor
+#   "mean"            RandomForest/ExtraTrees: running sum over trees / n_trees
+#   "boosting"        GradientBoosting: init constant + learning_rate * each stage
+#   "weighted_median" AdaBoost: weighted median of the estimators
+# which makes the predictions bit-for-bit identical to model.predict.
+class CompiledTreeEnsemble:
+    # Rows x trees at or below this are walked in plain Python, which beats
+    # NumPy's per-call overhead for a single row through a few trees.
+    SCALAR_MAX_PATHS = 32
+    # Below this many rows all trees advance together, one level per step;
+    # from here on each tree is walked on its own (its nodes stay in cache
+    # and it stops at its own depth).
+    TREE_MAJOR_MIN_ROWS = 1024
+    # Rows x trees of leaf values held per chunk.
+    CHUNK_PATHS = 1 << 21
+
+    def __init__(self, arrays, meta):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.children = arrays["children"]
+        self.missing_left = arrays["missing_left"]
+        self.value = arrays["value"]
+        self.roots = arrays["roots"]
+        self.depths = arrays["depths"]
+        self.weights = arrays["weights"]
+        self.meta = meta
+        self.combine = meta["combine"]
+        self.n_features = meta["n_features"]
+        self.max_depth = meta["max_depth"]
+        self.any_missing_left = bool(self.missing_left.any())
+
+        # Traversal works on slots: node k owns slots 2k and 2k + 1, so the
+        # next slot is children_slots[slot + went_left] without a multiply.
+        self._feature_slots = np.repeat(self.feature.astype(np.intp), 2)
+        self._threshold_slots = np.repeat(self.threshold, 2)
+        self._missing_slots = np.repeat(self.missing_left, 2)
+        self._value_slots = np.repeat(self.value, 2)
+        self._children_slots = np.empty(2 * len(self.feature), dtype=np.intp)
+        self._children_slots[0::2] = 2 * self.children[:, 1]
+        self._children_slots[1::2] = 2 * self.children[:, 0]
+        self._node_lists = None
+
+    @classmethod
+    def from_trees(cls, trees, combine, n_features, model_type, scale=1.0, baseline=0.0, weights=None):
+        feature, threshold, children, missing_left, value, roots, depths = [], [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            if tree.n_outputs != 1:
+                raise ValueError("Only single-output trees can be compiled")
+            leaf = tree.children_left == -1
+            node_ids = np.arange(tree.node_count)
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(np.where(leaf, np.inf, tree.threshold))
+            children.append(np.stack([
+                np.where(leaf, node_ids, tree.children_left),
+                np.where(leaf, node_ids, tree.children_right),
+            ], axis=1) + offset)
+            missing = getattr(tree, "missing_go_to_left", np.zeros(tree.node_count, dtype=np.uint8))
+            missing_left.append(~leaf & missing.astype(bool))
+            value.append(tree.value[:, 0, 0])
+            roots.append(offset)
+            depths.append(tree.max_depth)
+            offset += tree.node_count
+
+        arrays = {
+            "feature": np.concatenate(feature).astype(np.int32),
+            "threshold": _threshold_float32(np.concatenate(threshold)),
+            "children": np.concatenate(children).astype(np.int32),
+            "missing_left": np.concatenate(missing_left),
+            "value": np.concatenate(value).astype(np.float64),
+            "roots": np.array(roots, dtype=np.int32),
+            "depths": np.array(depths, dtype=np.int32),
+            "weights": np.asarray(weights if weights is not None else [], dtype=np.float64),
+        }
+        meta = {"combine": combine, "n_features": int(n_features), "max_depth": int(max(depths)),
+                "scale": float(scale), "baseline": float(baseline), "model_type": model_type}
+        return cls(arrays, meta)
+
+    @classmethod
+    def from_model(cls, model):
+        # sklearn is only needed to compile; predicting runs on NumPy alone.
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import (
+            AdaBoostRegressor,
+            ExtraTreesRegressor,
+            GradientBoostingRegressor,
+            RandomForestRegressor,
+        )
+        from sklearn.tree import DecisionTreeRegressor
+
+        model_type = type(model).__name__
+        n_features = model.n_features_in_
+        if isinstance(model, DecisionTreeRegressor):
+            return cls.from_trees([model.tree_], "tree", n_features, model_type)
+        if isinstance(model, (RandomForestRegressor, ExtraTreesRegressor)):
+            return cls.from_trees([e.tree_ for e in model.estimators_], "mean", n_features, model_type)
+        if isinstance(model, GradientBoostingRegressor):
+            if isinstance(model.init_, str) and model.init_ == "zero":
+                baseline = 0.0
+            elif isinstance(model.init_, DummyRegressor):
+                baseline = float(np.ravel(model.init_.constant_)[0])
+            else:
+                raise ValueError("Only constant init estimators can be compiled")
+            return cls.from_trees([e.tree_ for e in model.estimators_[:, 0]], "boosting", n_features, model_type,
+                                  scale=model.learning_rate, baseline=baseline)
+        if isinstance(model, AdaBoostRegressor):
+            if not all(isinstance(e, DecisionTreeRegressor) for e in model.estimators_):
+                raise ValueError("Only AdaBoost over decision trees can be compiled")
+            return cls.from_trees([e.tree_ for e in model.estimators_], "weighted_median", n_features, model_type,
+                                  weights=model.estimator_weights_[:len(model.estimators_)])
+        raise ValueError(f"{model_type} is not a supported tree ensemble")
+
+    def _step(self, slots, flat, row_base, check_missing):
+        x = flat[row_base + self._feature_slots[slots]]
+        went_left = x <= self._threshold_slots[slots]
+        if check_missing:
+            went_left |= np.isnan(x) & self._missing_slots[slots]
+        return self._children_slots[slots + went_left]
+
+    def leaf_values(self, X):
+        # (trees, rows) value of the leaf every row reaches in every tree.
+        n_rows = X.shape[0]
+        flat = X.ravel()
+        row_base = np.arange(n_rows, dtype=np.intp) * X.shape[1]
+        check_missing = self.any_missing_left and np.isnan(flat).any()
+        if n_rows < self.TREE_MAJOR_MIN_ROWS:
+            slots = np.repeat(2 * self.roots.astype(np.intp)[:, None], n_rows, axis=1)
+            for _ in range(self.max_depth):
+                slots = self._step(slots, flat, row_base, check_missing)
+            return self._value_slots[slots]
+
+        values = np.empty((len(self.roots), n_rows))
+        for t, (root, depth) in enumerate(zip(self.roots.tolist(), self.depths.tolist())):
+            slots = np.full(n_rows, 2 * root, dtype=np.intp)
+            for _ in range(depth):
+                slots = self._step(slots, flat, row_base, check_missing)
+            np.take(self._value_slots, slots, out=values[t])
+        return values
+
+    def leaf_values_scalar(self, X):
+        if self._node_lists is None:
+            self._node_lists = (self.feature.tolist(), self.threshold.tolist(),
+                                self.children.tolist(), self.missing_left.tolist(), self.value.tolist())
+        feature, threshold, children, missing_left, value = self._node_lists
+        values = []
+        for node in self.roots.tolist():
+            tree_values = []
+            for row in X.tolist():
+                leaf = node
+                while True:
+                    x = row[feature[leaf]]
+                    left = x <= threshold[leaf] or (x != x and missing_left[leaf])
+                    child = children[leaf][0 if left else 1]
+                    if child == leaf:
+                        break
+                    leaf = child
+                tree_values.append(value[leaf])
+            values.append(tree_values)
+        return np.array(values, dtype=np.float64).reshape(len(self.roots), X.shape[0])
+
+    def combine_values(self, values):
+        if self.combine == "tree":
+            return values[0]
+        if self.combine == "mean":
+            # cumsum adds strictly in tree order, like the forest's accumulation.
+            return np.cumsum(values, axis=0)[-1] / values.shape[0]
+        if self.combine == "boosting":
+            terms = np.empty((values.shape[0] + 1, values.shape[1]))
+            terms[0] = self.meta["baseline"]
+            terms[1:] = self.meta["scale"] * values
+            return np.cumsum(terms, axis=0)[-1]
+        # AdaBoostRegressor._get_median_predict
+        predictions = values.T
+        sorted_idx = np.argsort(predictions, axis=1)
+        weight_cdf = np.cumsum(self.weights[sorted_idx], axis=1, dtype=np.float64)
+        median_or_above = weight_cdf >= 0.5 * weight_cdf[:, -1][:, np.newaxis]
+        median_idx = median_or_above.argmax(axis=1)
+        rows = np.arange(predictions.shape[0])
+        return predictions[rows, sorted_idx[rows, median_idx]]
+
+    def predict(self, X):
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got shape {X.shape}")
+        n_rows, n_trees = X.shape[0], len(self.roots)
+        chunk_rows = max(1, self.CHUNK_PATHS // n_trees)
+        out = np.empty(n_rows)
+        for start in range(0, n_rows, chunk_rows):
+            block = X[start:start + chunk_rows]
+            if hasattr(block, "toarray"):
+                block = block.toarray()
+            # sklearn trees split on float32 features.
+            block = np.ascontiguousarray(block, dtype=np.float32)
+            if block.shape[0] * n_trees <= self.SCALAR_MAX_PATHS:
+                values = self.leaf_values_scalar(block)
+            else:
+                values = self.leaf_values(block)
+            out[start:start + block.shape[0]] = self.combine_values(values)
+        return out
+
+    def __getstate__(self):
+        # Every array, slots included, pickles out of band, so a copy loaded
+        # with load_object_mmap predicts straight from the mapped file.
+        state = dict(self.__dict__)
+        state["_node_lists"] = None
+        return state
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def save(self, file_path):
+        try:
+            arrays = {k: getattr(self, k) for k in
+                      ("feature", "threshold", "children", "missing_left", "value", "roots", "depths", "weights")}
+            write_atomic(file_path, lambda file_obj: np.savez(file_obj, meta=np.array(json.dumps(self.meta)), **arrays))
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                arrays = {k: data[k] for k in data.files if k != "meta"}
+            return cls(arrays, meta)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def export_compiled_trees(file_path, model, X_check=None):
+    # Compiles a supported tree-ensemble winner next to model.pkl. Any other
+    # model removes an earlier export, so the compiled backend can never serve
+    # an older model than model.pkl. With X_check the export is only kept if
+    # it reproduces model.predict exactly.
+    try:
+        try:
+            compiled = CompiledTreeEnsemble.from_model(model)
+        except ValueError as e:
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            logging.info(f"Not compiling the model: {e}")
+            return None
+
+        if X_check is not None and not np.array_equal(compiled.predict(X_check), model.predict(X_check)):
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            logging.info("Compiled trees do not match model.predict; not exporting them")
+            return None
+
+        compiled.save(file_path)
+        logging.info(f"Compiled {compiled.meta['model_type']} ({len(compiled.roots)} trees, "
+                     f"{compiled.n_nodes} nodes) to {file_path}")
+        return file_path
+
+    except Exception as e:
+        raise CustomException(e, sys)
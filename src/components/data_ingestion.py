@@ -3,21 +3,30 @@ import os
 import sys
 from src.exception import CustomException
 from src.logger import logging
+from src.instrumentation import timed
+from src.components.data_storage import FrameWriter, iter_frame_chunks, read_frame, with_storage_format, write_frame
 import pandas as pd
 
 from sklearn.model_selection import train_test_split
 from dataclasses import dataclass
 
-from src.components.data_transformation import DataTransformation
-from src.components.data_transformation import DataTransformationConfig
-
-from src.components.model_trainer import ModelTrainerConfig
-from src.components.model_trainer import ModelTrainer
 @dataclass
 class DataIngestionConfig:
+    source_data_path: str=os.path.join('notebook','data','stud.csv')
     train_data_path: str=os.path.join('artifacts',"train.csv")
     test_data_path: str=os.path.join('artifacts',"test.csv")
     raw_data_path: str=os.path.join('artifacts',"data.csv")
+    test_size: float=0.2
+    # Rows per chunk for initiate_streaming_ingestion.
+    chunk_size: int=100000
+    # "csv", "parquet" or "feather" for the raw/train/test files; the output
+    # paths take the matching extension.
+    storage_format: str="csv"
+
+    def __post_init__(self):
+        self.raw_data_path=with_storage_format(self.raw_data_path,self.storage_format)
+        self.train_data_path=with_storage_format(self.train_data_path,self.storage_format)
+        self.test_data_path=with_storage_format(self.test_data_path,self.storage_format)
 
 class DataIngestion:
     def __init__(self):
@@ -26,19 +35,23 @@ class DataIngestion:
     def initiate_data_ingestion(self):
         logging.info("Entered the data ingestion method or component")
         try:
-            df=pd.read_csv('notebook\data\stud.csv')
+            with timed("ingestion",{"step":"read"}):
+                df=read_frame(self.ingestion_config.source_data_path)
             logging.info('Read the dataset as dataframe')
 
             os.makedirs(os.path.dirname(self.ingestion_config.train_data_path),exist_ok=True)
 
-            df.to_csv(self.ingestion_config.raw_data_path,index=False,header=True)
+            with timed("ingestion",{"step":"write_raw"},rows=len(df)):
+                write_frame(df,self.ingestion_config.raw_data_path)
 
             logging.info("Train test split initiated")
-            train_set,test_set=train_test_split(df,test_size=0.2,random_state=42)
+            with timed("ingestion",{"step":"split"}):
+                train_set,test_set=train_test_split(df,test_size=self.ingestion_config.test_size,random_state=42)
 
-            train_set.to_csv(self.ingestion_config.train_data_path,index=False,header=True)
+            with timed("ingestion",{"step":"write_splits"}):
+                write_frame(train_set,self.ingestion_config.train_data_path)
 
-            test_set.to_csv(self.ingestion_config.test_data_path,index=False,header=True)
+                write_frame(test_set,self.ingestion_config.test_data_path)
 
             logging.info("Inmgestion of the data iss completed")
 
@@ -49,13 +62,55 @@ class DataIngestion:
             )
         except Exception as e:
             raise CustomException(e,sys)
-        
-if __name__=="__main__":
-    obj=DataIngestion()
-    train_data,test_data=obj.initiate_data_ingestion()
 
-    data_transformation=DataTransformation()
-    train_arr,test_arr,_=data_transformation.initiate_data_transformation(train_data,test_data)
+    def hashed_test_mask(self,chunk):
+        # A row's side depends only on its content, so the split is the same
+        # however the file is chunked and whichever order it arrives in.
+        buckets=pd.util.hash_pandas_object(chunk,index=False).to_numpy()%10000
+        return buckets<int(self.ingestion_config.test_size*10000)
+
+    def initiate_streaming_ingestion(self):
+        # Chunked variant of initiate_data_ingestion for sources that don't
+        # fit in memory; writes the same three files.
+        logging.info("Entered the streaming data ingestion method")
+        config=self.ingestion_config
+        outputs=[config.raw_data_path,config.train_data_path,config.test_data_path]
+        # Temp names keep the extension, which selects the format.
+        tmp_paths=["{0}.tmp{1}".format(*os.path.splitext(path)) for path in outputs]
+        try:
+            os.makedirs(os.path.dirname(config.train_data_path),exist_ok=True)
+            n_train=n_test=0
+            with timed("ingestion",{"step":"streaming_split"}):
+                writers=[FrameWriter(path) for path in tmp_paths]
+                try:
+                    raw_writer,train_writer,test_writer=writers
+                    for chunk in iter_frame_chunks(config.source_data_path,config.chunk_size):
+                        test_mask=self.hashed_test_mask(chunk)
+                        raw_writer.write(chunk)
+                        train_writer.write(chunk[~test_mask])
+                        test_writer.write(chunk[test_mask])
+                        n_train+=int((~test_mask).sum())
+                        n_test+=int(test_mask.sum())
+                finally:
+                    for writer in writers:
+                        writer.close()
+
+            for tmp_path,path in zip(tmp_paths,outputs):
+                os.replace(tmp_path,path)
+            logging.info(f"Streaming ingestion wrote {n_train} train and {n_test} test rows")
 
-    modeltrainer=ModelTrainer()
-    print(modeltrainer.initiate_model_trainer(train_arr,test_arr))
+            return(
+                config.train_data_path,
+                config.test_data_path
+            )
+        except Exception as e:
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise CustomException(e,sys)
+        
+if __name__=="__main__":
+    # Kept as an entry point; the stages are run by the training pipeline,
+    # which skips the ones whose inputs haven't changed.
+    from src.pipeline.train_pipeline import main
+    main()
@@ -0,0 +1,147 @@
+import os
+
+import pandas as pd
+
+# Readers/writers for the ingested raw/train/test splits. CSV is the default;
+# Parquet and Feather store the five categorical columns as dictionary-encoded
+# categoricals and the scores as integers, so reading them back skips text
+# parsing and type inference entirely. The format is taken from the file
+# extension.
+STORAGE_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
+
+CATEGORICAL_COLUMNS = [
+    "gender",
+    "race_ethnicity",
+    "parental_level_of_education",
+    "lunch",
+    "test_preparation_course",
+]
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet/Feather storage needs pyarrow: pip install pyarrow") from e
+
+
+def storage_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    for name, format_extension in STORAGE_FORMATS.items():
+        if extension == format_extension:
+            return name
+    if extension == ".pq":
+        return "parquet"
+    raise ValueError(f"Unknown storage format for {path}; expected one of {list(STORAGE_FORMATS.values())}")
+
+
+def with_storage_format(path, fmt):
+    if fmt not in STORAGE_FORMATS:
+        raise ValueError(f"Unknown storage format {fmt!r}; expected one of {list(STORAGE_FORMATS)}")
+    return os.path.splitext(path)[0] + STORAGE_FORMATS[fmt]
+
+
+def to_categorical(df):
+    # Only columns that are present and still stored as strings.
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("category")
+    return df
+
+
+def write_frame(df, path):
+    fmt = storage_format(path)
+    if fmt == "csv":
+        df.to_csv(path, index=False, header=True)
+        return path
+    _require_pyarrow()
+    df = to_categorical(df.copy())
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(path)
+    return path
+
+
+def read_frame(path, columns=None):
+    fmt = storage_format(path)
+    if fmt == "csv":
+        return pd.read_csv(path, usecols=columns)
+    _require_pyarrow()
+    if fmt == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_feather(path, columns=columns)
+
+
+def frame_columns(path):
+    fmt = storage_format(path)
+    if fmt == "csv":
+        return list(pd.read_csv(path, nrows=0).columns)
+    pyarrow = _require_pyarrow()
+    if fmt == "parquet":
+        return list(pyarrow.parquet.read_schema(path).names)
+    return list(pyarrow.ipc.open_file(path).schema.names)
+
+
+def iter_frame_chunks(path, chunk_size):
+    fmt = storage_format(path)
+    if fmt == "csv":
+        with pd.read_csv(path, chunksize=chunk_size) as reader:
+            yield from reader
+        return
+    pyarrow = _require_pyarrow()
+    if fmt == "parquet":
+        for batch in pyarrow.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+        return
+    # Feather is an Arrow IPC file: read it record batch by record batch
+    # from a memory map instead of decoding the whole table.
+    with pyarrow.memory_map(path) as source:
+        reader = pyarrow.ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            for offset in range(0, batch.num_rows, chunk_size):
+                yield batch.slice(offset, chunk_size).to_pandas()
+
+
+class FrameWriter:
+    # Appends DataFrame chunks to one file of any supported format, for the
+    # streaming ingestion. Categoricals are written as plain strings here:
+    # chunks don't share a category set, and Parquet dictionary-encodes the
+    # column pages anyway.
+    def __init__(self, path):
+        self.path = path
+        self.format = storage_format(path)
+        self.writer = None
+        self.file_obj = None
+
+    def write(self, chunk):
+        if self.format == "csv":
+            if self.file_obj is None:
+                self.file_obj = open(self.path, "w", newline="")
+                chunk.to_csv(self.file_obj, index=False, header=True)
+            else:
+                chunk.to_csv(self.file_obj, index=False, header=False)
+            return
+
+        pyarrow = _require_pyarrow()
+        table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+        if self.writer is None:
+            self.schema = table.schema
+            if self.format == "parquet":
+                self.writer = pyarrow.parquet.ParquetWriter(self.path, self.schema)
+            else:
+                self.writer = pyarrow.ipc.new_file(self.path, self.schema)
+        else:
+            # e.g. a column that happens to be all-null in this chunk.
+            table = table.cast(self.schema)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.file_obj is not None:
+            self.file_obj.close()
+        if self.writer is not None:
+            self.writer.close()
@@ -11,11 +11,26 @@ from sklearn.preprocessing import OneHotEncoder, StandardScaler
 
 from src.exception import CustomException
 from src.logger import logging
+from src.instrumentation import timed
 from src.utils import save_object
+from src.components.compiled_preprocessor import export_compiled_preprocessor
+from src.components.fused_preprocessor import build_fused_preprocessor
+from src.components.feature_matrix import FeatureMatrix
+from src.components.data_storage import read_frame
 
 @dataclass
 class DataTransformationConfig:
     preprocessor_obj_file_path = os.path.join('artifacts', "preprocessor.pkl")
+    compiled_preprocessor_file_path = os.path.join('artifacts', "preprocessor_compiled.npz")
+    # Keep the one-hot block sparse (CSR) all the way into training.
+    sparse_one_hot: bool = False
+    # float32 halves the training matrix. Tree ensembles (sklearn, XGBoost,
+    # CatBoost) cast to float32 internally anyway, so it changes nothing
+    # for them; linear models would be fit in lower precision.
+    feature_dtype: str = "float64"
+    # Transform train/test with the single-pass fused preprocessor, written
+    # straight into the final feature matrices (dense output only).
+    fused_transform: bool = False
 
 class DataTransformation:
     def __init__(self):
@@ -36,7 +51,7 @@ class DataTransformation:
             cat_pipeline = Pipeline(
                 steps=[
                     ("imputer", SimpleImputer(strategy="most_frequent")),
-                    ("onehot", OneHotEncoder(sparse_output=False)),  # Updated here
+                    ("onehot", OneHotEncoder(sparse_output=self.data_transformation_config.sparse_one_hot)),
                     ("scaler", StandardScaler(with_mean=False))
                 ]
             )
@@ -50,6 +65,9 @@ class DataTransformation:
                     ("cat_pipeline", cat_pipeline, categorical_features)
                 ]
             )
+            if self.data_transformation_config.sparse_one_hot:
+                # The default threshold (0.3) would densify: 7 of 19 output columns are non-zero.
+                preprocessor.set_params(sparse_threshold=1.0)
 
             return preprocessor
 
@@ -57,9 +75,37 @@ class DataTransformation:
             raise CustomException(e, sys)
 
     def initiate_data_transformation(self, train_path, test_path):
+        # Legacy [X | y] arrays for callers that still expect them.
+        train_fm, test_fm, preprocessor_path = self.initiate_feature_transformation(train_path, test_path)
+        return train_fm.as_array(), test_fm.as_array(), preprocessor_path
+
+    def to_feature_dtype(self, X):
+        dtype = np.dtype(self.data_transformation_config.feature_dtype)
+        return X.astype(dtype, copy=False)
+
+    def fused_feature_transformation(self, preprocessing_obj, train_df, test_df):
+        # Fit sklearn for the statistics (and preprocessor.pkl), then write
+        # both splits in one pass each into arrays of the final dtype. None
+        # when the fitted preprocessor can't be fused exactly.
+        with timed("transformation", {"step": "fit"}, rows=len(train_df)):
+            preprocessing_obj.fit(train_df)
+            fused = build_fused_preprocessor(preprocessing_obj, train_df)
+        if fused is None:
+            logging.info("Falling back to the sklearn transform")
+            return None
+
+        dtype = np.dtype(self.data_transformation_config.feature_dtype)
+        arrays = []
+        for step, df in (("fused_transform_train", train_df), ("fused_transform_test", test_df)):
+            with timed("transformation", {"step": step}, rows=len(df)):
+                arrays.append(fused.transform(df, out=np.empty((len(df), fused.n_output), dtype=dtype)))
+        return tuple(arrays)
+
+    def initiate_feature_transformation(self, train_path, test_path):
         try:
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            with timed("transformation", {"step": "read"}):
+                train_df = read_frame(train_path)
+                test_df = read_frame(test_path)
 
             logging.info("Read train and test data completed")
             logging.info("Obtaining preprocessing object")
@@ -69,35 +115,59 @@ class DataTransformation:
             target_feature_name = "math_score"
             numerical_features = ['reading_score', 'writing_score']
 
-            input_feature_train_df = train_df.drop(columns=[target_feature_name], axis=1)
+            input_feature_train_df = train_df.drop(columns=[target_feature_name])
             target_feature_train_df = train_df[target_feature_name]
 
-            input_feature_test_df = test_df.drop(columns=[target_feature_name], axis=1)
+            input_feature_test_df = test_df.drop(columns=[target_feature_name])
             target_feature_test_df = test_df[target_feature_name]
 
             logging.info("Applying preprocessing object on train and test data")
 
-            input_feature_train_arr = preprocessing_obj.fit_transform(input_feature_train_df)
-            input_feature_test_arr = preprocessing_obj.transform(input_feature_test_df)
+            fused_arrays = None
+            if self.data_transformation_config.fused_transform and not self.data_transformation_config.sparse_one_hot:
+                fused_arrays = self.fused_feature_transformation(
+                    preprocessing_obj, input_feature_train_df, input_feature_test_df)
+
+            if fused_arrays is not None:
+                input_feature_train_arr, input_feature_test_arr = fused_arrays
+            else:
+                with timed("transformation", {"step": "fit_transform"}, rows=len(input_feature_train_df)):
+                    input_feature_train_arr = self.to_feature_dtype(preprocessing_obj.fit_transform(input_feature_train_df))
+                with timed("transformation", {"step": "transform"}, rows=len(input_feature_test_df)):
+                    input_feature_test_arr = self.to_feature_dtype(preprocessing_obj.transform(input_feature_test_df))
+
+            feature_names = [str(f) for f in preprocessing_obj.get_feature_names_out()]
+            train_fm = FeatureMatrix(
+                X=input_feature_train_arr,
+                y=target_feature_train_df.to_numpy(dtype=np.float64),
+                feature_names=feature_names
+            )
+            test_fm = FeatureMatrix(
+                X=input_feature_test_arr,
+                y=target_feature_test_df.to_numpy(dtype=np.float64),
+                feature_names=feature_names
+            )
 
-            train_arr = np.c_[
-                input_feature_train_arr, np.array(target_feature_train_df)
-            ]
+            logging.info("Saving preprocessing object")
 
-            test_arr = np.c_[
-                input_feature_test_arr, np.array(target_feature_test_df)
-            ]
+            with timed("transformation", {"step": "save"}):
+                save_object(
+                    file_path=self.data_transformation_config.preprocessor_obj_file_path,
+                    obj=preprocessing_obj
+                )
 
-            logging.info("Saving preprocessing object")
+            logging.info("Exporting compiled preprocessor for the single-row inference path")
 
-            save_object(
-                file_path=self.data_transformation_config.preprocessor_obj_file_path,
-                obj=preprocessing_obj
-            )
+            with timed("transformation", {"step": "export_compiled"}):
+                export_compiled_preprocessor(
+                    preprocessing_obj,
+                    input_feature_train_df,
+                    self.data_transformation_config.compiled_preprocessor_file_path
+                )
 
             return (
-                train_arr,
-                test_arr,
+                train_fm,
+                test_fm,
                 self.data_transformation_config.preprocessor_obj_file_path
             )
 
@@ -0,0 +1,76 @@
+import json
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from src.exception import CustomException
+
+
+# Features and target kept apart, so the trainer gets X exactly as the
+# preprocessor produced it instead of slicing a concatenated [X | y] array
+# (which costs a full copy to build and leaves X non-contiguous, so most
+# estimators copy it again). X may be float32 and/or CSR sparse.
+@dataclass
+class FeatureMatrix:
+    X: object
+    y: np.ndarray
+    feature_names: list = None
+
+    @classmethod
+    def from_array(cls, arr, feature_names=None):
+        # Legacy [X | y] layout; both halves are views into arr.
+        return cls(X=arr[:, :-1], y=arr[:, -1], feature_names=feature_names)
+
+    @property
+    def is_sparse(self):
+        return sparse.issparse(self.X)
+
+    @property
+    def n_samples(self):
+        return self.X.shape[0]
+
+    @property
+    def nbytes(self):
+        if self.is_sparse:
+            x_bytes = self.X.data.nbytes + self.X.indices.nbytes + self.X.indptr.nbytes
+        else:
+            x_bytes = self.X.nbytes
+        return x_bytes + self.y.nbytes
+
+    def as_array(self):
+        # The concatenated layout older callers expect; this copies.
+        X = self.X.toarray() if self.is_sparse else self.X
+        return np.c_[X, self.y]
+
+    def save(self, file_path):
+        try:
+            arrays = {"y": self.y}
+            if self.is_sparse:
+                X = self.X.tocsr()
+                arrays.update(X_data=X.data, X_indices=X.indices, X_indptr=X.indptr,
+                              X_shape=np.asarray(X.shape))
+            else:
+                arrays["X"] = self.X
+            meta = {"feature_names": self.feature_names}
+            with open(file_path, "wb") as file_obj:
+                np.savez(file_obj, meta=np.array(json.dumps(meta)), **arrays)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, file_path):
+        try:
+            with np.load(file_path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if "X" in data:
+                    X = data["X"]
+                else:
+                    X = sparse.csr_matrix((data["X_data"], data["X_indices"], data["X_indptr"]),
+                                          shape=tuple(data["X_shape"]))
+                return cls(X=X, y=data["y"], feature_names=meta["feature_names"])
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,136 @@
+import hashlib
+import os
+import pickle
+import sys
+import threading
+from dataclasses import dataclass
+from importlib import metadata
+
+import numpy as np
+from scipy import sparse
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import write_atomic
+
+# Parameters that only change how a fit is scheduled, not what it produces.
+SCHEDULING_PARAMS = ("n_jobs", "thread_count", "allow_writing_files", "verbose")
+
+# Libraries whose upgrade can change a fit (or its pickle); part of every key.
+KEYED_LIBRARIES = ("numpy", "scipy", "scikit-learn", "xgboost", "catboost")
+
+
+def library_versions():
+    versions = []
+    for name in KEYED_LIBRARIES:
+        try:
+            versions.append((name, metadata.version(name)))
+        except metadata.PackageNotFoundError:
+            versions.append((name, None))
+    return tuple(versions)
+
+
+@dataclass
+class FitCacheConfig:
+    cache_dir: str = os.path.join("artifacts", "fit_cache")
+    max_bytes: int = 512 * 1024 * 1024
+
+
+def array_fingerprint(*arrays):
+    digest = hashlib.sha256()
+    for array in arrays:
+        if sparse.issparse(array):
+            array = array.tocsr()
+            digest.update(f"csr{array.shape}".encode())
+            for part in (array.data, array.indices, array.indptr):
+                part = np.ascontiguousarray(part)
+                digest.update(part.dtype.str.encode())
+                digest.update(part.data)
+            continue
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.data)
+    return digest.hexdigest()
+
+
+def estimator_fingerprint(model, params):
+    merged = dict(model.get_params(deep=False))
+    merged.update(params)
+    items = sorted((k, repr(v)) for k, v in merged.items() if k not in SCHEDULING_PARAMS)
+    return f"{type(model).__module__}.{type(model).__qualname__}{items}"
+
+
+# On-disk store of CV fold scores and refit estimators, keyed by a hash of the
+# training data, estimator class and parameters. Each entry is one pickle file;
+# hits bump the file's mtime, and evict() removes the least recently used
+# files once the directory grows past max_bytes.
+class FitCache:
+    def __init__(self, cache_dir=None, max_bytes=None):
+        self.fit_cache_config = FitCacheConfig()
+        if cache_dir:
+            self.fit_cache_config.cache_dir = cache_dir
+        if max_bytes:
+            self.fit_cache_config.max_bytes = max_bytes
+        os.makedirs(self.fit_cache_config.cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._versions = library_versions()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, *parts):
+        return hashlib.sha256(repr((self._versions, parts)).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.fit_cache_config.cache_dir, f"{key}.pkl")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file_obj:
+                value = pickle.load(file_obj)
+            os.utime(path)
+        except Exception as e:
+            # A missing, truncated or unloadable entry is just a miss.
+            if not isinstance(e, FileNotFoundError):
+                logging.info(f"Fit cache entry {key} unreadable, treating as a miss: {e!r}")
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        try:
+            write_atomic(self._path(key),
+                         lambda file_obj: pickle.dump(value, file_obj, protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def evict(self):
+        try:
+            entries = []
+            for entry in os.scandir(self.fit_cache_config.cache_dir):
+                if entry.name.endswith(".pkl"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.fit_cache_config.max_bytes:
+                    break
+                os.remove(path)
+                total -= size
+                removed += 1
+
+            if removed:
+                logging.info(f"Fit cache evicted {removed} entries, {total} bytes remain")
+            return removed
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
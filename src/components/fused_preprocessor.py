@@ -0,0 +1,157 @@
+import sys
+import threading
+import weakref
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.components.compiled_preprocessor import CompiledPreprocessor, validation_rows
+
+
+# Single-pass form of a CompiledPreprocessor for frames. Every input column is
+# read once and written straight into its output columns: numeric columns go
+# through impute/scale in a scratch buffer, categorical columns are turned
+# into codes against a prebuilt index (or by remapping the codes of a pandas
+# categorical, as read from Parquet/Feather) and their scaled one-hot values
+# are scattered into the output with a single put. There is no per-step
+# intermediate matrix and no object-dtype copy of the strings. The arithmetic
+# is CompiledPreprocessor's, so the output is bit-for-bit sklearn's.
+#
+# transform() writes into `out` when given one (any float dtype; training
+# passes the final feature matrix). Without it the result is a view of a
+# per-thread buffer that is reused by that thread's next call, so it must be
+# consumed (e.g. by model.predict) before transforming again.
+class FusedPreprocessor:
+    def __init__(self, compiled):
+        self.input_features = compiled.input_features
+        self.n_output = compiled.n_output
+        self.numerical, self.categorical, self.one_hot_ranges = [], [], []
+        for block in compiled.blocks:
+            if block["kind"] == "numerical":
+                for j, feature in enumerate(block["features"]):
+                    self.numerical.append((feature, block["start"] + j, float(block["fill"][j]),
+                                           float(block["mean"][j]), float(block["scale"][j])))
+                continue
+
+            for j, feature in enumerate(block["features"]):
+                categories = block["categories"][j]
+                fill = block["fill"][j]
+                self.categorical.append({
+                    "feature": feature,
+                    "position": j,
+                    "index": pd.Index(categories, dtype=object),
+                    "fill_code": categories.index(fill) if fill in categories else -1,
+                    "columns": np.arange(len(categories), dtype=np.intp) + block["offsets"][j],
+                    "hot_values": np.asarray(block["hot_values"][j], dtype=np.float64),
+                })
+            width = sum(len(c) for c in block["categories"])
+            self.one_hot_ranges.append((block["start"], block["start"] + width))
+        self._local = threading.local()
+
+    @classmethod
+    def from_column_transformer(cls, preprocessor):
+        return cls(CompiledPreprocessor.from_column_transformer(preprocessor))
+
+    def _scratch(self, n_rows):
+        # Per-thread work buffers, grown to the largest batch seen.
+        local = self._local
+        if getattr(local, "capacity", 0) < n_rows:
+            local.capacity = n_rows
+            local.out = np.empty((n_rows, self.n_output))
+            local.row_base = np.arange(n_rows, dtype=np.intp) * self.n_output
+            local.index = np.empty(n_rows, dtype=np.intp)
+            local.values = np.empty(n_rows)
+            local.mask = np.empty(n_rows, dtype=bool)
+        return local
+
+    def _codes(self, column, spec):
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Map the column's (few) categories once, then every row by code;
+            # code -1 (missing) lands on the appended fill entry.
+            remap = np.append(spec["index"].get_indexer(column.cat.categories.astype(str)), spec["fill_code"])
+            codes = remap[column.cat.codes.to_numpy()]
+        else:
+            codes = spec["index"].get_indexer(column)
+            missing = codes < 0
+            if missing.any():
+                codes[missing & column.isna().to_numpy()] = spec["fill_code"]
+
+        if (codes < 0).any():
+            if isinstance(column.dtype, pd.CategoricalDtype):
+                column = column.astype(object).where(column.notna(), None)
+            unknown = sorted(set(column[codes < 0].astype(str)))
+            raise ValueError(f"Found unknown categories {unknown} in column {spec['position']} during transform")
+        return codes
+
+    def transform(self, df, out=None):
+        n_rows = len(df)
+        scratch = self._scratch(n_rows)
+        if out is None:
+            out = scratch.out[:n_rows]
+        if out.shape != (n_rows, self.n_output) or not out.flags.c_contiguous:
+            raise ValueError(f"out must be a C-contiguous ({n_rows}, {self.n_output}) array")
+
+        values, mask = scratch.values[:n_rows], scratch.mask[:n_rows]
+        for feature, column, fill, mean, scale in self.numerical:
+            source = df[feature]
+            if isinstance(source.dtype, np.dtype) and source.dtype.kind in "iuf":
+                np.copyto(values, source.to_numpy(), casting="unsafe")
+            else:
+                np.copyto(values, pd.to_numeric(source).to_numpy(dtype=np.float64, na_value=np.nan))
+            np.isnan(values, out=mask)
+            np.copyto(values, fill, where=mask)
+            np.subtract(values, mean, out=values)
+            np.divide(values, scale, out=out[:, column])
+
+        for start, stop in self.one_hot_ranges:
+            out[:, start:stop] = 0.0
+        flat = out.reshape(-1)
+        index, row_base = scratch.index[:n_rows], scratch.row_base[:n_rows]
+        for spec in self.categorical:
+            codes = self._codes(df[spec["feature"]], spec)
+            np.take(spec["columns"], codes, out=index)
+            np.add(index, row_base, out=index)
+            np.take(spec["hot_values"], codes, out=values)
+            flat.put(index, values)
+        return out
+
+    def validate_against(self, preprocessor, df):
+        expected = preprocessor.transform(df)
+        if hasattr(expected, "toarray"):
+            expected = expected.toarray()
+        return np.array_equal(expected, self.transform(df))
+
+
+_fused_cache = weakref.WeakKeyDictionary()
+_fused_cache_lock = threading.Lock()
+
+
+def fused_preprocessor(compiled):
+    # One FusedPreprocessor per loaded CompiledPreprocessor (the artifact
+    # registry replaces the compiled object on reload, which drops this one).
+    with _fused_cache_lock:
+        fused = _fused_cache.get(compiled)
+        if fused is None:
+            fused = _fused_cache[compiled] = FusedPreprocessor(compiled)
+        return fused
+
+
+def build_fused_preprocessor(preprocessor, validation_df, max_validation_rows=5000):
+    # Fused transformer for a fitted ColumnTransformer, or None when it can't
+    # be compiled or doesn't reproduce sklearn's output exactly.
+    try:
+        try:
+            compiled = CompiledPreprocessor.from_column_transformer(preprocessor)
+        except CustomException as e:
+            logging.info(f"Preprocessor cannot be fused: {e}")
+            return None
+        fused = FusedPreprocessor(compiled)
+        if not fused.validate_against(preprocessor, validation_rows(compiled, validation_df, max_validation_rows)):
+            logging.info("Fused preprocessor does not match sklearn output; not using it")
+            return None
+        return fused
+
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -0,0 +1,184 @@
+import json
+import os
+import shutil
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+from sklearn.linear_model import SGDRegressor
+
+from src.exception import CustomException
+from src.logger import logging
+from src.instrumentation import timed
+from src.utils import save_object, load_object, remove_object_mmap, write_atomic
+from src.components.data_storage import iter_frame_chunks
+from src.components.native_model import export_native_model
+from src.components.compiled_trees import export_compiled_trees
+
+
+@dataclass
+class IncrementalTrainerConfig:
+    trained_model_file_path = os.path.join("artifacts", "model.pkl")
+    native_model_file_path = os.path.join("artifacts", "model_native.json")
+    compiled_model_file_path = os.path.join("artifacts", "model_compiled.npz")
+    mmap_model_file_path = os.path.join("artifacts", "model_mmap", "model.json")
+    report_file_path = os.path.join("artifacts", "incremental_report.json")
+    # XGBoost external-memory pages are written under this prefix.
+    xgboost_cache_dir = os.path.join("artifacts", "xgb_cache")
+    models: tuple = ("SGD Regressor", "XGBRegressor")
+    # As in ModelTrainerConfig; when off, a previous mmap export is removed
+    # so the mmap backend can't keep serving an older model.
+    save_mmap_artifact: bool = False
+    target_column: str = "math_score"
+    chunk_size: int = 100000
+    sgd_epochs: int = 5
+    sgd_params: dict = field(default_factory=lambda: {"alpha": 1e-4, "eta0": 0.01, "random_state": 42})
+    xgboost_rounds: int = 200
+    xgboost_params: dict = field(default_factory=lambda: {
+        "objective": "reg:squarederror", "learning_rate": 0.1, "max_depth": 6, "tree_method": "hist",
+    })
+
+
+def csv_chunk_iter(trainer, path, cache_prefix):
+    # xgboost is imported on first use, so importing the training pipeline
+    # doesn't load it unless the out-of-core XGBoost trainer actually runs.
+    import xgboost as xgb
+
+    class CSVChunkIter(xgb.DataIter):
+        # Feeds XGBoost one transformed chunk at a time; it builds its quantile
+        # sketch and on-disk pages from these without holding the dataset in RAM.
+        def __init__(self):
+            self.chunks = None
+            super().__init__(cache_prefix=cache_prefix)
+
+        def next(self, input_data):
+            if self.chunks is None:
+                self.chunks = trainer.iter_chunks(path)
+            try:
+                X, y = next(self.chunks)
+            except StopIteration:
+                return False
+            input_data(data=X, label=y)
+            return True
+
+        def reset(self):
+            self.chunks = None
+
+    return CSVChunkIter()
+
+
+# Out-of-core counterpart of ModelTrainer for datasets that don't fit in
+# memory: train.csv is streamed through the compiled preprocessor in chunks,
+# SGDRegressor learns with partial_fit over several epochs and XGBoost trains
+# from external memory. Test R^2 is accumulated chunk by chunk too.
+class IncrementalModelTrainer:
+    def __init__(self):
+        self.incremental_trainer_config = IncrementalTrainerConfig()
+        self.preprocessor = None
+
+    def iter_chunks(self, path, shuffle_seed=None):
+        config = self.incremental_trainer_config
+        for i, chunk in enumerate(iter_frame_chunks(path, config.chunk_size)):
+            if shuffle_seed is not None:
+                # SGD needs rows in random order; shuffling within a chunk is
+                # the out-of-core approximation (the hashed split already
+                # spreads rows across the file).
+                chunk = chunk.sample(frac=1.0, random_state=shuffle_seed + i)
+            y = chunk[config.target_column].to_numpy(dtype=np.float64)
+            X = self.preprocessor.transform(chunk.drop(columns=[config.target_column]))
+            yield X, y
+
+    def train_sgd(self, train_path):
+        config = self.incremental_trainer_config
+        model = SGDRegressor(**config.sgd_params)
+        for epoch in range(config.sgd_epochs):
+            for X, y in self.iter_chunks(train_path, shuffle_seed=epoch * 100003):
+                model.partial_fit(X, y)
+        return model
+
+    def train_xgboost(self, train_path):
+        import xgboost as xgb
+
+        config = self.incremental_trainer_config
+        os.makedirs(config.xgboost_cache_dir, exist_ok=True)
+        try:
+            data = csv_chunk_iter(self, train_path, os.path.join(config.xgboost_cache_dir, "train"))
+            dtrain = xgb.ExtMemQuantileDMatrix(data)
+            booster = xgb.train(config.xgboost_params, dtrain, num_boost_round=config.xgboost_rounds)
+            # The DMatrix removes its own cache pages when it is freed.
+            del dtrain, data
+        finally:
+            shutil.rmtree(config.xgboost_cache_dir, ignore_errors=True)
+
+        # Wrap the booster in the sklearn estimator the prediction path expects.
+        model = xgb.XGBRegressor()
+        model.load_model(booster.save_raw(raw_format="ubj"))
+        return model
+
+    def evaluate(self, model, test_path):
+        # R^2 from running sums, so the test set is streamed as well.
+        n, sum_y, sum_y2, sse = 0, 0.0, 0.0, 0.0
+        for X, y in self.iter_chunks(test_path):
+            residuals = y - model.predict(X)
+            n += len(y)
+            sum_y += float(y.sum())
+            sum_y2 += float((y ** 2).sum())
+            sse += float((residuals ** 2).sum())
+        sst = sum_y2 - sum_y ** 2 / n
+        return 1.0 - sse / sst
+
+    def check_rows(self, test_path, n_rows=1000):
+        # A slice of transformed test rows for checking the exports against
+        # model.predict.
+        chunks = self.iter_chunks(test_path)
+        try:
+            X, _ = next(chunks)
+        finally:
+            chunks.close()
+        return X[:n_rows]
+
+    def save_mmap_model(self, model_name, model, preprocessor_path, X_check):
+        # model_trainer imports the search stack, so load it only when needed.
+        from src.components.model_trainer import ModelTrainer
+
+        trainer = ModelTrainer()
+        trainer.model_trainer_config.mmap_model_file_path = self.incremental_trainer_config.mmap_model_file_path
+        trainer.model_trainer_config.preprocessor_file_path = preprocessor_path
+        trainer.save_mmap_model(model_name, model, X_check=X_check)
+
+    def initiate_incremental_training(self, train_path, test_path, preprocessor_path):
+        try:
+            config = self.incremental_trainer_config
+            self.preprocessor = load_object(preprocessor_path)
+            trainers = {"SGD Regressor": self.train_sgd, "XGBRegressor": self.train_xgboost}
+
+            report, fitted = {}, {}
+            for name in config.models:
+                logging.info(f"Training {name} out of core")
+                with timed("incremental_training", {"model": name}):
+                    fitted[name] = trainers[name](train_path)
+                report[name] = self.evaluate(fitted[name], test_path)
+                logging.info(f"{name}: test R2 {report[name]:.4f}")
+
+            payload = json.dumps(report, indent=2).encode()
+            write_atomic(config.report_file_path, lambda report_file: report_file.write(payload))
+
+            best_model_name = max(report, key=report.get)
+            if report[best_model_name] < 0.6:
+                raise CustomException("No best model found")
+
+            best_model = fitted[best_model_name]
+            save_object(file_path=config.trained_model_file_path, obj=best_model)
+            # Keeps the native, compiled and mmap backends in step with model.pkl.
+            X_check = self.check_rows(test_path)
+            export_native_model(config.native_model_file_path, best_model, {"model_name": best_model_name},
+                                X_check=X_check)
+            export_compiled_trees(config.compiled_model_file_path, best_model, X_check=X_check)
+            if config.save_mmap_artifact:
+                self.save_mmap_model(best_model_name, best_model, preprocessor_path, X_check)
+            else:
+                remove_object_mmap(config.mmap_model_file_path)
+            return best_model_name, report[best_model_name]
+
+        except Exception as e:
+            raise CustomException(e, sys)
@@ -0,0 +1,637 @@
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from sklearn.model_selection import ParameterGrid, ParameterSampler
+
+from src.components.fit_cache import estimator_fingerprint
+from src.components.search_backends import JoblibBackend, SearchData
+from src.exception import CustomException
+from src.logger import logging
+from src.instrumentation import metrics
+
+SEARCH_STRATEGIES = ("grid", "random", "halving", "budgeted", "staged")
+
+
+@dataclass
+class SearchBudget:
+    # Fold fits allowed per family (random/budgeted), or the cap on starting
+    # candidates for halving. None means the whole grid.
+    max_fits: int = None
+    # Wall-clock seconds per family, checked between rounds/waves.
+    max_seconds: float = None
+    # Successive halving: keep 1/factor of the candidates each round, starting
+    # from at least min_resources training rows. It only pays off when a fit
+    # on fewer rows is much cheaper, i.e. from a few thousand rows up
+    # (n_samples >= min_resources * factor**2 at the very least); on ~1k rows
+    # fits are dominated by per-tree overhead and grid/staged are as fast.
+    factor: int = 3
+    min_resources: int = 60
+    # Budgeted search stops after this many waves without improvement.
+    patience: int = 3
+    # Staged search: stop growing an ensemble once the score on a validation
+    # slice of the training fold hasn't improved for this many rounds. The
+    # slice (validation_fraction of the fold) is not trained on, and the
+    # held-out fold only scores, so early stopping can't pick the fold's own
+    # best size. None grows it to the largest size on the whole training fold,
+    # which makes the scores identical to a grid search.
+    early_stopping_rounds: int = None
+    validation_fraction: float = 0.1
+    random_state: int = 42
+
+
+def resolve_n_jobs(n_jobs):
+    cpu_count = os.cpu_count() or 1
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, cpu_count + 1 + n_jobs)
+    return max(1, min(n_jobs, cpu_count))
+
+
+def limit_estimator_threads(model, n_threads):
+    # Each search worker already owns one core of the budget, so the libraries'
+    # own thread pools must not fan out on top of it.
+    if type(model).__module__.startswith("catboost"):
+        model.set_params(thread_count=n_threads, allow_writing_files=False)
+    elif "n_jobs" in model.get_params():
+        model.set_params(n_jobs=n_threads)
+    return model
+
+
+def fit_candidate(model, params, X, y, n_threads):
+    estimator = limit_estimator_threads(clone(model).set_params(**params), n_threads)
+    estimator.fit(X, y)
+    return estimator
+
+
+def fit_on_data(data, model, params, n_threads):
+    return fit_candidate(model, params, data.X, data.y, n_threads)
+
+
+def fit_and_score_fold(data, name, candidate_idx, fold_idx, cv, model, params, n_threads):
+    started = time.time()
+    X, y = data.X, data.y
+    train_idx, test_idx = data.fold(cv, fold_idx)
+    fit_start = time.perf_counter()
+    estimator = fit_candidate(model, params, X[train_idx], y[train_idx], n_threads)
+    fit_seconds = time.perf_counter() - fit_start
+
+    score_start = time.perf_counter()
+    score = r2_score(y[test_idx], estimator.predict(X[test_idx]))
+    score_seconds = time.perf_counter() - score_start
+
+    return {
+        "name": name,
+        "candidate": candidate_idx,
+        "fold": fold_idx,
+        "score": score,
+        "fit_seconds": fit_seconds,
+        "score_seconds": score_seconds,
+        "started": started,
+        "finished": time.time(),
+    }
+
+
+def staged_size_param(model, params):
+    # The ensemble-size parameter whose smaller values can be read off one
+    # fitted ensemble, if the family has one and the grid varies it.
+    module = type(model).__module__
+    if module.startswith("catboost"):
+        name = "iterations"
+    elif hasattr(model, "staged_predict") or module.startswith("xgboost"):
+        name = "n_estimators"
+    else:
+        return None
+    return name if name in params else None
+
+
+def staged_predictions(estimator, X, sizes):
+    # Prediction of the first `size` trees/rounds for each requested size.
+    # Sizes past an early stop get the stopped ensemble, which is what a fit
+    # with that size and early stopping would have returned.
+    module = type(estimator).__module__
+    if module.startswith("xgboost"):
+        n_built = estimator.get_booster().num_boosted_rounds()
+        return {size: estimator.predict(X, iteration_range=(0, min(size, n_built))) for size in sizes}
+    if module.startswith("catboost"):
+        n_built = estimator.tree_count_
+        return {size: estimator.predict(X, ntree_end=min(size, n_built)) for size in sizes}
+
+    if hasattr(estimator, "estimator_weights_") and not hasattr(estimator, "classes_"):
+        return adaboost_staged_predictions(estimator, X, sizes)
+
+    wanted, predictions = set(sizes), {}
+    for stage, prediction in enumerate(estimator.staged_predict(X), start=1):
+        if stage in wanted:
+            predictions[stage] = prediction
+    # AdaBoost ends early on a perfect or useless learner; larger sizes stop there too.
+    for size in sizes:
+        predictions.setdefault(size, prediction)
+    return predictions
+
+
+def built_size(estimator):
+    # Trees/rounds the fitted ensemble actually holds (fewer than asked for
+    # after an early stop).
+    module = type(estimator).__module__
+    if module.startswith("xgboost"):
+        return estimator.get_booster().num_boosted_rounds()
+    if module.startswith("catboost"):
+        return estimator.tree_count_
+    return len(estimator.estimators_)
+
+
+def adaboost_staged_predictions(estimator, X, sizes):
+    # AdaBoostRegressor.staged_predict re-predicts every earlier learner at
+    # each stage (quadratic in n_estimators). Predict each learner once and
+    # take the same weighted median over the first `size` of them.
+    n_built = len(estimator.estimators_)
+    all_predictions = np.array([learner.predict(X) for learner in estimator.estimators_]).T
+    rows = np.arange(all_predictions.shape[0])
+    predictions = {}
+    for size in sizes:
+        limit = min(size, n_built)
+        stage_predictions = all_predictions[:, :limit]
+        sorted_idx = np.argsort(stage_predictions, axis=1)
+        weight_cdf = np.cumsum(estimator.estimator_weights_[sorted_idx], axis=1)
+        median_or_above = weight_cdf >= 0.5 * weight_cdf[:, -1][:, np.newaxis]
+        median_idx = median_or_above.argmax(axis=1)
+        predictions[size] = stage_predictions[rows, sorted_idx[rows, median_idx]]
+    return predictions
+
+
+def fit_staged(model, params, size_param, sizes, X_train, y_train, X_val, y_val, early_stopping_rounds, n_threads):
+    estimator = limit_estimator_threads(clone(model).set_params(**params), n_threads)
+    max_size = max(sizes)
+    module = type(estimator).__module__
+    if early_stopping_rounds is None:
+        estimator.set_params(**{size_param: max_size})
+        estimator.fit(X_train, y_train)
+    elif module.startswith("xgboost"):
+        estimator.set_params(n_estimators=max_size, early_stopping_rounds=early_stopping_rounds)
+        estimator.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+    elif module.startswith("catboost"):
+        # use_best_model would cut the trees after the best iteration; keep
+        # them all so every size below the stop is still scored as trained.
+        estimator.set_params(iterations=max_size, use_best_model=False)
+        estimator.fit(X_train, y_train, eval_set=(X_val, y_val), early_stopping_rounds=early_stopping_rounds)
+    elif "warm_start" in estimator.get_params():
+        # Gradient boosting: grow by early_stopping_rounds trees at a time
+        # with warm_start and check the held-out score of the new stages.
+        best_score, best_size, n_trees = -np.inf, 0, 0
+        estimator.set_params(warm_start=True)
+        while n_trees < max_size and n_trees - best_size < early_stopping_rounds:
+            n_trees = min(max_size, n_trees + early_stopping_rounds)
+            estimator.set_params(n_estimators=n_trees)
+            estimator.fit(X_train, y_train)
+            for stage, prediction in enumerate(estimator.staged_predict(X_val), start=1):
+                if stage > n_trees - early_stopping_rounds:
+                    score = r2_score(y_val, prediction)
+                    if score > best_score:
+                        best_score, best_size = score, stage
+    else:
+        estimator.set_params(**{size_param: max_size})
+        estimator.fit(X_train, y_train)
+    return estimator
+
+
+def split_validation(train_idx, validation_fraction, random_state):
+    # Seeded so every candidate group stops on the same slice of a fold.
+    shuffled = np.random.RandomState(random_state).permutation(train_idx)
+    n_val = max(1, int(round(len(shuffled) * validation_fraction)))
+    return np.sort(shuffled[n_val:]), np.sort(shuffled[:n_val])
+
+
+def fit_and_score_staged(data, name, group, fold_idx, cv, model, params, size_param, early_stopping_rounds,
+                         validation_fraction, random_state, n_threads):
+    # One fit of the largest ensemble scores every size candidate in the
+    # group; the fit time is booked on the largest candidate.
+    started = time.time()
+    X, y = data.X, data.y
+    train_idx, test_idx = data.fold(cv, fold_idx)
+    sizes = [size for _, size in group]
+    X_test, y_test = X[test_idx], y[test_idx]
+    if early_stopping_rounds is None:
+        val_idx = train_idx[:0]
+    else:
+        train_idx, val_idx = split_validation(train_idx, validation_fraction, random_state + fold_idx)
+
+    fit_start = time.perf_counter()
+    estimator = fit_staged(model, params, size_param, sizes, X[train_idx], y[train_idx], X[val_idx], y[val_idx],
+                           early_stopping_rounds, n_threads)
+    fit_seconds = time.perf_counter() - fit_start
+
+    score_start = time.perf_counter()
+    predictions = staged_predictions(estimator, X_test, sizes)
+    scores = {size: r2_score(y_test, prediction) for size, prediction in predictions.items()}
+    score_seconds = (time.perf_counter() - score_start) / len(group)
+    finished = time.time()
+
+    max_size, n_built = max(sizes), built_size(estimator)
+    return [
+        {
+            "name": name,
+            "candidate": candidate_idx,
+            "fold": fold_idx,
+            "score": scores[size],
+            "fit_seconds": fit_seconds if size == max_size else 0.0,
+            "score_seconds": score_seconds,
+            "started": started,
+            "finished": finished,
+            "staged": True,
+            "size_param": size_param,
+            "effective_size": min(size, n_built),
+        }
+        for candidate_idx, size in group
+    ]
+
+
+def run_staged_candidates(X, y, jobs, cv, n_jobs, cache=None, early_stopping_rounds=None, backend=None,
+                          validation_fraction=0.1, random_state=42):
+    # Like run_candidates, but candidates that differ only in ensemble size
+    # share one fit per fold. Families without a size parameter in their grid
+    # go through the regular per-candidate path in the same pool.
+    backend = backend or JoblibBackend(n_jobs)
+    data = SearchData(X, y)
+    data_key = data.key if cache is not None else None
+
+    plain_jobs, groups = [], {}
+    for name, candidate_idx, model, params in jobs:
+        size_param = staged_size_param(model, params)
+        if size_param is None:
+            plain_jobs.append((name, candidate_idx, model, params))
+            continue
+        base = {k: v for k, v in params.items() if k != size_param}
+        group_key = (name, repr(sorted(base.items())))
+        groups.setdefault(group_key, (name, model, base, size_param, []))[4].append(
+            (candidate_idx, params[size_param], params)
+        )
+
+    cached, tasks, task_keys = [], [], []
+    for name, model, base, size_param, members in groups.values():
+        for fold_idx in range(cv):
+            keys = {}
+            if cache is not None:
+                # Same keys as a per-candidate fit with the full params, and
+                # only used when early stopping is off, where the scores are
+                # identical: grid and staged runs share the fit cache.
+                for candidate_idx, _, params in members:
+                    keys[candidate_idx] = None if early_stopping_rounds is not None else \
+                        cache.key(data_key, cv, fold_idx, estimator_fingerprint(model, params))
+                hits = {idx: cache.get(key) for idx, key in keys.items() if key is not None}
+                if all(hit is not None for hit in hits.values()) and len(hits) == len(members):
+                    now = time.time()
+                    cached.extend(
+                        dict(hit, name=name, candidate=idx, fold=fold_idx, fit_seconds=0.0, score_seconds=0.0,
+                             started=now, finished=now, cached=True)
+                        for idx, hit in hits.items()
+                    )
+                    continue
+            group = [(candidate_idx, size) for candidate_idx, size, _ in members]
+            tasks.append((name, group, fold_idx, cv, model, base, size_param, early_stopping_rounds,
+                          validation_fraction, random_state, 1))
+            task_keys.append(keys)
+
+    computed = []
+    for results, keys in zip(backend.map(fit_and_score_staged, tasks, data) if tasks else [], task_keys):
+        computed.extend(results)
+        if cache is not None:
+            for result in results:
+                key = keys.get(result["candidate"])
+                if key is not None:
+                    cache.put(key, {"score": result["score"], "original_fit_seconds": result["fit_seconds"]})
+    if cache is not None and computed:
+        cache.evict()
+
+    plain = run_candidates(X, y, plain_jobs, cv, n_jobs, cache, backend) if plain_jobs else []
+    return cached + computed + plain
+
+
+def run_candidates(X, y, jobs, cv, n_jobs, cache=None, backend=None):
+    # jobs: (name, candidate_idx, model, params). Every fold of every job goes
+    # into one task queue, so there is no per-family barrier leaving workers
+    # idle while a large grid finishes. Folds already in the fit cache are
+    # answered from it and never reach the backend.
+    backend = backend or JoblibBackend(n_jobs)
+    data = SearchData(X, y)
+    data_key = data.key if cache is not None else None
+
+    cached, tasks, task_keys = [], [], []
+    for name, candidate_idx, model, params in jobs:
+        for fold_idx in range(cv):
+            key = None
+            if cache is not None:
+                key = cache.key(data_key, cv, fold_idx, estimator_fingerprint(model, params))
+                hit = cache.get(key)
+                if hit is not None:
+                    now = time.time()
+                    cached.append(dict(
+                        hit, name=name, candidate=candidate_idx, fold=fold_idx,
+                        fit_seconds=0.0, score_seconds=0.0, started=now, finished=now, cached=True,
+                    ))
+                    continue
+            tasks.append((name, candidate_idx, fold_idx, cv, model, params, 1))
+            task_keys.append(key)
+
+    computed = backend.map(fit_and_score_fold, tasks, data) if tasks else []
+
+    if cache is not None and computed:
+        for key, result in zip(task_keys, computed):
+            cache.put(key, {"score": result["score"], "original_fit_seconds": result["fit_seconds"]})
+        cache.evict()
+
+    return cached + computed
+
+
+class FamilySearch:
+    # Accumulates what one family's search has evaluated so far, including a
+    # best-score-vs-compute curve that can be compared across strategies.
+    def __init__(self, name, strategy):
+        self.name = name
+        self.strategy = strategy
+        self.candidates = []
+        self.curve = []
+        self.n_fits = 0
+        self.cpu_seconds = 0.0
+        self.started = None
+        self.finished = None
+        self.best = None
+        self.best_resources = 0
+        self.cache_hits = 0
+
+    def record(self, params_list, fold_results, n_samples):
+        by_candidate = {}
+        for result in sorted(fold_results, key=lambda r: (r["candidate"], r["fold"])):
+            by_candidate.setdefault(result["candidate"], []).append(result)
+            self.started = min(self.started or result["started"], result["started"])
+            self.finished = max(self.finished or result["finished"], result["finished"])
+            self.cache_hits += bool(result.get("cached"))
+
+        summaries = []
+        for idx, params in enumerate(params_list):
+            folds = by_candidate[idx]
+            params = self.effective_params(params, folds)
+            summary = {
+                "params": params,
+                "mean_score": float(np.mean([r["score"] for r in folds])),
+                "fold_scores": [r["score"] for r in folds],
+                "fit_seconds": [r["fit_seconds"] for r in folds],
+                "n_samples": n_samples,
+            }
+            summaries.append(summary)
+            self.candidates.append(summary)
+
+            self.n_fits += len(folds)
+            self.cpu_seconds += sum(r["fit_seconds"] + r["score_seconds"] for r in folds)
+
+            labels = {"family": self.name}
+            for r in folds:
+                if not r.get("cached") and not (r.get("staged") and r["fit_seconds"] == 0.0):
+                    metrics.record("search_fold_fit", r["fit_seconds"], labels,
+                                   candidate=idx, fold=r["fold"], params=params, n_samples=n_samples)
+                    metrics.record("search_fold_score", r["score_seconds"], labels,
+                                   candidate=idx, fold=r["fold"], score=r["score"])
+            metrics.record("search_candidate", sum(r["fit_seconds"] + r["score_seconds"] for r in folds), labels,
+                           candidate=idx, params=params, mean_score=summary["mean_score"], n_samples=n_samples)
+            # Scores on a subsample are not comparable to full-data ones, so
+            # the running best restarts whenever the resource level grows.
+            # Strict ">" keeps GridSearchCV's first-candidate-wins tie rule.
+            if n_samples > self.best_resources or summary["mean_score"] > self.best["mean_score"]:
+                self.best = summary
+                self.best_resources = n_samples
+            self.curve.append({
+                "fits": self.n_fits,
+                "cpu_seconds": self.cpu_seconds,
+                "n_samples": n_samples,
+                "best_score": self.best["mean_score"],
+            })
+        return summaries
+
+    @staticmethod
+    def effective_params(params, folds):
+        # A staged size past an early stop was scored as the stopped ensemble;
+        # record the largest size any fold actually built, so the refit trains
+        # the ensemble that was scored rather than the full requested size.
+        sizes = [r["effective_size"] for r in folds if "effective_size" in r]
+        if not sizes:
+            return params
+        size_param = next(r["size_param"] for r in folds if "size_param" in r)
+        if max(sizes) >= params[size_param]:
+            return params
+        return dict(params, **{size_param: max(sizes)})
+
+    def result(self):
+        return {
+            "strategy": self.strategy,
+            "best_params": self.best["params"],
+            "best_score": self.best["mean_score"],
+            "candidates": self.candidates,
+            "n_fits": self.n_fits,
+            "cache_hits": self.cache_hits,
+            "wall_seconds": (self.finished or 0.0) - (self.started or 0.0),
+            "cpu_seconds": self.cpu_seconds,
+            "curve": self.curve,
+        }
+
+
+def initial_candidates(para, strategy, budget, cv):
+    grid = list(ParameterGrid(para))
+    if strategy == "grid" or budget.max_fits is None:
+        if strategy == "random":
+            # Without a budget, sample a third of the grid.
+            n_iter = max(1, len(grid) // 3)
+            return list(ParameterSampler(para, n_iter=n_iter, random_state=budget.random_state))
+        return grid
+    n_iter = max(1, budget.max_fits // cv)
+    if n_iter >= len(grid):
+        return grid
+    return list(ParameterSampler(para, n_iter=n_iter, random_state=budget.random_state))
+
+
+def successive_halving(search, X, y, model, candidates, cv, n_jobs, budget, cache=None, backend=None):
+    n_samples = X.shape[0]
+    n_required = 1 + int(math.floor(math.log(len(candidates), budget.factor))) if len(candidates) > 1 else 1
+    # Only as many rounds as there are distinct resource levels between
+    # min_resources and n_samples; extra rounds pinned at min_resources
+    # refit nearly every candidate again without cutting any rows.
+    min_resources = max(budget.min_resources, 2 * cv)
+    n_possible = 1
+    while min_resources * budget.factor ** n_possible <= n_samples:
+        n_possible += 1
+    n_rounds = min(n_required, n_possible)
+    # With fewer rounds than the grid needs, cut harder each round so that
+    # about `factor` candidates (not a third of the grid) reach the full data.
+    rate = budget.factor
+    if n_rounds > 1:
+        rate = max(budget.factor, (len(candidates) / budget.factor) ** (1 / (n_rounds - 1)))
+    order = np.random.RandomState(budget.random_state).permutation(n_samples)
+    start = time.perf_counter()
+
+    for round_idx in range(n_rounds):
+        # "Exhaust" schedule: the last round always sees all training rows.
+        resources = n_samples // budget.factor ** (n_rounds - 1 - round_idx)
+        resources = min(n_samples, max(resources, min_resources))
+        rows = np.sort(order[:resources]) if resources < n_samples else slice(None)
+
+        jobs = [(search.name, idx, model, params) for idx, params in enumerate(candidates)]
+        fold_results = run_candidates(X[rows], y[rows], jobs, cv, n_jobs, cache, backend)
+        summaries = search.record(candidates, fold_results, resources)
+
+        logging.info(
+            f"{search.name} halving round {round_idx}: {len(candidates)} candidates on {resources} rows"
+        )
+
+        keep = max(1, int(math.ceil(len(candidates) / rate)))
+        ranked = sorted(range(len(summaries)), key=lambda i: -summaries[i]["mean_score"])
+        candidates = [candidates[i] for i in sorted(ranked[:keep])]
+
+        if budget.max_seconds is not None and time.perf_counter() - start >= budget.max_seconds:
+            logging.info(f"{search.name} halving stopped early on time budget")
+            break
+
+
+def budgeted_search(search, X, y, model, candidates, cv, n_jobs, budget, cache=None, backend=None):
+    order = np.random.RandomState(budget.random_state).permutation(len(candidates))
+    candidates = [candidates[i] for i in order]
+    start = time.perf_counter()
+    waves_without_improvement = 0
+
+    for wave_start in range(0, len(candidates), n_jobs):
+        wave = candidates[wave_start:wave_start + n_jobs]
+        best_before = search.best["mean_score"] if search.best else -np.inf
+
+        jobs = [(search.name, idx, model, params) for idx, params in enumerate(wave)]
+        search.record(wave, run_candidates(X, y, jobs, cv, n_jobs, cache, backend), X.shape[0])
+
+        if search.best["mean_score"] > best_before + 1e-4:
+            waves_without_improvement = 0
+        else:
+            waves_without_improvement += 1
+
+        if budget.max_fits is not None and search.n_fits >= budget.max_fits:
+            break
+        if budget.max_seconds is not None and time.perf_counter() - start >= budget.max_seconds:
+            break
+        if waves_without_improvement >= budget.patience:
+            logging.info(f"{search.name} budgeted search stopped after {budget.patience} stale waves")
+            break
+
+
+def search_models(X_train, y_train, models, param, n_jobs=1, cv=3, strategy="grid", budget=None, cache=None,
+                  backend=None):
+    try:
+        n_jobs = resolve_n_jobs(n_jobs)
+        budget = budget or SearchBudget()
+        backend = backend or JoblibBackend(n_jobs)
+        strategies = {
+            name: (strategy.get(name, "grid") if isinstance(strategy, dict) else strategy)
+            for name in models
+        }
+        for name, family_strategy in strategies.items():
+            if family_strategy not in SEARCH_STRATEGIES:
+                raise ValueError(f"Unknown search strategy {family_strategy!r} for {name}; use one of {SEARCH_STRATEGIES}")
+
+        searches = {name: FamilySearch(name, strategies[name]) for name in models}
+        candidates = {
+            name: initial_candidates(param[name], strategies[name], budget, cv) for name in models
+        }
+
+        # Fixed-size searches are pooled together across families.
+        pooled = [name for name in models if strategies[name] in ("grid", "random")]
+        jobs = [
+            (name, idx, models[name], params)
+            for name in pooled
+            for idx, params in enumerate(candidates[name])
+        ]
+        if jobs:
+            logging.info(f"Searching {len(jobs) * cv} (model, params, fold) fits on the {backend.name} backend "
+                         f"({backend.n_workers} workers)")
+            fold_results = run_candidates(X_train, y_train, jobs, cv, n_jobs, cache, backend)
+            for name in pooled:
+                searches[name].record(
+                    candidates[name], [r for r in fold_results if r["name"] == name], X_train.shape[0]
+                )
+
+        staged = [name for name in models if strategies[name] == "staged"]
+        jobs = [
+            (name, idx, models[name], params)
+            for name in staged
+            for idx, params in enumerate(candidates[name])
+        ]
+        if jobs:
+            fold_results = run_staged_candidates(X_train, y_train, jobs, cv, n_jobs, cache,
+                                                 budget.early_stopping_rounds, backend,
+                                                 budget.validation_fraction, budget.random_state)
+            for name in staged:
+                searches[name].record(
+                    candidates[name], [r for r in fold_results if r["name"] == name], X_train.shape[0]
+                )
+
+        for name in models:
+            if strategies[name] == "halving":
+                successive_halving(searches[name], X_train, y_train, models[name], candidates[name],
+                                   cv, n_jobs, budget, cache, backend)
+            elif strategies[name] == "budgeted":
+                budgeted_search(searches[name], X_train, y_train, models[name], candidates[name],
+                                cv, n_jobs, budget, cache, backend)
+
+        results = {}
+        for name in models:
+            results[name] = searches[name].result()
+            metrics.record("search_family", results[name]["wall_seconds"],
+                           {"family": name, "strategy": strategies[name]},
+                           fits=results[name]["n_fits"], cpu_seconds=results[name]["cpu_seconds"],
+                           best_score=results[name]["best_score"])
+            logging.info(
+                f"{name} ({strategies[name]}): {results[name]['n_fits']} fits "
+                f"({results[name]['cache_hits']} cached), "
+                f"best CV R2 {results[name]['best_score']:.4f}, "
+                f"wall {results[name]['wall_seconds']:.2f}s, cpu {results[name]['cpu_seconds']:.2f}s"
+            )
+        return results
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def refit_best_models(X_train, y_train, models, search_results, n_jobs=1, cache=None, backend=None):
+    try:
+        n_jobs = resolve_n_jobs(n_jobs)
+        data = SearchData(X_train, y_train)
+        data_key = data.key if cache is not None else None
+
+        fitted, keys = {}, {}
+        for name in models:
+            if cache is not None:
+                keys[name] = cache.key(
+                    data_key, "refit", estimator_fingerprint(models[name], search_results[name]["best_params"])
+                )
+                estimator = cache.get(keys[name])
+                if estimator is not None:
+                    fitted[name] = estimator
+
+        names = [name for name in models if name not in fitted]
+        if names:
+            # With fewer families than cores, let each refit use the spare threads.
+            n_threads = max(1, n_jobs // len(names))
+            backend = backend or JoblibBackend(min(n_jobs, len(names)))
+            estimators = backend.map(
+                fit_on_data, [(models[name], search_results[name]["best_params"], n_threads) for name in names], data
+            )
+            for name, estimator in zip(names, estimators):
+                fitted[name] = estimator
+                if cache is not None:
+                    cache.put(keys[name], estimator)
+            if cache is not None:
+                cache.evict()
+
+        return {name: fitted[name] for name in models}
+
+    except Exception as e:
+        raise CustomException(e, sys)
@@ -1,27 +1,59 @@
+import json
 import os
 import sys
-from dataclasses import dataclass
-
-from catboost import CatBoostRegressor
-from sklearn.ensemble import (
-    AdaBoostRegressor,
-    GradientBoostingRegressor,
-    RandomForestRegressor,
-)
-from sklearn.linear_model import LinearRegression
+from dataclasses import dataclass, field
+
+import numpy as np
 from sklearn.metrics import r2_score
-from sklearn.neighbors import KNeighborsRegressor
-from sklearn.tree import DecisionTreeRegressor
-from xgboost import XGBRegressor
 
 from src.exception import CustomException
 from src.logger import logging
 
-from src.utils import save_object,evaluate_models
+from src.utils import save_object,evaluate_models,load_object,save_object_mmap,remove_object_mmap,write_atomic
+from src.components.data_transformation import DataTransformationConfig
+from src.components.model_search import SearchBudget
+from src.components.search_backends import SearchBackendConfig
+from src.components.feature_matrix import FeatureMatrix
+from src.components.fit_cache import FitCache
+from src.components.native_model import export_native_model, remove_native_model
+from src.components.compiled_trees import CompiledTreeEnsemble, export_compiled_trees
+from src.components.prediction_table import PredictionTableConfig, build_prediction_table
 
 @dataclass
 class ModelTrainerConfig:
     trained_model_file_path=os.path.join("artifacts","model.pkl")
+    mmap_model_file_path=os.path.join("artifacts","model_mmap","model.json")
+    native_model_file_path=os.path.join("artifacts","model_native.json")
+    compiled_model_file_path=os.path.join("artifacts","model_compiled.npz")
+    search_report_file_path=os.path.join("artifacts","search_report.json")
+    # The preprocessor the features came from (feature order for the mmap
+    # export, encoding for the prediction table).
+    preprocessor_file_path=DataTransformationConfig.preprocessor_obj_file_path
+    compiled_preprocessor_file_path=DataTransformationConfig.compiled_preprocessor_file_path
+    # CPU budget for the hyperparameter search; -1 uses every core.
+    n_jobs: int=-1
+    # "grid", "random", "halving", "budgeted" or "staged" (one fit of the
+    # largest boosting ensemble scores every n_estimators/iterations value);
+    # a dict maps model name to strategy, with unlisted models falling back
+    # to "grid".
+    search_strategy: object="grid"
+    search_budget: SearchBudget=field(default_factory=SearchBudget)
+    # Where the (model, params, fold) fits run: joblib in-process (default),
+    # a local process pool, or tcp workers on this or other machines.
+    search_backend: SearchBackendConfig=field(default_factory=SearchBackendConfig)
+    # Reuse CV scores and refits from earlier runs on identical data/params.
+    use_fit_cache: bool=True
+    # Precompute predictions over the discrete app input space next to model.pkl.
+    build_prediction_table: bool=False
+    # Also write a tree-ensemble winner's compiled node arrays in the
+    # memory-mappable manifest format (other winners remove the export).
+    save_mmap_artifact: bool=False
+    # Export an XGBoost/CatBoost winner in its native format for the native
+    # prediction backend (other winners remove a stale export).
+    save_native_artifact: bool=True
+    # Flatten a tree-ensemble winner into node arrays for the single-row
+    # path (other winners remove a stale export).
+    save_compiled_model: bool=True
 
 class ModelTrainer:
     def __init__(self):
@@ -31,12 +63,27 @@ class ModelTrainer:
     def initiate_model_trainer(self,train_array,test_array):
         try:
             logging.info("Split training and test input data")
+            # FeatureMatrix inputs are used as-is; plain [X | y] arrays are
+            # still accepted and split into views.
+            if not isinstance(train_array,FeatureMatrix):
+                train_array=FeatureMatrix.from_array(train_array)
+            if not isinstance(test_array,FeatureMatrix):
+                test_array=FeatureMatrix.from_array(test_array)
             X_train,y_train,X_test,y_test=(
-                train_array[:,:-1],
-                train_array[:,-1],
-                test_array[:,:-1],
-                test_array[:,-1]
+                train_array.X,
+                train_array.y,
+                test_array.X,
+                test_array.y
             )
+            # The estimator libraries are imported only when training starts;
+            # xgboost and catboost alone take longer to import than the rest
+            # of the pipeline.
+            from catboost import CatBoostRegressor
+            from sklearn.ensemble import AdaBoostRegressor, GradientBoostingRegressor, RandomForestRegressor
+            from sklearn.linear_model import LinearRegression
+            from sklearn.tree import DecisionTreeRegressor
+            from xgboost import XGBRegressor
+
             models = {
                 "Random Forest": RandomForestRegressor(),
                 "Decision Tree": DecisionTreeRegressor(),
@@ -84,8 +131,21 @@ class ModelTrainer:
                 
             }
 
+            search_timings={}
+            fit_cache=FitCache() if self.model_trainer_config.use_fit_cache else None
             model_report:dict=evaluate_models(X_train=X_train,y_train=y_train,X_test=X_test,y_test=y_test,
-                                             models=models,param=params)
+                                             models=models,param=params,
+                                             n_jobs=self.model_trainer_config.n_jobs,
+                                             timings=search_timings,
+                                             strategy=self.model_trainer_config.search_strategy,
+                                             budget=self.model_trainer_config.search_budget,
+                                             cache=fit_cache,
+                                             backend=self.model_trainer_config.search_backend)
+            for name,timing in search_timings.items():
+                logging.info(f"Search for {name}: {timing['fits']} fits in {timing['wall_seconds']:.2f}s wall")
+
+            report=json.dumps(search_timings,indent=2,default=str).encode()
+            write_atomic(self.model_trainer_config.search_report_file_path,lambda report_file: report_file.write(report))
             
             ## To get best model score from dict
             best_model_score = max(sorted(model_report.values()))
@@ -106,6 +166,33 @@ class ModelTrainer:
                 obj=best_model
             )
 
+            # A disabled export is removed, so its backend can't keep serving
+            # the previous model.
+            if self.model_trainer_config.save_mmap_artifact:
+                self.save_mmap_model(best_model_name,best_model,X_check=X_test[:1000])
+            else:
+                remove_object_mmap(self.model_trainer_config.mmap_model_file_path)
+
+            if self.model_trainer_config.save_native_artifact:
+                export_native_model(self.model_trainer_config.native_model_file_path,best_model,
+                                    {"model_name":best_model_name},X_check=X_test[:1000])
+            else:
+                remove_native_model(self.model_trainer_config.native_model_file_path)
+
+            if self.model_trainer_config.save_compiled_model:
+                export_compiled_trees(self.model_trainer_config.compiled_model_file_path,best_model,
+                                      X_check=X_test[:1000])
+            elif os.path.exists(self.model_trainer_config.compiled_model_file_path):
+                os.remove(self.model_trainer_config.compiled_model_file_path)
+
+            if self.model_trainer_config.build_prediction_table:
+                logging.info("Building prediction lookup table")
+                build_prediction_table(PredictionTableConfig(
+                    model_file_path=self.model_trainer_config.trained_model_file_path,
+                    preprocessor_file_path=self.model_trainer_config.preprocessor_file_path,
+                    compiled_preprocessor_file_path=self.model_trainer_config.compiled_preprocessor_file_path,
+                ))
+
             predicted=best_model.predict(X_test)
 
             r2_square = r2_score(y_test, predicted)
@@ -116,4 +203,29 @@ class ModelTrainer:
 
             
         except Exception as e:
-            raise CustomException(e,sys)
\ No newline at end of file
+            raise CustomException(e,sys)
+
+    def save_mmap_model(self,model_name,model,X_check=None):
+        # Mapping only saves memory for arrays that prediction reads in place.
+        # sklearn's Tree copies its nodes out on unpickle and the boosters
+        # pickle as opaque bytes, so what gets mapped is the compiled node
+        # arrays of a tree-ensemble winner; other winners remove the export.
+        path=self.model_trainer_config.mmap_model_file_path
+        try:
+            compiled=CompiledTreeEnsemble.from_model(model)
+        except ValueError as e:
+            remove_object_mmap(path)
+            logging.info(f"No memory-mappable export for {model_name}: {e}")
+            return
+        if X_check is not None and not np.array_equal(compiled.predict(X_check),model.predict(X_check)):
+            remove_object_mmap(path)
+            logging.info("Compiled trees do not match model.predict; not writing the memory-mappable model")
+            return
+
+        metadata={"model_name":model_name,"n_features":int(getattr(model,"n_features_in_",0))}
+        preprocessor_path=self.model_trainer_config.preprocessor_file_path
+        if os.path.exists(preprocessor_path):
+            metadata["feature_order"]=[str(f) for f in load_object(preprocessor_path).get_feature_names_out()]
+
+        save_object_mmap(path,compiled,metadata)
+        logging.info(f"Saved memory-mappable compiled {model_name} to {path}")
@@ -0,0 +1,163 @@
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from dataclasses import dataclass
+
+import numpy as np
+
+from src.exception import CustomException
+from src.logger import logging
+from src.utils import write_atomic
+
+NATIVE_FORMAT_VERSION = 1
+NATIVE_EXTENSIONS = {"xgboost": ".ubj", "catboost": ".cbm"}
+
+
+def native_library(model):
+    # Decided by module name, so neither library is imported just to check.
+    library = type(model).__module__.split(".")[0]
+    return library if library in NATIVE_EXTENSIONS else None
+
+
+def native_model_bytes(library, model):
+    if library == "xgboost":
+        return bytes(model.get_booster().save_raw(raw_format="ubj"))
+    # CatBoost only serializes to a file.
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "model.cbm")
+        model.save_model(path, format="cbm")
+        with open(path, "rb") as file_obj:
+            return file_obj.read()
+
+
+def native_predict_options(library, model):
+    # What the sklearn wrapper's predict() would pass to the booster.
+    if library == "xgboost":
+        try:
+            # Early stopping: the wrapper predicts with the best iteration only.
+            return {"iteration_end": int(model.best_iteration) + 1}
+        except AttributeError:
+            return {"iteration_end": 0}
+    return {"prediction_type": model._get_default_prediction_type()}
+
+
+def remove_native_model(manifest_path):
+    stem = os.path.splitext(os.path.basename(manifest_path))[0]
+    for path in [manifest_path] + glob.glob(os.path.join(os.path.dirname(manifest_path), f"{stem}.*")):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def export_native_model(manifest_path, model, metadata=None, X_check=None):
+    # Writes an XGBoost/CatBoost winner in its library's own format next to
+    # a JSON manifest; any other model type removes a previous export so the
+    # native backend can never serve an older model than model.pkl. With
+    # X_check the export is only kept when it predicts exactly what the
+    # wrapper does.
+    try:
+        library = native_library(model)
+        if library is None:
+            remove_native_model(manifest_path)
+            return None
+
+        payload = native_model_bytes(library, model)
+        payload_sha = hashlib.sha256(payload).hexdigest()
+        dir_path = os.path.dirname(manifest_path)
+        stem = os.path.splitext(os.path.basename(manifest_path))[0]
+        model_file = f"{stem}.{payload_sha[:16]}{NATIVE_EXTENSIONS[library]}"
+        write_atomic(os.path.join(dir_path, model_file), lambda file_obj: file_obj.write(payload))
+
+        manifest = {
+            "format_version": NATIVE_FORMAT_VERSION,
+            "library": library,
+            "object_type": f"{type(model).__module__}.{type(model).__qualname__}",
+            "model_file": model_file,
+            "model_sha256": payload_sha,
+            "n_features": int(getattr(model, "n_features_in_", 0)),
+            **native_predict_options(library, model),
+        }
+        manifest.update(metadata or {})
+
+        if X_check is not None:
+            predictor = NativeBoosterPredictor(library, os.path.join(dir_path, model_file), manifest)
+            if not np.allclose(predictor.predict(X_check), model.predict(X_check), rtol=1e-6, atol=1e-6):
+                remove_native_model(manifest_path)
+                logging.info(f"Native {library} export does not match the wrapper's predictions; not saved")
+                return None
+
+        write_atomic(manifest_path, lambda file_obj: file_obj.write(json.dumps(manifest, indent=2).encode()))
+        for path in glob.glob(os.path.join(dir_path, f"{stem}.*")):
+            if os.path.basename(path) not in (model_file, os.path.basename(manifest_path)):
+                os.remove(path)
+        logging.info(f"Exported native {library} model to {model_file}")
+        return manifest_path
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+@dataclass
+class NativePredictorConfig:
+    # Inputs up to this many rows are scored on one thread: for a handful of
+    # rows starting a parallel region costs more than it saves.
+    single_row_max_rows: int = 16
+    # Threads for larger batches; 0 uses every core.
+    batch_threads: int = 0
+
+
+# Lean predictor over the bare booster. For XGBoost that is Booster.inplace_predict
+# without the wrapper's per-call config context and feature validation; CatBoost
+# keeps its own predict but with an explicit thread count. Two handles are kept
+# (single-row and batch) so the thread count is never changed on a shared
+# booster while another request is predicting with it.
+class NativeBoosterPredictor:
+    def __init__(self, library, model_path, manifest, config=None):
+        self.library = library
+        self.manifest = manifest
+        self.native_predictor_config = config or NativePredictorConfig()
+        batch_threads = self.native_predictor_config.batch_threads or os.cpu_count() or 1
+
+        if library == "xgboost":
+            import xgboost as xgb
+
+            self.single = xgb.Booster(model_file=model_path)
+            self.single.set_param({"nthread": 1})
+            self.batch = xgb.Booster(model_file=model_path)
+            self.batch.set_param({"nthread": batch_threads})
+            self.iteration_range = (0, manifest.get("iteration_end", 0))
+        elif library == "catboost":
+            from catboost import CatBoost
+
+            self.single = self.batch = CatBoost()
+            self.single.load_model(model_path, format="cbm")
+            self.thread_counts = (1, batch_threads)
+        else:
+            raise ValueError(f"Unsupported native model library {library!r}")
+
+    @classmethod
+    def load(cls, manifest_path, config=None):
+        try:
+            with open(manifest_path) as file_obj:
+                manifest = json.load(file_obj)
+            if manifest["format_version"] != NATIVE_FORMAT_VERSION:
+                raise ValueError(f"Unsupported native model format version {manifest['format_version']}")
+
+            model_path = os.path.join(os.path.dirname(manifest_path), manifest["model_file"])
+            with open(model_path, "rb") as file_obj:
+                if hashlib.sha256(file_obj.read()).hexdigest() != manifest["model_sha256"]:
+                    raise ValueError(f"Checksum mismatch for {manifest['model_file']}")
+            return cls(manifest["library"], model_path, manifest, config)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def predict(self, X):
+        single = X.shape[0] <= self.native_predictor_config.single_row_max_rows
+        if self.library == "xgboost":
+            booster = self.single if single else self.batch
+            return booster.inplace_predict(X, iteration_range=self.iteration_range, validate_features=False)
+        return self.single.predict(X, prediction_type=self.manifest["prediction_type"],
+                                   thread_count=self.thread_counts[0 if single else 1])
@@ -0,0 +1,244 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.components.compiled_preprocessor import CompiledPreprocessor
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.artifact_registry import file_content_hash
+from src.utils import load_object, write_atomic
+
+
+@dataclass
+class PredictionTableConfig:
+    table_file_path: str = os.path.join("artifacts", "prediction_table.npy")
+    meta_file_path: str = os.path.join("artifacts", "prediction_table.json")
+    model_file_path: str = os.path.join("artifacts", "model.pkl")
+    preprocessor_file_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    compiled_preprocessor_file_path: str = os.path.join("artifacts", "preprocessor_compiled.npz")
+    # Integer score range offered by the app's number inputs.
+    score_min: int = 0
+    score_max: int = 100
+    # Largest allowed difference between a lookup and the live single-record
+    # prediction (PredictPipeline.predict_record), measured on verify_samples
+    # random cells at build time; servers ignore tables that exceed it.
+    tolerance: float = 1e-9
+    verify_samples: int = 2000
+
+
+# Every prediction over the discrete input space: one axis per categorical
+# feature (the categories the encoder was fitted on) followed by one axis per
+# integer score. Stored as a plain .npy so it can be memory-mapped, plus a
+# JSON sidecar with the axis values and the hashes of the artifacts it was
+# generated from.
+class PredictionTable:
+    def __init__(self, table, meta):
+        self.table = table
+        self.meta = meta
+        self._axis_index = [
+            {value: i for i, value in enumerate(values)} for values in meta["categorical_values"]
+        ]
+
+    @classmethod
+    def build(cls, model, compiled, score_min=0, score_max=100, model_sha256=None, preprocessor_sha256=None,
+              single_row=False):
+        try:
+            blocks = compiled.blocks
+            categorical_features = [f for b in blocks if b["kind"] == "categorical" for f in b["features"]]
+            categorical_values = [c for b in blocks if b["kind"] == "categorical" for c in b["categories"]]
+            score_features = [f for b in blocks if b["kind"] == "numerical" for f in b["features"]]
+            scores = np.arange(score_min, score_max + 1)
+
+            grid = np.stack(np.meshgrid(*([scores] * len(score_features)), indexing="ij"), axis=-1)
+            grid = grid.reshape(-1, len(score_features))
+            frame = pd.DataFrame(grid, columns=score_features)
+
+            shape = [len(v) for v in categorical_values] + [len(scores)] * len(score_features)
+            table = np.empty(shape, dtype=np.float64)
+
+            start = time.perf_counter()
+            for combo in itertools.product(*[range(len(v)) for v in categorical_values]):
+                for feature, values, idx in zip(categorical_features, categorical_values, combo):
+                    frame[feature] = values[idx]
+                features = compiled.transform(frame)
+                if single_row:
+                    # One predict() per cell, exactly as a form request is
+                    # scored; batched BLAS sums can differ in the last bits
+                    # (or more, for ill-conditioned linear models).
+                    preds = np.concatenate([model.predict(features[i:i + 1]) for i in range(len(features))])
+                else:
+                    preds = model.predict(features)
+                table[combo] = preds.reshape([len(scores)] * len(score_features))
+
+            logging.info(f"Built prediction table {shape} in {time.perf_counter() - start:.1f}s")
+
+            meta = {
+                "categorical_features": categorical_features,
+                "categorical_values": categorical_values,
+                "score_features": score_features,
+                "score_min": score_min,
+                "score_max": score_max,
+                "model_sha256": model_sha256,
+                "preprocessor_sha256": preprocessor_sha256,
+                "single_row": single_row,
+            }
+            return cls(table, meta)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def save(self, table_file_path, meta_file_path):
+        try:
+            # Sidecar first: the registry keys the pair on the table file, so
+            # replacing the table last makes servers reload both together.
+            meta = json.dumps(self.meta, indent=2).encode()
+            write_atomic(meta_file_path, lambda file_obj: file_obj.write(meta))
+            write_atomic(table_file_path, lambda file_obj: np.save(file_obj, self.table))
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    @classmethod
+    def load(cls, table_file_path, meta_file_path=None):
+        try:
+            meta_file_path = meta_file_path or os.path.splitext(table_file_path)[0] + ".json"
+            with open(meta_file_path) as file_obj:
+                meta = json.load(file_obj)
+            table = np.load(table_file_path, mmap_mode="r")
+            n_scores = meta["score_max"] - meta["score_min"] + 1
+            expected = tuple(len(v) for v in meta["categorical_values"]) + (n_scores,) * len(meta["score_features"])
+            if table.shape != expected:
+                raise ValueError(f"Prediction table shape {table.shape} does not match its metadata {expected}")
+            return cls(table, meta)
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def index(self, record):
+        # Table coordinates for a record, or None when it falls outside the
+        # table (unseen category, missing value, non-integer or out-of-range score).
+        idx = []
+        for feature, axis in zip(self.meta["categorical_features"], self._axis_index):
+            position = axis.get(record.get(feature))
+            if position is None:
+                return None
+            idx.append(position)
+        for feature in self.meta["score_features"]:
+            value = record.get(feature)
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                return None
+            if not value.is_integer() or not self.meta["score_min"] <= value <= self.meta["score_max"]:
+                return None
+            idx.append(int(value) - self.meta["score_min"])
+        return tuple(idx)
+
+    def lookup(self, record):
+        idx = self.index(record)
+        return None if idx is None else float(self.table[idx])
+
+    def verify(self, predict_record, n_samples=10000, random_state=42):
+        # Compare a random sample of cells (every cell if n_samples is None)
+        # with what predict_record (the server's single-record path) answers
+        # for them; returns the max absolute difference.
+        rng = np.random.RandomState(random_state)
+        flat = np.arange(self.table.size) if n_samples is None else rng.randint(0, self.table.size, n_samples)
+        coords = np.unravel_index(flat, self.table.shape)
+
+        n_cat = len(self.meta["categorical_features"])
+        frame = pd.DataFrame({
+            feature: np.asarray(values, dtype=object)[coords[i]]
+            for i, (feature, values) in enumerate(zip(self.meta["categorical_features"], self.meta["categorical_values"]))
+        })
+        for i, feature in enumerate(self.meta["score_features"]):
+            frame[feature] = (coords[n_cat + i] + self.meta["score_min"]).tolist()
+
+        records = frame.to_dict("records")
+        if not records:
+            return 0.0
+        live = np.concatenate([predict_record(record) for record in records])
+        return float(np.max(np.abs(live - np.asarray(self.table[coords]))))
+
+
+def record_predictor(config):
+    # PredictPipeline.predict_record over the artifacts the table is built
+    # from, with its own registry so nothing cached elsewhere is reused.
+    from src.pipeline.artifact_registry import ArtifactRegistry
+    from src.pipeline.predict_pipeline import PredictPipeline
+
+    pipeline = PredictPipeline(registry=ArtifactRegistry())
+    pipeline_config = pipeline.predict_pipeline_config
+    pipeline_config.model_path = config.model_file_path
+    pipeline_config.preprocessor_path = config.preprocessor_file_path
+    pipeline_config.compiled_preprocessor_path = config.compiled_preprocessor_file_path
+    pipeline_config.use_prediction_table = False
+    return pipeline.predict_record
+
+
+def build_prediction_table(config=None):
+    config = config or PredictionTableConfig()
+    model = load_object(config.model_file_path)
+    compiled = CompiledPreprocessor.load(config.compiled_preprocessor_file_path)
+    predict_record = record_predictor(config)
+
+    def build(single_row):
+        table = PredictionTable.build(
+            model,
+            compiled,
+            score_min=config.score_min,
+            score_max=config.score_max,
+            model_sha256=file_content_hash(config.model_file_path),
+            preprocessor_sha256=file_content_hash(config.preprocessor_file_path),
+            single_row=single_row,
+        )
+        return table, table.verify(predict_record, n_samples=config.verify_samples)
+
+    table, max_diff = build(single_row=False)
+    if max_diff > config.tolerance:
+        logging.info(f"Batched prediction table differs from single-record predictions by {max_diff:.3g}; "
+                     f"rebuilding it one row at a time")
+        table, max_diff = build(single_row=True)
+    if max_diff > config.tolerance:
+        logging.info(f"Prediction table differs from single-record predictions by {max_diff:.3g} "
+                     f"(tolerance {config.tolerance:g}); servers will ignore it")
+    table.meta["max_abs_diff"] = max_diff
+    table.save(config.table_file_path, config.meta_file_path)
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or verify the precomputed prediction table.")
+    parser.add_argument("--build", action="store_true", help="regenerate the table from the current artifacts")
+    parser.add_argument("--verify", action="store_true", help="compare the table with live model predictions")
+    parser.add_argument("--samples", type=int, default=10000, help="cells to check; 0 checks every cell")
+    args = parser.parse_args(argv)
+
+    config = PredictionTableConfig()
+    if args.build:
+        table = build_prediction_table(config)
+        print(f"Wrote {config.table_file_path} with shape {table.table.shape}")
+
+    if args.verify:
+        table = PredictionTable.load(config.table_file_path, config.meta_file_path)
+        if table.meta["model_sha256"] != file_content_hash(config.model_file_path):
+            print("Table was built from a different model.pkl; rebuild it with --build")
+            sys.exit(1)
+        if table.meta["preprocessor_sha256"] != file_content_hash(config.preprocessor_file_path):
+            print("Table was built from a different preprocessor.pkl; rebuild it with --build")
+            sys.exit(1)
+        max_diff = table.verify(record_predictor(config), n_samples=args.samples or None)
+        print(f"Max absolute difference vs PredictPipeline.predict_record: {max_diff:.3g} "
+              f"(tolerance {config.tolerance:g})")
+        sys.exit(0 if max_diff <= config.tolerance else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,386 @@
+import argparse
+import os
+import secrets
+import socket
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait as wait_futures
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from multiprocessing import get_context
+from multiprocessing.connection import Client, Listener, wait
+
+from joblib import Parallel, delayed
+from sklearn.model_selection import KFold
+
+from src.components.fit_cache import array_fingerprint
+from src.exception import CustomException
+from src.logger import logging
+
+SEARCH_BACKENDS = ("joblib", "process", "tcp")
+AUTHKEY_ENV = "EDUPREDICT_SEARCH_AUTHKEY"
+
+
+@dataclass
+class SearchBackendConfig:
+    # "joblib" (in-process pool, the default), "process" (local process pool
+    # with task retry) or "tcp" (coordinator that workers connect to).
+    kind: str = "joblib"
+    # Worker processes for "process", and local workers "tcp" starts itself;
+    # None means the search's n_jobs. Use 0 with tcp when every worker is
+    # started by hand (python -m src.components.search_backends --connect).
+    workers: int = None
+    # Address the tcp coordinator listens on; port 0 picks a free one.
+    host: str = "127.0.0.1"
+    port: int = 0
+    # Shared secret for tcp workers; defaults to $EDUPREDICT_SEARCH_AUTHKEY,
+    # or a random key when all workers are local.
+    authkey: str = None
+    # A task is rerun on another worker this many times after the worker
+    # running it dies or disconnects.
+    max_retries: int = 2
+    # tcp: a worker that takes longer than this on one task is dropped and
+    # the task retried (None waits forever).
+    task_timeout: float = None
+    # tcp: give up when no worker has been connected for this long.
+    connect_timeout: float = 60.0
+
+
+# Training arrays of one search step. Backends ship them to each worker once
+# and tasks only carry (model, params, fold) references; folds are rebuilt on
+# the worker from the row count, which is all KFold without shuffling uses.
+class SearchData:
+    def __init__(self, X, y):
+        self.X = X
+        self.y = y
+        self._key = None
+        self._folds = {}
+
+    @property
+    def key(self):
+        if self._key is None:
+            self._key = array_fingerprint(self.X, self.y)
+        return self._key
+
+    def fold(self, cv, fold_idx):
+        if cv not in self._folds:
+            self._folds[cv] = list(KFold(n_splits=cv).split(self.X))
+        return self._folds[cv][fold_idx]
+
+    def __getstate__(self):
+        return {"X": self.X, "y": self.y, "_key": self._key, "_folds": {}}
+
+
+# Every backend runs fn(data, *args) for each args tuple and returns the
+# results in task order. A task that raises fails the whole map, as with
+# joblib; only a lost worker makes a task run again.
+class JoblibBackend:
+    name = "joblib"
+
+    def __init__(self, n_jobs=1):
+        self.n_workers = n_jobs
+
+    def map(self, fn, args_list, data):
+        return Parallel(n_jobs=self.n_workers)(delayed(fn)(data, *args) for args in args_list)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_pool_data = {}
+
+
+def _init_pool_worker(data):
+    _pool_data["data"] = data
+
+
+def _run_pool_task(fn, args):
+    return fn(_pool_data["data"], *args)
+
+
+class ProcessPoolBackend(JoblibBackend):
+    # The data goes to each worker once, through the pool initializer. A
+    # worker that dies breaks the pool; the tasks that hadn't finished are
+    # resubmitted to a fresh one.
+    name = "process"
+
+    def __init__(self, n_workers=1, max_retries=2):
+        self.n_workers = n_workers
+        self.max_retries = max_retries
+
+    def map(self, fn, args_list, data):
+        results = [None] * len(args_list)
+        attempts = {i: 0 for i in range(len(args_list))}
+        while attempts:
+            executor = ProcessPoolExecutor(self.n_workers, initializer=_init_pool_worker, initargs=(data,))
+            try:
+                futures = {executor.submit(_run_pool_task, fn, args_list[i]): i for i in attempts}
+                pending = set(futures)
+                while pending:
+                    finished, pending = wait_futures(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        try:
+                            results[futures[future]] = future.result()
+                        except BrokenProcessPool:
+                            continue
+                        del attempts[futures[future]]
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+            for i in attempts:
+                attempts[i] += 1
+                if attempts[i] > self.max_retries:
+                    raise RuntimeError(f"Search task {i} failed after {attempts[i]} attempts on lost workers")
+            if attempts:
+                logging.info(f"Search worker pool broke; retrying {len(attempts)} unfinished tasks")
+        return results
+
+
+class _RemoteWorker:
+    def __init__(self, conn):
+        self.conn = conn
+        self.name = None
+        self.datasets = OrderedDict()
+        self.task = None
+        self.task_started = None
+
+
+# Coordinator side of the tcp backend. Workers connect (and may come and go)
+# at any time; each is sent the data of the current map the first time it
+# gets one of its tasks, then tasks one at a time. A worker whose connection
+# drops, or that overruns task_timeout, is dropped and its task requeued.
+# Messages are pickled over multiprocessing connections with HMAC
+# authentication, so only processes holding the authkey can join.
+class TCPBackend(JoblibBackend):
+    name = "tcp"
+    # Datasets a worker keeps; older ones are released.
+    MAX_WORKER_DATASETS = 2
+
+    def __init__(self, host="127.0.0.1", port=0, local_workers=0, authkey=None, max_retries=2,
+                 task_timeout=None, connect_timeout=60.0):
+        authkey = authkey or os.environ.get(AUTHKEY_ENV)
+        if authkey is None and local_workers == 0:
+            raise ValueError(f"Remote search workers need a shared key: set {AUTHKEY_ENV} or authkey")
+        self.authkey = (authkey or secrets.token_hex(16)).encode()
+        self.max_retries = max_retries
+        self.task_timeout = task_timeout
+        self.connect_timeout = connect_timeout
+
+        self.listener = Listener((host, port), family="AF_INET", authkey=self.authkey)
+        self.address = self.listener.address
+        self.workers = []
+        self._accepted = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._generation = 0
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+        self.local_processes = [self._start_local_worker() for _ in range(local_workers)]
+        self._restarts_left = max_retries * local_workers
+        self.n_workers = local_workers or 1
+        logging.info(f"Search coordinator listening on {self.address[0]}:{self.address[1]} "
+                     f"with {local_workers} local workers")
+
+    def _start_local_worker(self):
+        # spawn, like a fresh node: the worker imports only what its tasks need.
+        process = get_context("spawn").Process(target=run_worker, args=(self.address, self.authkey), daemon=True)
+        process.start()
+        return process
+
+    def _accept_loop(self):
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if self._closed:
+                    return
+                logging.info(f"Rejected a search worker connection: {e!r}")
+                continue
+            with self._lock:
+                self._accepted.append(_RemoteWorker(conn))
+
+    def _adopt_workers(self):
+        with self._lock:
+            self.workers.extend(self._accepted)
+            self._accepted.clear()
+        for i, process in enumerate(self.local_processes):
+            if process.exitcode is not None and self._restarts_left > 0 and not self._closed:
+                self._restarts_left -= 1
+                logging.info(f"Local search worker exited with {process.exitcode}; starting a replacement")
+                self.local_processes[i] = self._start_local_worker()
+
+    def _drop(self, worker, queue, attempts, reason):
+        self.workers.remove(worker)
+        worker.conn.close()
+        logging.info(f"Lost search worker {worker.name}: {reason}")
+        if worker.task is None or worker.task[0] != self._generation:
+            return
+        i = worker.task[1]
+        attempts[i] += 1
+        if attempts[i] > self.max_retries:
+            raise RuntimeError(f"Search task {i} failed after {attempts[i]} attempts on lost workers")
+        queue.appendleft(i)
+
+    def _send_task(self, worker, i, fn, args, data):
+        if data.key not in worker.datasets:
+            worker.conn.send(("data", data.key, data))
+            worker.datasets[data.key] = True
+            if len(worker.datasets) > self.MAX_WORKER_DATASETS:
+                worker.conn.send(("release", worker.datasets.popitem(last=False)[0]))
+        worker.conn.send(("task", (self._generation, i), data.key, fn, args))
+        worker.task = (self._generation, i)
+        worker.task_started = time.monotonic()
+
+    def map(self, fn, args_list, data):
+        self._generation += 1
+        queue = deque(range(len(args_list)))
+        attempts = [0] * len(args_list)
+        results = [None] * len(args_list)
+        remaining = len(args_list)
+        last_connected = time.monotonic()
+
+        while remaining:
+            self._adopt_workers()
+            for worker in [w for w in self.workers if w.task is None]:
+                if not queue:
+                    break
+                i = queue.popleft()
+                try:
+                    self._send_task(worker, i, fn, args_list[i], data)
+                except OSError as e:
+                    queue.appendleft(i)
+                    self._drop(worker, queue, attempts, repr(e))
+
+            if self.workers:
+                last_connected = time.monotonic()
+            elif time.monotonic() - last_connected > self.connect_timeout:
+                raise RuntimeError(f"No search worker connected to {self.address[0]}:{self.address[1]} "
+                                   f"for {self.connect_timeout:.0f}s")
+
+            busy = {w.conn: w for w in self.workers if w.task is not None}
+            if not busy:
+                time.sleep(0.1)
+            for conn in wait(list(busy), timeout=0.1) if busy else []:
+                worker = busy[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError) as e:
+                    self._drop(worker, queue, attempts, repr(e))
+                    continue
+                if message[0] == "hello":
+                    worker.name = message[1]
+                    continue
+                kind, (generation, i), payload = message[:3]
+                worker.task = None
+                if generation != self._generation:
+                    continue
+                if kind == "error":
+                    logging.info(f"Search task {i} failed on {worker.name}:\n{message[3]}")
+                    raise payload
+                results[i] = payload
+                remaining -= 1
+
+            if self.task_timeout is not None:
+                now = time.monotonic()
+                for worker in [w for w in self.workers if w.task is not None]:
+                    if worker.task[0] == self._generation and now - worker.task_started > self.task_timeout:
+                        self._drop(worker, queue, attempts, f"task ran over {self.task_timeout}s")
+        return results
+
+    def close(self):
+        self._closed = True
+        self._adopt_workers()
+        for worker in self.workers:
+            try:
+                worker.conn.send(("shutdown",))
+            except OSError:
+                pass
+            worker.conn.close()
+        self.workers = []
+        self.listener.close()
+        for process in self.local_processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+
+def run_worker(address, authkey, name=None):
+    # Worker side of the tcp backend: keeps the datasets it has been sent and
+    # runs tasks against them until the coordinator shuts it down or goes away.
+    try:
+        conn = Client(tuple(address), family="AF_INET", authkey=authkey)
+    except (EOFError, OSError) as e:
+        logging.info(f"Search worker could not join {address[0]}:{address[1]}: {e!r}")
+        return False
+    conn.send(("hello", name or f"{socket.gethostname()}:{os.getpid()}"))
+    datasets = {}
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        kind = message[0]
+        if kind == "shutdown":
+            break
+        if kind == "data":
+            datasets[message[1]] = message[2]
+        elif kind == "release":
+            datasets.pop(message[1], None)
+        elif kind == "task":
+            _, task_id, key, fn, args = message
+            try:
+                reply = ("result", task_id, fn(datasets[key], *args))
+            except Exception as e:
+                reply = ("error", task_id, e, traceback.format_exc())
+            try:
+                conn.send(reply)
+            except (EOFError, OSError):
+                break
+            except Exception:
+                # The result or exception wouldn't pickle; report it as text.
+                detail = reply[3] if reply[0] == "error" else traceback.format_exc()
+                conn.send(("error", task_id, RuntimeError(detail), detail))
+    conn.close()
+    return True
+
+
+def make_search_backend(backend, n_jobs):
+    # A backend object is used as is; a SearchBackendConfig (or None for the
+    # default) is turned into one, sized by n_jobs unless it sets workers.
+    try:
+        if hasattr(backend, "map"):
+            return backend
+        config = backend or SearchBackendConfig()
+        if config.kind not in SEARCH_BACKENDS:
+            raise ValueError(f"Unknown search backend {config.kind!r}; use one of {SEARCH_BACKENDS}")
+        workers = n_jobs if config.workers is None else config.workers
+        if config.kind == "joblib":
+            return JoblibBackend(workers)
+        if config.kind == "process":
+            return ProcessPoolBackend(workers, max_retries=config.max_retries)
+        return TCPBackend(config.host, config.port, local_workers=workers, authkey=config.authkey,
+                          max_retries=config.max_retries, task_timeout=config.task_timeout,
+                          connect_timeout=config.connect_timeout)
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a model-search worker for a tcp search coordinator.")
+    parser.add_argument("--connect", required=True, help="coordinator HOST:PORT")
+    parser.add_argument("--name", default=None)
+    args = parser.parse_args()
+    if AUTHKEY_ENV not in os.environ:
+        parser.error(f"set {AUTHKEY_ENV} to the coordinator's key")
+    host, port = args.connect.rsplit(":", 1)
+    sys.exit(0 if run_worker((host, int(port)), os.environ[AUTHKEY_ENV].encode(), name=args.name) else 1)
@@ -0,0 +1,218 @@
+import os
+import sys
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import OneHotEncoder
+
+from src.exception import CustomException
+from src.logger import logging
+from src.instrumentation import timed
+from src.utils import save_object
+from src.components.compiled_preprocessor import CompiledPreprocessor
+from src.components.data_storage import frame_columns, iter_frame_chunks
+from src.components.data_transformation import DataTransformation, DataTransformationConfig
+
+
+@dataclass
+class StreamingTransformationConfig:
+    chunk_size: int = 100000
+    # Numeric columns are tracked exactly (value -> count) until they have
+    # more distinct values than this, then fall back to a fixed-size random
+    # sample for the median.
+    max_distinct_values: int = 10000
+    median_sample_size: int = 100000
+    random_state: int = 42
+
+
+class NumericStats:
+    def __init__(self, max_distinct, sample_size, rng):
+        self.max_distinct = max_distinct
+        self.sample_size = sample_size
+        self.rng = rng
+        self.counts = Counter()
+        self.sample = self.priorities = None
+        self.n = self.n_missing = 0
+        self.mean = self.m2 = 0.0
+
+    def update(self, values):
+        missing = np.isnan(values)
+        self.n_missing += int(missing.sum())
+        values = values[~missing]
+        if not len(values):
+            return
+
+        # Chan et al. pairwise merge of (count, mean, M2).
+        n_b, mean_b = len(values), float(values.mean())
+        m2_b = float(((values - mean_b) ** 2).sum())
+        delta, n = mean_b - self.mean, self.n + n_b
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta ** 2 * self.n * n_b / n
+        self.n = n
+
+        if self.counts is not None:
+            unique, counts = np.unique(values, return_counts=True)
+            self.counts.update(dict(zip(unique.tolist(), counts.tolist())))
+            if len(self.counts) > self.max_distinct:
+                # Seed the sample from the exact counts seen so far.
+                expanded = np.repeat(np.fromiter(self.counts.keys(), float), list(self.counts.values()))
+                self.counts = None
+                self._sample(expanded)
+        else:
+            self._sample(values)
+
+    def _sample(self, values):
+        # Bottom-k sampling: keep the values with the smallest random keys.
+        priorities = self.rng.random(len(values))
+        if self.sample is not None:
+            values = np.concatenate([self.sample, values])
+            priorities = np.concatenate([self.priorities, priorities])
+        if len(values) > self.sample_size:
+            keep = np.argpartition(priorities, self.sample_size)[:self.sample_size]
+            values, priorities = values[keep], priorities[keep]
+        self.sample, self.priorities = values, priorities
+
+    def median(self):
+        if self.counts is None:
+            return float(np.median(self.sample))
+        values = np.array(sorted(self.counts))
+        cumulative = np.cumsum([self.counts[v] for v in values])
+        # Same convention as np.median: mean of the two middle values.
+        lower = values[np.searchsorted(cumulative, (self.n - 1) // 2, side="right")]
+        upper = values[np.searchsorted(cumulative, self.n // 2, side="right")]
+        return (lower + upper) / 2
+
+    def imputed_scale(self, fill):
+        # Variance after SimpleImputer replaced missing values with `fill`:
+        # merge the observed values with n_missing copies of the fill value.
+        n = self.n + self.n_missing
+        if not n:
+            return 1.0
+        delta = fill - self.mean
+        m2 = self.m2 + delta ** 2 * self.n * self.n_missing / n
+        scale = np.sqrt(m2 / n)
+        # StandardScaler leaves constant columns unscaled.
+        return scale if scale > 10 * np.finfo(np.float64).eps else 1.0
+
+
+class CategoricalStats:
+    def __init__(self):
+        self.counts = Counter()
+        self.n_missing = 0
+
+    def update(self, column):
+        missing = column.isna()
+        self.n_missing += int(missing.sum())
+        self.counts.update(column[~missing].astype(str).value_counts().to_dict())
+
+    def mode(self):
+        # SimpleImputer(most_frequent) breaks ties towards the smallest value.
+        top = max(self.counts.values())
+        return min(c for c, count in self.counts.items() if count == top)
+
+    def categories(self):
+        return sorted(self.counts)
+
+    def hot_scales(self, fill):
+        # A one-hot column with frequency p has variance p(1 - p).
+        counts = dict(self.counts)
+        counts[fill] = counts.get(fill, 0) + self.n_missing
+        n = sum(counts.values())
+        p = np.array([counts[c] for c in self.categories()], dtype=np.float64) / n
+        scale = np.sqrt(p * (1 - p))
+        return np.where(scale > 10 * np.finfo(np.float64).eps, scale, 1.0)
+
+
+# One pass over a train split of any size fits the same preprocessing as
+# DataTransformation.get_data_transformer_object: exact mode, categories and
+# scaler statistics, and an exact median while the numeric columns have few
+# distinct values (scores are integers), a sampled one otherwise. The result
+# is a CompiledPreprocessor; it is also pickled to the preprocessor path, where
+# its transform(df) stands in for the ColumnTransformer at prediction time.
+class StreamingDataTransformation:
+    def __init__(self):
+        self.streaming_config = StreamingTransformationConfig()
+        self.data_transformation_config = DataTransformationConfig()
+
+    def layout(self):
+        # Column groups and their order come from the regular preprocessor
+        # definition so both modes produce the same feature layout.
+        blocks = []
+        for name, pipeline, columns in DataTransformation().get_data_transformer_object().transformers:
+            categorical = any(isinstance(step, OneHotEncoder) for _, step in pipeline.steps)
+            blocks.append(("categorical" if categorical else "numerical", list(columns)))
+        return blocks
+
+    def fit(self, train_path, target_column="math_score"):
+        config = self.streaming_config
+        rng = np.random.default_rng(config.random_state)
+        layout = self.layout()
+        stats = {}
+        for kind, columns in layout:
+            for column in columns:
+                stats[column] = NumericStats(config.max_distinct_values, config.median_sample_size, rng) \
+                    if kind == "numerical" else CategoricalStats()
+
+        n_rows = 0
+        for chunk in iter_frame_chunks(train_path, config.chunk_size):
+            chunk = chunk.drop(columns=[target_column])
+            for column, column_stats in stats.items():
+                if isinstance(column_stats, NumericStats):
+                    column_stats.update(pd.to_numeric(chunk[column]).to_numpy(dtype=np.float64, na_value=np.nan))
+                else:
+                    column_stats.update(chunk[column])
+            n_rows += len(chunk)
+        logging.info(f"Collected streaming preprocessing statistics over {n_rows} rows")
+
+        blocks, start = [], 0
+        for kind, columns in layout:
+            if kind == "numerical":
+                fill = np.array([stats[c].median() for c in columns])
+                blocks.append({
+                    "kind": "numerical",
+                    "features": columns,
+                    "start": start,
+                    "fill": fill,
+                    "mean": np.zeros(len(columns)),
+                    "scale": np.array([stats[c].imputed_scale(f) for c, f in zip(columns, fill)]),
+                })
+                start += len(columns)
+                continue
+
+            fill = [stats[c].mode() for c in columns]
+            categories = [stats[c].categories() for c in columns]
+            offsets, hot_values = [], []
+            for c, f, column_categories in zip(columns, fill, categories):
+                offsets.append(start)
+                hot_values.append(1.0 / stats[c].hot_scales(f))
+                start += len(column_categories)
+            blocks.append({
+                "kind": "categorical",
+                "features": columns,
+                "start": offsets[0],
+                "fill": fill,
+                "categories": categories,
+                "offsets": offsets,
+                "hot_values": hot_values,
+            })
+
+        # Input order of the sklearn preprocessor: the source column order.
+        input_features = [c for c in frame_columns(train_path) if c in stats]
+        return CompiledPreprocessor(input_features, blocks, start)
+
+    def initiate_streaming_transformation(self, train_path):
+        try:
+            with timed("transformation", {"step": "streaming_fit"}):
+                compiled = self.fit(train_path)
+
+            config = self.data_transformation_config
+            os.makedirs(os.path.dirname(config.compiled_preprocessor_file_path), exist_ok=True)
+            compiled.save(config.compiled_preprocessor_file_path)
+            save_object(config.preprocessor_obj_file_path, compiled)
+            logging.info(f"Saved streaming-fitted preprocessor to {config.preprocessor_obj_file_path}")
+            return config.preprocessor_obj_file_path
+
+        except Exception as e:
+            raise CustomException(e, sys)
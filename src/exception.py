@@ -15,3 +15,10 @@ class CustomException(Exception):
 
     def __str__(self):
         return self.error_message
+
+
+class InvalidInputError(ValueError):
+    # The caller's data can't be scored (missing column, unknown category,
+    # non-numeric score); services answer it with 400 and the message, which
+    # holds no server details. Everything else is a server fault.
+    pass
@@ -0,0 +1,124 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+from src.logger import logging, logs_path
+
+TRACE_FILE_PATH = os.path.join(logs_path, "trace.jsonl")
+METRICS_FILE_PATH = os.path.join(logs_path, "metrics.json")
+
+# Trace events are written only when EDUPREDICT_TRACE=1; aggregated metrics
+# are always kept in memory. EDUPREDICT_PROFILE=1 profiles every profiled()
+# block, or give a comma-separated list of block names.
+TRACE_ENABLED = os.environ.get("EDUPREDICT_TRACE") == "1"
+PROFILE_TARGETS = {t.strip() for t in os.environ.get("EDUPREDICT_PROFILE", "").split(",") if t.strip()}
+
+HISTOGRAM_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+
+class Metrics:
+    # Per (name, labels) timing summaries plus a cumulative histogram. Labels
+    # should stay low-cardinality (stage, model family); per-candidate and
+    # per-fold detail belongs in the trace event fields instead.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._series = {}
+        self._trace_file = None
+
+    def record(self, name, seconds, labels=None, **fields):
+        labels = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            series = self._series.get((name, labels))
+            if series is None:
+                series = self._series[(name, labels)] = {
+                    "count": 0, "sum": 0.0, "max": 0.0, "buckets": [0] * len(HISTOGRAM_BUCKETS),
+                }
+            series["count"] += 1
+            series["sum"] += seconds
+            series["max"] = max(series["max"], seconds)
+            for i, bound in enumerate(HISTOGRAM_BUCKETS):
+                if seconds <= bound:
+                    series["buckets"][i] += 1
+
+            if TRACE_ENABLED:
+                if self._trace_file is None:
+                    os.makedirs(os.path.dirname(TRACE_FILE_PATH), exist_ok=True)
+                    self._trace_file = open(TRACE_FILE_PATH, "a", buffering=1)
+                event = {"ts": time.time(), "pid": os.getpid(), "name": name, "seconds": seconds}
+                event.update(dict(labels))
+                event.update(fields)
+                self._trace_file.write(json.dumps(event, default=str) + "\n")
+
+    def snapshot(self):
+        with self._lock:
+            return [
+                {"name": name, "labels": dict(labels), **{k: (list(v) if k == "buckets" else v) for k, v in series.items()}}
+                for (name, labels), series in sorted(self._series.items())
+            ]
+
+    def export(self, file_path=METRICS_FILE_PATH):
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "w") as file_obj:
+            json.dump({"buckets": HISTOGRAM_BUCKETS, "series": self.snapshot()}, file_obj, indent=2)
+        return file_path
+
+    def prometheus_text(self, prefix="edupredict"):
+        lines = []
+        by_name = {}
+        for series in self.snapshot():
+            by_name.setdefault(series["name"], []).append(series)
+
+        for name, all_series in by_name.items():
+            metric = f"{prefix}_{name}_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            for series in all_series:
+                labels = ",".join(f'{k}="{v}"' for k, v in series["labels"].items())
+                sep = "," if labels else ""
+                for bound, count in zip(HISTOGRAM_BUCKETS, series["buckets"]):
+                    lines.append(f'{metric}_bucket{{{labels}{sep}le="{bound}"}} {count}')
+                lines.append(f'{metric}_bucket{{{labels}{sep}le="+Inf"}} {series["count"]}')
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{metric}_sum{suffix} {series['sum']}")
+                lines.append(f"{metric}_count{suffix} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def timed(name, labels=None, **fields):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.record(name, time.perf_counter() - start, labels, **fields)
+
+
+@contextmanager
+def profiled(name):
+    if not PROFILE_TARGETS or ("1" not in PROFILE_TARGETS and name not in PROFILE_TARGETS):
+        yield
+        return
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profile_path = os.path.join(logs_path, f"profile_{name}_{os.getpid()}.prof")
+        os.makedirs(logs_path, exist_ok=True)
+        profiler.dump_stats(profile_path)
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(20)
+        logging.info(f"cProfile for {name} written to {profile_path}\n{summary.getvalue()}")
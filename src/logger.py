@@ -5,14 +5,21 @@ from datetime import datetime
 
 LOG_FILE = f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.log"
 logs_path=os.path.join(os.getcwd(),"logs",LOG_FILE)
-os.makedirs(logs_path,exist_ok=True)
 
 
 LOG_FILE_PATH=os.path.join(logs_path,LOG_FILE)
 
 
+class LazyFileHandler(logging.FileHandler):
+    # The log directory is created with the first record rather than at
+    # import, so importing the package has no filesystem side effects.
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename),exist_ok=True)
+        return super()._open()
+
+
 logging.basicConfig(
-    filename=LOG_FILE_PATH,  # Log to a file
+    handlers=[LazyFileHandler(LOG_FILE_PATH,delay=True)],  # Log to a file
     level=logging.INFO,  # Set log level to INFO
     format='%(asctime)s - %(levelname)s - %(message)s' # Log message format
 )
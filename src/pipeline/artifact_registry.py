@@ -0,0 +1,126 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+from src.exception import CustomException
+from src.logger import logging
+from src.instrumentation import metrics
+from src.utils import load_object
+
+
+@dataclass
+class ArtifactEntry:
+    obj: object
+    fingerprint: tuple
+    content_hash: str
+    loaded_at: float
+
+
+def file_content_hash(file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Process-wide cache of deserialized artifacts keyed by path. Entries are
+# validated against the file's (mtime, size) on every lookup, which costs one
+# os.stat. When that changes, the content hash decides whether the object
+# really has to be reloaded; the new object replaces the old one in a single
+# dict assignment, so readers never see a half-loaded artifact.
+class ArtifactRegistry:
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._path_locks = {}
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "reloads": 0,
+            "revalidations": 0,
+            "load_seconds_total": 0.0,
+            "last_load_seconds": 0.0,
+        }
+
+    def _fingerprint(self, path):
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _path_lock(self, path):
+        with self._lock:
+            return self._path_locks.setdefault(path, threading.Lock())
+
+    def _count(self, key, value=1):
+        with self._lock:
+            self._stats[key] += value
+
+    def get(self, file_path, loader=load_object):
+        try:
+            path = os.path.abspath(file_path)
+            fingerprint = self._fingerprint(path)
+
+            entry = self._entries.get(path)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._count("hits")
+                return entry.obj
+
+            with self._path_lock(path):
+                # Another thread may have refreshed the entry while we waited.
+                fingerprint = self._fingerprint(path)
+                entry = self._entries.get(path)
+                if entry is not None and entry.fingerprint == fingerprint:
+                    self._count("hits")
+                    return entry.obj
+
+                content_hash = file_content_hash(path)
+                if entry is not None and entry.content_hash == content_hash:
+                    self._entries[path] = ArtifactEntry(entry.obj, fingerprint, content_hash, entry.loaded_at)
+                    self._count("revalidations")
+                    return entry.obj
+
+                start = time.perf_counter()
+                obj = loader(path)
+                elapsed = time.perf_counter() - start
+
+                self._entries[path] = ArtifactEntry(obj, fingerprint, content_hash, time.time())
+
+                with self._lock:
+                    self._stats["misses"] += 1
+                    if entry is not None:
+                        self._stats["reloads"] += 1
+                    self._stats["load_seconds_total"] += elapsed
+                    self._stats["last_load_seconds"] = elapsed
+
+                metrics.record("artifact_load", elapsed, {"artifact": os.path.basename(path)}, path=path)
+                logging.info(f"Loaded artifact {path} in {elapsed * 1000:.1f} ms")
+                return obj
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def content_hash(self, file_path):
+        entry = self._entries.get(os.path.abspath(file_path))
+        return entry.content_hash if entry is not None else None
+
+    def invalidate(self, file_path=None):
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+        snapshot["entries"] = len(self._entries)
+        lookups = snapshot["hits"] + snapshot["misses"] + snapshot["revalidations"]
+        snapshot["hit_rate"] = (lookups - snapshot["misses"]) / lookups if lookups else 0.0
+        return snapshot
+
+
+artifact_registry = ArtifactRegistry()
@@ -0,0 +1,47 @@
+import argparse
+import sys
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.predict_pipeline import PredictPipeline
+from src.pipeline.stream_predict import PREDICTION_COLUMN, StreamScorer
+
+
+def score_csv(input_path, output_path, chunk_size=None):
+    try:
+        df = pd.read_csv(input_path)
+        logging.info(f"Read {len(df)} rows for batch scoring from {input_path}")
+
+        predict_pipeline = PredictPipeline()
+        df[PREDICTION_COLUMN] = predict_pipeline.predict_batch(df, chunk_size=chunk_size)
+        df.to_csv(output_path, index=False, header=True)
+
+        return predict_pipeline.last_batch_stats
+
+    except Exception as e:
+        raise CustomException(e, sys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a CSV of students with the trained model.")
+    parser.add_argument("input", help="CSV (or Parquet with --stream) with the seven feature columns")
+    parser.add_argument("output", help="where to write the input plus a predicted_math_score column")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per transform/predict call")
+    parser.add_argument("--stream", action="store_true",
+                        help="read, score and write chunk by chunk (CSV or Parquet) with bounded memory")
+    parser.add_argument("--queue-size", type=int, default=None,
+                        help="chunks buffered between streaming stages")
+    args = parser.parse_args(argv)
+
+    if args.stream:
+        scorer = StreamScorer(chunk_size=args.chunk_size, queue_size=args.queue_size)
+        stats = scorer.score_file(args.input, args.output)
+    else:
+        stats = score_csv(args.input, args.output, chunk_size=args.chunk_size)
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
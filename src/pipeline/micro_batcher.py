@@ -0,0 +1,149 @@
+import queue
+import sys
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.exception import CustomException, InvalidInputError
+from src.pipeline.predict_pipeline import FEATURE_COLUMNS, PredictPipeline
+
+
+@dataclass
+class MicroBatcherConfig:
+    max_batch_size: int = 64
+    max_wait_ms: float = 2.0
+    # Queue-latency samples kept for the percentile metrics.
+    latency_window: int = 10000
+
+
+# Coalesces concurrent single-record requests into one transform + predict
+# call. A worker thread takes the first queued request, then keeps collecting
+# until the batch is full or max_wait_ms has passed since that first request,
+# and resolves every request's Future from the batch result.
+class MicroBatcher:
+    def __init__(self, predict_pipeline=None, max_batch_size=None, max_wait_ms=None):
+        self.micro_batcher_config = MicroBatcherConfig()
+        if max_batch_size:
+            self.micro_batcher_config.max_batch_size = max_batch_size
+        if max_wait_ms is not None:
+            self.micro_batcher_config.max_wait_ms = max_wait_ms
+        self.predict_pipeline = predict_pipeline or PredictPipeline()
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._stopped = threading.Event()
+        self._batch_sizes = Counter()
+        self._queue_latencies = deque(maxlen=self.micro_batcher_config.latency_window)
+        self._requests = 0
+
+    def start(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stopped.clear()
+            self._worker = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+            self._worker.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stopped.set()
+        self._queue.put(None)
+        if self._worker is not None:
+            self._worker.join(timeout)
+
+    def submit(self, record):
+        if not isinstance(record, dict):
+            record = dict(zip(FEATURE_COLUMNS, record))
+        future = Future()
+        self._queue.put((record, future, time.perf_counter()))
+        return future
+
+    def predict(self, record, timeout=None):
+        self.start()
+        return np.array([self.submit(record).result(timeout)])
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = first[2] + self.micro_batcher_config.max_wait_ms / 1000
+        while len(batch) < self.micro_batcher_config.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                self._stopped.set()
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while not self._stopped.is_set():
+            first = self._queue.get()
+            if first is None:
+                break
+            batch = self._collect(first)
+            started = time.perf_counter()
+            self._score(batch)
+
+            with self._lock:
+                self._requests += len(batch)
+                self._batch_sizes[len(batch)] += 1
+                self._queue_latencies.extend(started - enqueued for _, _, enqueued in batch)
+
+        # Anything still queued after stop() gets an answer rather than hanging.
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not None:
+                item[1].set_exception(RuntimeError("Micro-batcher stopped"))
+
+    def _score(self, batch):
+        records = [record for record, _, _ in batch]
+        try:
+            model, preprocessor = self.predict_pipeline.load_artifacts()
+            compiled = None
+            if not self.predict_pipeline.predict_pipeline_config.use_fused_preprocessor:
+                compiled = self.predict_pipeline.load_compiled_preprocessor()
+            frame = pd.DataFrame.from_records(records, columns=FEATURE_COLUMNS)
+            features = compiled.transform(frame) if compiled is not None else preprocessor.transform(frame)
+            preds = model.predict(features)
+        except Exception:
+            # One bad record (e.g. an unseen category) must not fail the
+            # requests it happened to be batched with.
+            for record, future, _ in batch:
+                try:
+                    future.set_result(float(self.predict_pipeline.predict_record(record)[0]))
+                except (InvalidInputError, CustomException) as e:
+                    # Bad input stays an InvalidInputError, as without the
+                    # batcher, and errors already wrapped aren't wrapped twice.
+                    future.set_exception(e)
+                except Exception as e:
+                    future.set_exception(CustomException(e, sys))
+            return
+
+        for (_, future, _), pred in zip(batch, preds):
+            future.set_result(float(pred))
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self._queue_latencies) * 1000
+            batch_sizes = dict(sorted(self._batch_sizes.items()))
+            requests = self._requests
+        batches = sum(batch_sizes.values())
+        stats = {
+            "requests": requests,
+            "batches": batches,
+            "mean_batch_size": requests / batches if batches else 0.0,
+            "batch_size_counts": batch_sizes,
+            "queue_depth": self._queue.qsize(),
+        }
+        for q in (50, 95, 99):
+            stats[f"queue_ms_p{q}"] = float(np.percentile(latencies, q)) if len(latencies) else 0.0
+        return stats
@@ -1,29 +1,261 @@
 import sys
+import time
+from itertools import islice
+import numpy as np
 import pandas as pd
-from src.exception import CustomException
-from src.utils import load_object
+from src.exception import CustomException, InvalidInputError
+from src.logger import logging
+from src.instrumentation import timed
+from src.pipeline.artifact_registry import artifact_registry
+from src.utils import load_object_mmap
+from src.components.compiled_preprocessor import CompiledPreprocessor
+from src.components.native_model import NativeBoosterPredictor
+from src.components.compiled_trees import CompiledTreeEnsemble
+from src.components.fused_preprocessor import fused_preprocessor
+from src.components.prediction_table import PredictionTable
 import os
+from dataclasses import dataclass
+
+FEATURE_COLUMNS = [
+    "gender",
+    "race_ethnicity",
+    "parental_level_of_education",
+    "lunch",
+    "test_preparation_course",
+    "reading_score",
+    "writing_score",
+]
+
+
+@dataclass
+class PredictPipelineConfig:
+    model_path: str = os.path.join("artifacts", "model.pkl")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    compiled_preprocessor_path: str = os.path.join("artifacts", "preprocessor_compiled.npz")
+    prediction_table_path: str = os.path.join("artifacts", "prediction_table.npy")
+    mmap_model_path: str = os.path.join("artifacts", "model_mmap", "model.json")
+    native_model_path: str = os.path.join("artifacts", "model_native.json")
+    compiled_model_path: str = os.path.join("artifacts", "model_compiled.npz")
+    # "pickle" loads model.pkl; "mmap" serves a tree-ensemble winner from its
+    # mapped compiled node arrays, shared through the page cache across worker
+    # processes (other models fall back to model.pkl);
+    # "native" predicts with the bare XGBoost/CatBoost booster when the model
+    # was exported in its native format, and falls back to model.pkl otherwise.
+    artifact_format: str = "pickle"
+    # Answer in-table single records from the precomputed prediction table,
+    # if its build-time check against predict_record stayed within this.
+    use_prediction_table: bool = False
+    prediction_table_tolerance: float = 1e-9
+    # Score single records with the flattened tree ensemble when the model is
+    # one (frames and batches stay on the model itself, which is faster for
+    # deep forests on large inputs).
+    use_compiled_model: bool = False
+    # Transform frames and batches with the single-pass fused preprocessor
+    # (built from the compiled preprocessor) instead of the ColumnTransformer.
+    use_fused_preprocessor: bool = False
+    batch_chunk_size: int = 50000
 
 
 class PredictPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, registry=artifact_registry):
+        self.predict_pipeline_config = PredictPipelineConfig()
+        self.registry = registry
+        self.last_batch_stats = None
+
+    def model_artifact_path(self):
+        config = self.predict_pipeline_config
+        if config.artifact_format == "mmap" and os.path.exists(config.mmap_model_path):
+            return config.mmap_model_path
+        if config.artifact_format == "native" and os.path.exists(config.native_model_path):
+            return config.native_model_path
+        return config.model_path
+
+    def load_model(self):
+        path = self.model_artifact_path()
+        if path == self.predict_pipeline_config.mmap_model_path:
+            return self.registry.get(path, loader=load_object_mmap)
+        if path == self.predict_pipeline_config.native_model_path:
+            return self.registry.get(path, loader=NativeBoosterPredictor.load)
+        return self.registry.get(path)
+
+    def model_version(self):
+        # Content hash of the model currently served; changes after a retrain.
+        path = self.model_artifact_path()
+        self.load_model()
+        return self.registry.content_hash(path)
+
+    def load_artifacts(self):
+        try:
+            model = self.load_model()
+            return model, self.load_frame_preprocessor()
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def load_record_model(self):
+        path = self.predict_pipeline_config.compiled_model_path
+        if self.predict_pipeline_config.use_compiled_model and os.path.exists(path):
+            return self.registry.get(path, loader=CompiledTreeEnsemble.load)
+        return self.load_model()
+
+    def load_frame_preprocessor(self):
+        if self.predict_pipeline_config.use_fused_preprocessor:
+            compiled = self.load_compiled_preprocessor()
+            if compiled is not None:
+                return fused_preprocessor(compiled)
+        return self.registry.get(self.predict_pipeline_config.preprocessor_path)
+
+    def load_compiled_preprocessor(self):
+        path = self.predict_pipeline_config.compiled_preprocessor_path
+        if not os.path.exists(path):
+            return None
+        return self.registry.get(path, loader=CompiledPreprocessor.load)
+
+    def load_prediction_table(self):
+        path = self.predict_pipeline_config.prediction_table_path
+        if not os.path.exists(path):
+            return None
+        table = self.registry.get(path, loader=PredictionTable.load)
+        # A table generated for another model or preprocessor must never
+        # answer for the current ones.
+        for key, artifact_path in (("model_sha256", self.predict_pipeline_config.model_path),
+                                   ("preprocessor_sha256", self.predict_pipeline_config.preprocessor_path)):
+            self.registry.get(artifact_path)
+            if table.meta.get(key) != self.registry.content_hash(artifact_path):
+                logging.info(f"Prediction table is stale for the current {os.path.basename(artifact_path)}; ignoring it")
+                return None
+        max_diff = table.meta.get("max_abs_diff")
+        if max_diff is None or max_diff > self.predict_pipeline_config.prediction_table_tolerance:
+            logging.info(f"Prediction table was not verified within tolerance (max diff {max_diff}); ignoring it")
+            return None
+        return table
+
+    def predict_lookup(self, record):
+        # O(1) answer for integer scores and known categories; None otherwise.
+        table = self.load_prediction_table()
+        if table is None:
+            return None
+        if not isinstance(record, dict):
+            record = dict(zip(FEATURE_COLUMNS, record))
+        value = table.lookup(record)
+        return None if value is None else np.array([value])
+
+    def predict_record(self, record):
+        # Single-row fast path: builds the feature vector straight from a dict
+        # (or a record in FEATURE_COLUMNS order) without going through pandas.
+        try:
+            if self.predict_pipeline_config.use_prediction_table:
+                preds = self.predict_lookup(record)
+                if preds is not None:
+                    return preds
+
+            with timed("predict", {"path": "record", "step": "load_artifacts"}):
+                compiled = self.load_compiled_preprocessor()
+                model = self.load_record_model()
+            if compiled is None:
+                if not isinstance(record, dict):
+                    record = dict(zip(FEATURE_COLUMNS, record))
+                return self.predict(pd.DataFrame([record], columns=FEATURE_COLUMNS))
+
+            with timed("predict", {"path": "record", "step": "transform"}):
+                features = self.transform_input(compiled.transform_record, record)
+            with timed("predict", {"path": "record", "step": "model_predict"}):
+                return model.predict(features)
+
+        except InvalidInputError:
+            raise
+        except Exception as e:
+            raise CustomException(e, sys)
 
     def predict(self,features):
         try:
-            model_path=os.path.join("artifacts","model.pkl")
-            preprocessor_path=os.path.join('artifacts','preprocessor.pkl')
-            print("Before Loading")
-            model=load_object(file_path=model_path)
-            preprocessor=load_object(file_path=preprocessor_path)
-            print("After Loading")
-            data_scaled=preprocessor.transform(features)
-            preds=model.predict(data_scaled)
+            with timed("predict", {"path": "frame", "step": "load_artifacts"}):
+                model, preprocessor = self.load_artifacts()
+            with timed("predict", {"path": "frame", "step": "transform"}, rows=len(features)):
+                data_scaled=self.transform_input(preprocessor.transform, features)
+            with timed("predict", {"path": "frame", "step": "model_predict"}, rows=len(features)):
+                preds=model.predict(data_scaled)
             return preds
         
+        except InvalidInputError:
+            raise
         except Exception as e:
             raise CustomException(e,sys)
 
+    @staticmethod
+    def transform_input(transform, data):
+        # A failure to encode caller-supplied rows (unknown category,
+        # non-numeric score, missing column) is the caller's error.
+        try:
+            return transform(data)
+        except (ValueError, TypeError, KeyError) as e:
+            raise InvalidInputError(f"Invalid input: {e}") from e
+
+    def iter_feature_chunks(self, records, chunk_size):
+        if isinstance(records, pd.DataFrame):
+            missing = [column for column in FEATURE_COLUMNS if column not in records.columns]
+            if missing:
+                raise InvalidInputError(f"Missing columns: {', '.join(missing)}")
+            frame = records[FEATURE_COLUMNS]
+            for start in range(0, len(frame), chunk_size):
+                yield frame.iloc[start:start + chunk_size]
+        elif isinstance(records, np.ndarray):
+            if records.dtype.names:
+                records = pd.DataFrame.from_records(records)[FEATURE_COLUMNS].to_numpy(dtype=object)
+            if records.ndim != 2 or records.shape[1] != len(FEATURE_COLUMNS):
+                raise InvalidInputError(f"Expected an array of shape (n, {len(FEATURE_COLUMNS)}) in column order {FEATURE_COLUMNS}")
+            for start in range(0, len(records), chunk_size):
+                yield pd.DataFrame(records[start:start + chunk_size], columns=FEATURE_COLUMNS).infer_objects()
+        else:
+            # Records are JSON objects; from_records would silently fill in
+            # missing fields, so hold them to the same columns as a frame.
+            iterator = iter(records)
+            offset = 0
+            while True:
+                chunk = list(islice(iterator, chunk_size))
+                if not chunk:
+                    break
+                for i, record in enumerate(chunk, start=offset):
+                    if not isinstance(record, dict):
+                        raise InvalidInputError(f"Record {i} must be an object with the fields {FEATURE_COLUMNS}")
+                    missing = [column for column in FEATURE_COLUMNS if record.get(column) is None]
+                    if missing:
+                        raise InvalidInputError(f"Record {i} is missing columns: {', '.join(missing)}")
+                offset += len(chunk)
+                yield pd.DataFrame.from_records(chunk, columns=FEATURE_COLUMNS)
+
+    def predict_batch(self, records, chunk_size=None):
+        try:
+            chunk_size = chunk_size or self.predict_pipeline_config.batch_chunk_size
+            with timed("predict", {"path": "batch", "step": "load_artifacts"}):
+                model, preprocessor = self.load_artifacts()
+
+            start = time.perf_counter()
+            preds = []
+            for chunk in self.iter_feature_chunks(records, chunk_size):
+                with timed("predict", {"path": "batch", "step": "transform"}, rows=len(chunk)):
+                    features = self.transform_input(preprocessor.transform, chunk)
+                with timed("predict", {"path": "batch", "step": "model_predict"}, rows=len(chunk)):
+                    preds.append(model.predict(features))
+            preds = np.concatenate(preds) if preds else np.empty(0)
+            elapsed = time.perf_counter() - start
+
+            self.last_batch_stats = {
+                "rows": len(preds),
+                "seconds": elapsed,
+                "rows_per_sec": len(preds) / elapsed if elapsed > 0 else float("inf"),
+            }
+            logging.info(
+                f"Scored {len(preds)} rows in {elapsed:.3f}s "
+                f"({self.last_batch_stats['rows_per_sec']:.0f} rows/sec)"
+            )
+            return preds
+
+        except InvalidInputError:
+            raise
+        except Exception as e:
+            raise CustomException(e, sys)
+
 
 
 class CustomData:
@@ -50,6 +282,29 @@ class CustomData:
 
         self.writing_score = writing_score
 
+    def get_data_as_dict(self):
+        return {
+            "gender": self.gender,
+            "race_ethnicity": self.race_ethnicity,
+            "parental_level_of_education": self.parental_level_of_education,
+            "lunch": self.lunch,
+            "test_preparation_course": self.test_preparation_course,
+            "reading_score": self.reading_score,
+            "writing_score": self.writing_score,
+        }
+
+    def normalized_key(self):
+        # Hashable form of the inputs for memoization: text is stripped and
+        # scores are compared as floats, so 70 and 70.0 share one entry.
+        key = []
+        for name, value in self.get_data_as_dict().items():
+            if name in ("reading_score", "writing_score"):
+                value = float(value)
+            elif isinstance(value, str):
+                value = value.strip()
+            key.append((name, value))
+        return tuple(key)
+
     def get_data_as_data_frame(self):
         try:
             custom_data_input_dict = {
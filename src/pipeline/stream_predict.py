@@ -0,0 +1,162 @@
+import os
+import queue
+import sys
+import threading
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from src.exception import CustomException
+from src.logger import logging
+from src.pipeline.predict_pipeline import FEATURE_COLUMNS, PredictPipeline
+
+PREDICTION_COLUMN = "predicted_math_score"
+
+_END = object()
+
+
+@dataclass
+class StreamScorerConfig:
+    chunk_size: int = 50000
+    # Chunks allowed to wait between two stages. A full queue blocks the
+    # upstream stage, which is what keeps memory bounded.
+    queue_size: int = 2
+
+
+def _is_parquet(path):
+    return os.path.splitext(path)[1].lower() in (".parquet", ".pq")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet streaming needs pyarrow: pip install pyarrow") from e
+
+
+def prefetch(iterable, maxsize):
+    # Run `iterable` in a background thread and hand its items over through a
+    # bounded queue, so each stage overlaps with the next without running ahead.
+    items = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(item):
+        # Give up once the consumer is gone instead of blocking on a full queue.
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iterable:
+                if not put(item):
+                    return
+            put(_END)
+        except BaseException as e:
+            put(e)
+        finally:
+            close = getattr(iterable, "close", None)
+            if close is not None:
+                close()
+
+    worker = threading.Thread(target=produce, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = items.get()
+            if item is _END:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Once this returns the producer has stopped and closed its source.
+        stop.set()
+        worker.join()
+
+
+class StreamScorer:
+    def __init__(self, chunk_size=None, queue_size=None, predict_pipeline=None):
+        self.stream_scorer_config = StreamScorerConfig()
+        if chunk_size:
+            self.stream_scorer_config.chunk_size = chunk_size
+        if queue_size:
+            self.stream_scorer_config.queue_size = queue_size
+        self.predict_pipeline = predict_pipeline or PredictPipeline()
+
+    def read_chunks(self, input_path):
+        chunk_size = self.stream_scorer_config.chunk_size
+        if _is_parquet(input_path):
+            pyarrow = _require_pyarrow()
+            parquet_file = pyarrow.parquet.ParquetFile(input_path)
+            for batch in parquet_file.iter_batches(batch_size=chunk_size):
+                yield batch.to_pandas()
+        else:
+            with pd.read_csv(input_path, chunksize=chunk_size) as reader:
+                yield from reader
+
+    def score_chunks(self, chunks):
+        model, preprocessor = self.predict_pipeline.load_artifacts()
+        for chunk in chunks:
+            chunk[PREDICTION_COLUMN] = model.predict(preprocessor.transform(chunk[FEATURE_COLUMNS]))
+            yield chunk
+
+    def write_chunks(self, chunks, output_path):
+        rows = 0
+        if _is_parquet(output_path):
+            pyarrow = _require_pyarrow()
+            writer = None
+            try:
+                for chunk in chunks:
+                    table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pyarrow.parquet.ParquetWriter(output_path, table.schema)
+                    writer.write_table(table)
+                    rows += len(chunk)
+            finally:
+                if writer is not None:
+                    writer.close()
+        else:
+            with open(output_path, "w", newline="") as file_obj:
+                for i, chunk in enumerate(chunks):
+                    chunk.to_csv(file_obj, index=False, header=(i == 0))
+                    rows += len(chunk)
+        return rows
+
+    def score_file(self, input_path, output_path):
+        try:
+            queue_size = self.stream_scorer_config.queue_size
+            logging.info(
+                f"Streaming {input_path} -> {output_path} "
+                f"(chunk_size={self.stream_scorer_config.chunk_size}, queue_size={queue_size})"
+            )
+
+            start = time.perf_counter()
+            chunks = prefetch(self.read_chunks(input_path), queue_size)
+            scored = prefetch(self.score_chunks(chunks), queue_size)
+            try:
+                rows = self.write_chunks(scored, output_path)
+            finally:
+                # Stops both background stages (and closes the input file)
+                # if writing fails part-way.
+                scored.close()
+                chunks.close()
+            elapsed = time.perf_counter() - start
+
+            stats = {
+                "rows": rows,
+                "seconds": elapsed,
+                "rows_per_sec": rows / elapsed if elapsed > 0 else float("inf"),
+            }
+            logging.info(f"Streamed {rows} rows in {elapsed:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
+            return stats
+
+        except Exception as e:
+            raise CustomException(e, sys)
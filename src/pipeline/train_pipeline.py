@@ -0,0 +1,358 @@
+import argparse
+import ast
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+
+from src.exception import CustomException
+from src.logger import logging
+from src.instrumentation import metrics, profiled, timed
+from src.pipeline.artifact_registry import file_content_hash
+from src.utils import write_atomic
+
+from src.components.data_ingestion import DataIngestion, DataIngestionConfig
+from src.components.data_transformation import DataTransformation, DataTransformationConfig
+from src.components.feature_matrix import FeatureMatrix
+from src.components.data_storage import STORAGE_FORMATS
+from src.components.incremental_trainer import IncrementalModelTrainer, IncrementalTrainerConfig
+from src.components.streaming_transformation import StreamingDataTransformation, StreamingTransformationConfig
+from src.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.components.prediction_table import PredictionTableConfig
+from src.components.search_backends import SEARCH_BACKENDS, SearchBackendConfig
+
+
+@dataclass
+class TrainPipelineConfig:
+    state_file_path: str = os.path.join("artifacts", "pipeline_state.json")
+    train_features_path: str = os.path.join("artifacts", "train_features.npz")
+    test_features_path: str = os.path.join("artifacts", "test_features.npz")
+    # Re-run every stage regardless of the recorded state.
+    force: bool = False
+    # Stream ingestion, preprocessing and training in chunks so the dataset
+    # size isn't bounded by RAM (see out_of_core_stages).
+    out_of_core: bool = False
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: list
+    outputs: list
+    run: object
+    # Source files whose edits should invalidate the stage (param grids,
+    # preprocessing steps), plus any config values it depends on.
+    code: list = field(default_factory=list)
+    params: dict = field(default_factory=dict)
+    # Outputs the stage may legitimately not write (e.g. an export the
+    # winning model doesn't support); recorded as absent when missing.
+    optional_outputs: list = field(default_factory=list)
+
+
+def _output_hash(path):
+    return file_content_hash(path) if os.path.exists(path) else None
+
+
+def _module_path(module_name):
+    return os.path.abspath(importlib.util.find_spec(module_name).origin)
+
+
+def _is_source_module(name):
+    if name.split(".")[0] != "src":
+        return False
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        # "from src.utils import save_object": the name is not a module.
+        return False
+    return spec is not None and spec.origin is not None and spec.origin.endswith(".py")
+
+
+def _is_main_block(node):
+    return isinstance(node, ast.If) and isinstance(node.test, ast.Compare) and \
+        isinstance(node.test.left, ast.Name) and node.test.left.id == "__name__"
+
+
+def _code_paths(*module_names):
+    # The given modules plus every src module they import, directly or
+    # through other src modules, including imports done inside functions:
+    # an edit to any code the stage runs has to invalidate it.
+    seen, pending = set(), list(module_names)
+    while pending:
+        module_name = pending.pop()
+        if module_name in seen:
+            continue
+        seen.add(module_name)
+        with open(_module_path(module_name)) as file_obj:
+            tree = ast.parse(file_obj.read())
+        # A module's __main__ block only runs as a script, not in the stage.
+        tree.body = [node for node in tree.body if not _is_main_block(node)]
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            elif isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            else:
+                continue
+            pending.extend(name for name in names if _is_source_module(name))
+    return sorted(_module_path(module_name) for module_name in seen)
+
+
+# Runs ingestion -> transformation -> training as stages with declared inputs
+# and outputs. A stage's fingerprint is the content hash of its inputs, its
+# code and its params; it is skipped when the fingerprint matches the last
+# successful run and its outputs are still the files that run produced.
+# Because fingerprints are over content, a re-run upstream stage that writes
+# identical files (e.g. the same source CSV re-ingested) doesn't invalidate
+# anything downstream. Within the training stage the model families are
+# searched concurrently on one shared worker pool (ModelTrainerConfig.n_jobs)
+# and repeated fits are served from the fit cache.
+class TrainPipeline:
+    def __init__(self):
+        self.train_pipeline_config = TrainPipelineConfig()
+        self.ingestion_config = DataIngestionConfig()
+        self.transformation_config = DataTransformationConfig()
+        self.trainer_config = ModelTrainerConfig()
+        self.streaming_config = StreamingTransformationConfig()
+        self.incremental_trainer_config = IncrementalTrainerConfig()
+        self.results = {}
+
+    def stages(self):
+        if self.train_pipeline_config.out_of_core:
+            return self.out_of_core_stages()
+
+        ingestion, transformation, trainer = self.ingestion_config, self.transformation_config, self.trainer_config
+        config = self.train_pipeline_config
+        return [
+            Stage(
+                name="ingestion",
+                inputs=[ingestion.source_data_path],
+                outputs=[ingestion.raw_data_path, ingestion.train_data_path, ingestion.test_data_path],
+                run=self.run_ingestion,
+                code=_code_paths(DataIngestion.__module__),
+            ),
+            Stage(
+                name="transformation",
+                inputs=[ingestion.train_data_path, ingestion.test_data_path],
+                outputs=[transformation.preprocessor_obj_file_path, transformation.compiled_preprocessor_file_path,
+                         config.train_features_path, config.test_features_path],
+                run=self.run_transformation,
+                code=_code_paths(DataTransformation.__module__, FeatureMatrix.__module__),
+                params={"sparse_one_hot": transformation.sparse_one_hot, "feature_dtype": transformation.feature_dtype,
+                        "fused_transform": transformation.fused_transform},
+            ),
+            Stage(
+                name="training",
+                inputs=[config.train_features_path, config.test_features_path],
+                outputs=[trainer.trained_model_file_path, trainer.search_report_file_path],
+                optional_outputs=self.training_exports(),
+                run=self.run_training,
+                code=_code_paths(ModelTrainer.__module__, FeatureMatrix.__module__),
+                params={
+                    "search_strategy": trainer.search_strategy,
+                    "search_budget": vars(trainer.search_budget),
+                    "save_mmap_artifact": trainer.save_mmap_artifact,
+                    "save_native_artifact": trainer.save_native_artifact,
+                    "save_compiled_model": trainer.save_compiled_model,
+                    "build_prediction_table": trainer.build_prediction_table,
+                },
+            ),
+        ]
+
+    def training_exports(self):
+        trainer = self.trainer_config
+        exports = []
+        if trainer.save_mmap_artifact:
+            # The manifest records the hash of every mapped array file.
+            exports.append(trainer.mmap_model_file_path)
+        if trainer.save_native_artifact:
+            exports.append(trainer.native_model_file_path)
+        if trainer.save_compiled_model:
+            exports.append(trainer.compiled_model_file_path)
+        if trainer.build_prediction_table:
+            table = PredictionTableConfig()
+            exports.extend([table.table_file_path, table.meta_file_path])
+        return exports
+
+    def out_of_core_stages(self):
+        # Same stage names and artifact paths; the stages differ in params so
+        # switching modes invalidates them.
+        ingestion, transformation = self.ingestion_config, self.transformation_config
+        incremental, streaming = self.incremental_trainer_config, self.streaming_config
+        return [
+            Stage(
+                name="ingestion",
+                inputs=[ingestion.source_data_path],
+                outputs=[ingestion.raw_data_path, ingestion.train_data_path, ingestion.test_data_path],
+                run=lambda: self.data_ingestion().initiate_streaming_ingestion(),
+                code=_code_paths(DataIngestion.__module__),
+                params={"mode": "out_of_core", "test_size": ingestion.test_size},
+            ),
+            Stage(
+                name="transformation",
+                inputs=[ingestion.train_data_path],
+                outputs=[transformation.preprocessor_obj_file_path, transformation.compiled_preprocessor_file_path],
+                run=lambda: StreamingDataTransformation().initiate_streaming_transformation(ingestion.train_data_path),
+                code=_code_paths(StreamingDataTransformation.__module__),
+                params={"mode": "out_of_core", **vars(streaming)},
+            ),
+            Stage(
+                name="training",
+                inputs=[ingestion.train_data_path, ingestion.test_data_path, transformation.preprocessor_obj_file_path],
+                outputs=[incremental.trained_model_file_path, incremental.report_file_path],
+                # Written for the winners that support them, removed otherwise.
+                optional_outputs=[incremental.native_model_file_path, incremental.compiled_model_file_path,
+                                  incremental.mmap_model_file_path],
+                run=self.run_incremental_training,
+                code=_code_paths(IncrementalModelTrainer.__module__),
+                params={"mode": "out_of_core", **vars(incremental)},
+            ),
+        ]
+
+    def data_ingestion(self):
+        # Components build their own default config; hand them ours so
+        # overrides made on the pipeline (storage format, paths) apply.
+        ingestion = DataIngestion()
+        ingestion.ingestion_config = self.ingestion_config
+        return ingestion
+
+    def run_ingestion(self):
+        self.data_ingestion().initiate_data_ingestion()
+
+    def run_incremental_training(self):
+        trainer = IncrementalModelTrainer()
+        trainer.incremental_trainer_config = self.incremental_trainer_config
+        best_model_name, r2 = trainer.initiate_incremental_training(
+            self.ingestion_config.train_data_path, self.ingestion_config.test_data_path,
+            self.transformation_config.preprocessor_obj_file_path
+        )
+        self.results["training"] = {"best_model": best_model_name, "r2_score": r2}
+
+    def run_transformation(self):
+        transformation = DataTransformation()
+        transformation.data_transformation_config = self.transformation_config
+        train_fm, test_fm, _ = transformation.initiate_feature_transformation(
+            self.ingestion_config.train_data_path, self.ingestion_config.test_data_path
+        )
+        train_fm.save(self.train_pipeline_config.train_features_path)
+        test_fm.save(self.train_pipeline_config.test_features_path)
+
+    def run_training(self):
+        train_fm = FeatureMatrix.load(self.train_pipeline_config.train_features_path)
+        test_fm = FeatureMatrix.load(self.train_pipeline_config.test_features_path)
+        trainer = ModelTrainer()
+        trainer.model_trainer_config = self.trainer_config
+        trainer.model_trainer_config.preprocessor_file_path = self.transformation_config.preprocessor_obj_file_path
+        trainer.model_trainer_config.compiled_preprocessor_file_path = \
+            self.transformation_config.compiled_preprocessor_file_path
+        best_model_name, r2 = trainer.initiate_model_trainer(train_fm, test_fm)
+        self.results["training"] = {"best_model": best_model_name, "r2_score": r2}
+
+    def fingerprint(self, stage):
+        digest = hashlib.sha256()
+        for path in stage.inputs:
+            digest.update(path.encode())
+            digest.update(file_content_hash(path).encode())
+        for path in stage.code:
+            digest.update(file_content_hash(path).encode())
+        digest.update(json.dumps(stage.params, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def load_state(self):
+        path = self.train_pipeline_config.state_file_path
+        if not os.path.exists(path):
+            return {}
+        with open(path) as file_obj:
+            return json.load(file_obj)
+
+    def save_state(self, state):
+        payload = json.dumps(state, indent=2, sort_keys=True).encode()
+        write_atomic(self.train_pipeline_config.state_file_path, lambda f: f.write(payload))
+
+    def is_up_to_date(self, stage, fingerprint, recorded):
+        if recorded is None or recorded.get("fingerprint") != fingerprint:
+            return False
+        # Outputs deleted or rewritten out-of-band force a re-run too.
+        for path in stage.outputs:
+            if not os.path.exists(path) or file_content_hash(path) != recorded["outputs"].get(path):
+                return False
+        for path in stage.optional_outputs:
+            if path not in recorded["outputs"] or _output_hash(path) != recorded["outputs"][path]:
+                return False
+        return True
+
+    def run(self, force=None, only=None):
+        try:
+            force = self.train_pipeline_config.force if force is None else force
+            state = self.load_state()
+            summary = {}
+            for stage in self.stages():
+                if only and stage.name not in only:
+                    continue
+                missing = [path for path in stage.inputs if not os.path.exists(path)]
+                if missing:
+                    raise FileNotFoundError(f"Stage {stage.name} is missing inputs {missing}")
+
+                fingerprint = self.fingerprint(stage)
+                if not force and self.is_up_to_date(stage, fingerprint, state.get(stage.name)):
+                    logging.info(f"Stage {stage.name} is up to date, skipping")
+                    summary[stage.name] = "skipped"
+                    continue
+
+                logging.info(f"Running stage {stage.name}")
+                with timed("pipeline_stage", {"stage": stage.name}):
+                    stage.run()
+                # Record the fingerprint only after the stage succeeded, so
+                # an interrupted run is retried next time.
+                state[stage.name] = {
+                    "fingerprint": fingerprint,
+                    "outputs": {
+                        **{path: file_content_hash(path) for path in stage.outputs},
+                        **{path: _output_hash(path) for path in stage.optional_outputs},
+                    },
+                }
+                self.save_state(state)
+                summary[stage.name] = "ran"
+
+            return summary
+
+        except Exception as e:
+            raise CustomException(e, sys)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the training pipeline, skipping stages whose inputs are unchanged.")
+    parser.add_argument("--force", action="store_true", help="re-run every stage")
+    parser.add_argument("--out-of-core", action="store_true",
+                        help="stream the data in chunks instead of loading it into memory")
+    parser.add_argument("--storage-format", choices=list(STORAGE_FORMATS), default="csv",
+                        help="file format of the ingested raw/train/test splits")
+    parser.add_argument("--stages", nargs="+", choices=["ingestion", "transformation", "training"],
+                        help="only consider these stages")
+    parser.add_argument("--search-backend", choices=list(SEARCH_BACKENDS), default="joblib",
+                        help="where the hyperparameter-search fits run")
+    parser.add_argument("--search-workers", type=int, default=None,
+                        help="process pool size, or local workers started by the tcp coordinator")
+    parser.add_argument("--search-address", default="127.0.0.1:0",
+                        help="HOST:PORT the tcp coordinator listens on")
+    args = parser.parse_args(argv)
+
+    pipeline = TrainPipeline()
+    pipeline.train_pipeline_config.out_of_core = args.out_of_core
+    pipeline.ingestion_config = DataIngestionConfig(storage_format=args.storage_format)
+    host, port = args.search_address.rsplit(":", 1)
+    pipeline.trainer_config.search_backend = SearchBackendConfig(
+        kind=args.search_backend, workers=args.search_workers, host=host, port=int(port))
+    with profiled("training"):
+        summary = pipeline.run(force=args.force, only=args.stages)
+    for name, status in summary.items():
+        print(f"{name:15s} {status}")
+    if "training" in pipeline.results:
+        print(pipeline.results["training"])
+    print(f"Timing metrics written to {metrics.export()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,97 @@
 import os 
 import sys
-import dill
+import glob
+import hashlib
+import json
+import mmap
+import tempfile
 
 import numpy as np
 import pandas as pd
 import pickle
 
 from src.exception import CustomException
-from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
-from sklearn.model_selection import GridSearchCV
 
-def save_object(file_path,obj):
-    try:
-        dir_path=os.path.dirname(file_path)
+# os.umask can only be read by setting it, which is process-wide, so read it
+# once at import rather than on every write from a worker thread.
+_UMASK=os.umask(0)
+os.umask(_UMASK)
+
+def write_atomic(file_path,write):
+    # Write to a temp file and rename over the target so readers (e.g. the
+    # serving-side artifact registry) never observe a half-written file.
+    dir_path=os.path.dirname(file_path)
+    if dir_path:
         os.makedirs(dir_path,exist_ok=True)
 
-        with open(file_path,'wb') as file_obj:
-            dill.dump(obj,file_obj)
+    fd,tmp_path=tempfile.mkstemp(dir=dir_path or None,suffix=".tmp")
+    try:
+        with os.fdopen(fd,'wb') as file_obj:
+            write(file_obj)
+        # mkstemp creates the file 0600; give it the mode open() would have.
+        os.chmod(tmp_path,0o666&~_UMASK)
+        os.replace(tmp_path,file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def save_object(file_path,obj):
+    try:
+        # Training-side only; loading artifacts needs nothing beyond pickle.
+        import dill
 
+        write_atomic(file_path,lambda file_obj: dill.dump(obj,file_obj))
     
     except Exception as e:
         raise CustomException(e,sys)
     
-def evaluate_models(X_train,y_train,X_test,y_test,models,param):
+def evaluate_models(X_train,y_train,X_test,y_test,models,param,n_jobs=1,timings=None,
+                    strategy="grid",budget=None,cache=None,backend=None):
     try:
-        report={}
+        # Imported here so the serving path, which only loads artifacts
+        # through this module, never pulls in sklearn.model_selection.
+        from sklearn.metrics import r2_score
+        from src.components.model_search import search_models, refit_best_models, resolve_n_jobs
+        from src.components.search_backends import make_search_backend
 
-        for i in range (len(list(models))):
-            model=list(models.values())[i]
-            para=param[list(models.keys())[i]]
-
-            gs = GridSearchCV(model,para,cv=3)
-            gs.fit(X_train,y_train)
-
-            model.set_params(**gs.best_params_)
-
-            model.fit(X_train,y_train)
+        report={}
 
-            y_train_pred=model.predict(X_train)
+        # `backend` is a SearchBackendConfig (built and torn down here) or a
+        # backend object the caller owns.
+        search_backend=make_search_backend(backend,resolve_n_jobs(n_jobs))
+        try:
+            search_results=search_models(X_train,y_train,models,param,n_jobs=n_jobs,
+                                         strategy=strategy,budget=budget,cache=cache,backend=search_backend)
+            fitted_models=refit_best_models(X_train,y_train,models,search_results,n_jobs=n_jobs,cache=cache,
+                                            backend=search_backend)
+        finally:
+            if search_backend is not backend:
+                search_backend.close()
+
+        for name,model in fitted_models.items():
+            # Callers pick the winner out of `models`, so hand back the fitted estimator.
+            models[name]=model
 
             y_test_pred=model.predict(X_test)
 
-            train_model_score=r2_score(y_train,y_train_pred)
-
             test_model_score=r2_score(y_test,y_test_pred)
 
-            report[list(models.keys())[i]]=test_model_score
+            report[name]=test_model_score
+
+            if timings is not None:
+                timings[name]={
+                    "strategy":search_results[name]["strategy"],
+                    "best_params":search_results[name]["best_params"],
+                    "best_cv_score":search_results[name]["best_score"],
+                    "test_score":test_model_score,
+                    "wall_seconds":search_results[name]["wall_seconds"],
+                    "cpu_seconds":search_results[name]["cpu_seconds"],
+                    "candidates":len(search_results[name]["candidates"]),
+                    "fits":search_results[name]["n_fits"],
+                    "cache_hits":search_results[name]["cache_hits"],
+                    "curve":search_results[name]["curve"],
+                }
 
         return report
     
@@ -63,3 +109,105 @@ def load_object(file_path):
         raise CustomException(e, sys)
 
 
+
+MMAP_FORMAT_VERSION=1
+MMAP_ALIGNMENT=64
+
+def save_object_mmap(manifest_path,obj,metadata=None):
+    # Pickle protocol 5 with out-of-band buffers: the pickle stream keeps the
+    # object structure while every large contiguous buffer (numpy arrays) goes
+    # to a side file at an aligned offset. Loading maps that file read-only,
+    # so the arrays live in the page cache and are shared by every process
+    # that maps them. Data files are content-named and the manifest is
+    # replaced last, so a reader never pairs a new manifest with old data.
+    try:
+        buffers=[]
+        payload=pickle.dumps(obj,protocol=5,buffer_callback=buffers.append)
+
+        layout=[]
+        offset=0
+        raw_buffers=[]
+        for buffer in buffers:
+            raw=buffer.raw()
+            offset+=-offset%MMAP_ALIGNMENT
+            layout.append({"offset":offset,"length":raw.nbytes,"sha256":hashlib.sha256(raw).hexdigest()})
+            raw_buffers.append(raw)
+            offset+=raw.nbytes
+
+        payload_sha=hashlib.sha256(payload).hexdigest()
+        content_id=hashlib.sha256((payload_sha+"".join(e["sha256"] for e in layout)).encode()).hexdigest()[:16]
+        dir_path=os.path.dirname(manifest_path)
+        stem=os.path.splitext(os.path.basename(manifest_path))[0]
+        object_file=f"{stem}.{content_id}.pkl"
+        buffers_file=f"{stem}.{content_id}.bin"
+
+        def write_buffers(file_obj):
+            for entry,raw in zip(layout,raw_buffers):
+                file_obj.write(b"\0"*(entry["offset"]-file_obj.tell()))
+                file_obj.write(raw)
+
+        write_atomic(os.path.join(dir_path,buffers_file),write_buffers)
+        write_atomic(os.path.join(dir_path,object_file),lambda file_obj: file_obj.write(payload))
+
+        manifest={
+            "format_version":MMAP_FORMAT_VERSION,
+            "object_type":f"{type(obj).__module__}.{type(obj).__qualname__}",
+            "object_file":object_file,
+            "object_sha256":payload_sha,
+            "buffers_file":buffers_file,
+            "buffers":layout,
+        }
+        manifest.update(metadata or {})
+        write_atomic(manifest_path,lambda file_obj: file_obj.write(json.dumps(manifest,indent=2).encode()))
+
+        # Old data files stay valid for processes that still have them mapped.
+        for path in glob.glob(os.path.join(dir_path,f"{stem}.*.pkl"))+glob.glob(os.path.join(dir_path,f"{stem}.*.bin")):
+            if os.path.basename(path) not in (object_file,buffers_file):
+                os.remove(path)
+
+    except Exception as e:
+        raise CustomException(e,sys)
+
+def remove_object_mmap(manifest_path):
+    # Drops a manifest and its data files, e.g. when a new winner has nothing
+    # worth mapping, so a reader can't pick up an older model.
+    try:
+        dir_path=os.path.dirname(manifest_path)
+        stem=os.path.splitext(os.path.basename(manifest_path))[0]
+        for path in [manifest_path]+glob.glob(os.path.join(dir_path,f"{stem}.*.pkl"))+glob.glob(os.path.join(dir_path,f"{stem}.*.bin")):
+            if os.path.exists(path):
+                os.remove(path)
+
+    except Exception as e:
+        raise CustomException(e,sys)
+
+def load_object_mmap(manifest_path,verify=True):
+    # Buffers are checked against the manifest's hashes by default, so a
+    # corrupted .bin fails to load instead of unpickling into wrong arrays.
+    # Hashing reads every page once, which only warms the shared page cache.
+    try:
+        with open(manifest_path) as file_obj:
+            manifest=json.load(file_obj)
+        if manifest["format_version"]!=MMAP_FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact format version {manifest['format_version']}")
+
+        dir_path=os.path.dirname(manifest_path)
+        with open(os.path.join(dir_path,manifest["object_file"]),"rb") as file_obj:
+            payload=file_obj.read()
+        if hashlib.sha256(payload).hexdigest()!=manifest["object_sha256"]:
+            raise ValueError(f"Checksum mismatch for {manifest['object_file']}")
+
+        buffers=[]
+        if manifest["buffers"]:
+            with open(os.path.join(dir_path,manifest["buffers_file"]),"rb") as file_obj:
+                mapped=memoryview(mmap.mmap(file_obj.fileno(),0,access=mmap.ACCESS_READ))
+            for entry in manifest["buffers"]:
+                buffer=mapped[entry["offset"]:entry["offset"]+entry["length"]]
+                if verify and hashlib.sha256(buffer).hexdigest()!=entry["sha256"]:
+                    raise ValueError(f"Checksum mismatch for buffer at offset {entry['offset']}")
+                buffers.append(buffer)
+
+        return pickle.loads(payload,buffers=buffers)
+
+    except Exception as e:
+        raise CustomException(e,sys)
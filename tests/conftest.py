@@ -0,0 +1,39 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src.components.data_transformation import DataTransformation  # noqa: E402
+from src.pipeline.predict_pipeline import FEATURE_COLUMNS  # noqa: E402
+
+TARGET_COLUMN = "math_score"
+
+
+@pytest.fixture(scope="session")
+def students():
+    return pd.read_csv(os.path.join(ROOT, "artifacts", "data.csv"))
+
+
+@pytest.fixture(scope="session")
+def features_df(students):
+    return students[FEATURE_COLUMNS]
+
+
+@pytest.fixture(scope="session")
+def preprocessor(features_df):
+    return DataTransformation().get_data_transformer_object().fit(features_df)
+
+
+@pytest.fixture(scope="session")
+def X(preprocessor, features_df):
+    return np.asarray(preprocessor.transform(features_df), dtype=np.float64)
+
+
+@pytest.fixture(scope="session")
+def y(students):
+    return students[TARGET_COLUMN].to_numpy(dtype=np.float64)
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import MinMaxScaler
+
+from src.components.compiled_preprocessor import CompiledPreprocessor, export_compiled_preprocessor
+from src.exception import CustomException
+
+
+@pytest.fixture(scope="module")
+def compiled(preprocessor):
+    return CompiledPreprocessor.from_column_transformer(preprocessor)
+
+
+@pytest.fixture(scope="module")
+def with_missing(features_df):
+    df = features_df.head(50).copy()
+    df.loc[df.index[0], "gender"] = None
+    df.loc[df.index[1], "reading_score"] = np.nan
+    df.loc[df.index[2], "lunch"] = np.nan
+    return df
+
+
+def test_transform_matches_sklearn(preprocessor, compiled, features_df):
+    assert np.array_equal(compiled.transform(features_df), preprocessor.transform(features_df))
+
+
+def test_transform_record_matches_sklearn(preprocessor, compiled, features_df):
+    expected = preprocessor.transform(features_df.head(100))
+    for i, record in enumerate(features_df.head(100).to_dict("records")):
+        assert np.array_equal(compiled.transform_record(record), expected[i:i + 1])
+
+
+def test_missing_values_are_imputed_like_sklearn(preprocessor, compiled, with_missing):
+    expected = preprocessor.transform(with_missing)
+    assert np.array_equal(compiled.transform(with_missing), expected)
+    for i, record in enumerate(with_missing.head(3).to_dict("records")):
+        assert np.array_equal(compiled.transform_record(record), expected[i:i + 1])
+
+
+def test_unknown_category_raises(compiled, features_df):
+    record = dict(features_df.iloc[0], gender="alien")
+    with pytest.raises(ValueError):
+        compiled.transform_record(record)
+
+
+def test_export_round_trip(preprocessor, features_df, tmp_path):
+    path = str(tmp_path / "preprocessor_compiled.npz")
+    assert export_compiled_preprocessor(preprocessor, features_df, path) == path
+    loaded = CompiledPreprocessor.load(path)
+    assert np.array_equal(loaded.transform(features_df), preprocessor.transform(features_df))
+
+
+def test_unsupported_preprocessor_removes_stale_export(preprocessor, features_df, tmp_path):
+    path = str(tmp_path / "preprocessor_compiled.npz")
+    export_compiled_preprocessor(preprocessor, features_df, path)
+    assert os.path.exists(path)
+
+    unsupported = ColumnTransformer([
+        ("num", Pipeline([("scaler", MinMaxScaler())]), ["reading_score", "writing_score"]),
+    ]).fit(features_df)
+    with pytest.raises(CustomException):
+        CompiledPreprocessor.from_column_transformer(unsupported)
+    assert export_compiled_preprocessor(unsupported, features_df, path) is None
+    assert not os.path.exists(path)
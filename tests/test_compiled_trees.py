@@ -0,0 +1,67 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import (
+    AdaBoostRegressor,
+    ExtraTreesRegressor,
+    GradientBoostingRegressor,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression
+from sklearn.tree import DecisionTreeRegressor
+
+from src.components.compiled_trees import CompiledTreeEnsemble, export_compiled_trees
+
+MODELS = {
+    "DecisionTree": lambda: DecisionTreeRegressor(random_state=0),
+    "RandomForest": lambda: RandomForestRegressor(n_estimators=16, random_state=0),
+    "ExtraTrees": lambda: ExtraTreesRegressor(n_estimators=16, random_state=0),
+    "GradientBoosting": lambda: GradientBoostingRegressor(n_estimators=32, subsample=0.8, random_state=0),
+    "AdaBoost": lambda: AdaBoostRegressor(n_estimators=16, random_state=0),
+}
+
+
+@pytest.fixture(scope="module", params=list(MODELS))
+def model(request, X, y):
+    return MODELS[request.param]().fit(X, y)
+
+
+@pytest.mark.parametrize("n_rows", [1, 7, None])
+def test_predict_matches_model_exactly(model, X, n_rows):
+    rows = X[:n_rows]
+    compiled = CompiledTreeEnsemble.from_model(model)
+    assert np.array_equal(compiled.predict(rows), model.predict(rows))
+
+
+def test_predict_matches_model_on_float32_input(model, X):
+    rows = X.astype(np.float32)
+    assert np.array_equal(CompiledTreeEnsemble.from_model(model).predict(rows), model.predict(rows))
+
+
+def test_save_load_round_trip(model, X, tmp_path):
+    path = str(tmp_path / "model_compiled.npz")
+    CompiledTreeEnsemble.from_model(model).save(path)
+    loaded = CompiledTreeEnsemble.load(path)
+    assert np.array_equal(loaded.predict(X), model.predict(X))
+    assert np.array_equal(loaded.predict(X[:1]), model.predict(X[:1]))
+
+
+def test_export_writes_checked_model(model, X, tmp_path):
+    path = str(tmp_path / "model_compiled.npz")
+    assert export_compiled_trees(path, model, X_check=X) == path
+    assert np.array_equal(CompiledTreeEnsemble.load(path).predict(X), model.predict(X))
+
+
+def test_export_of_unsupported_model_removes_stale_file(X, y, tmp_path):
+    path = str(tmp_path / "model_compiled.npz")
+    export_compiled_trees(path, DecisionTreeRegressor(random_state=0).fit(X, y))
+    assert os.path.exists(path)
+
+    assert export_compiled_trees(path, LinearRegression().fit(X, y)) is None
+    assert not os.path.exists(path)
+
+
+def test_rejects_wrong_feature_count(model, X):
+    with pytest.raises(ValueError):
+        CompiledTreeEnsemble.from_model(model).predict(X[:, :-1])
@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.components.fit_cache import FitCache, array_fingerprint, estimator_fingerprint
+from src.exception import CustomException
+
+
+def test_put_get_round_trip(tmp_path):
+    cache = FitCache(cache_dir=str(tmp_path))
+    key = cache.key("data", 3, 0, "model")
+    assert cache.get(key) is None
+    cache.put(key, {"score": 0.5})
+    assert cache.get(key) == {"score": 0.5}
+    assert cache.stats() == {"hits": 1, "misses": 1}
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+
+def test_unreadable_entry_is_a_miss(tmp_path):
+    cache = FitCache(cache_dir=str(tmp_path))
+    key = cache.key("data")
+    cache.put(key, {"score": 0.5})
+    with open(cache._path(key), "wb") as file_obj:
+        file_obj.write(b"not a pickle")
+    assert cache.get(key) is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_failed_put_leaves_no_temp_file(tmp_path):
+    class Unpicklable:
+        def __reduce__(self):
+            raise RuntimeError("cannot pickle")
+
+    cache = FitCache(cache_dir=str(tmp_path))
+    with pytest.raises(CustomException):
+        cache.put(cache.key("data"), Unpicklable())
+    assert os.listdir(tmp_path) == []
+
+
+def test_key_depends_on_library_versions(tmp_path):
+    cache = FitCache(cache_dir=str(tmp_path))
+    key = cache.key("data")
+    cache._versions = cache._versions[:-1] + (("catboost", "0.0"),)
+    assert cache.key("data") != key
+
+
+def test_fitted_estimator_round_trip(tmp_path, X, y):
+    cache = FitCache(cache_dir=str(tmp_path))
+    model = RandomForestRegressor(n_estimators=4, random_state=0)
+    key = cache.key(array_fingerprint(X, y), "refit", estimator_fingerprint(model, {"n_estimators": 4}))
+    cache.put(key, model.fit(X, y))
+    assert np.array_equal(cache.get(key).predict(X), model.predict(X))
+
+
+def test_fingerprints_ignore_scheduling_params():
+    model = RandomForestRegressor()
+    assert estimator_fingerprint(model, {"n_jobs": 1}) == estimator_fingerprint(model, {"n_jobs": 8})
+    assert estimator_fingerprint(model, {"n_estimators": 8}) != estimator_fingerprint(model, {"n_estimators": 16})
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = FitCache(cache_dir=str(tmp_path), max_bytes=1)
+    for i in range(3):
+        cache.put(cache.key(i), np.zeros(100))
+    assert cache.evict() == 3
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,41 @@
+import numpy as np
+
+from src.components.compiled_preprocessor import CompiledPreprocessor
+from src.components.data_storage import to_categorical
+from src.components.fused_preprocessor import FusedPreprocessor, build_fused_preprocessor
+
+
+def test_transform_matches_sklearn(preprocessor, features_df):
+    fused = FusedPreprocessor.from_column_transformer(preprocessor)
+    expected = preprocessor.transform(features_df)
+    assert np.array_equal(fused.transform(features_df), expected)
+    assert np.array_equal(fused.transform(features_df.head(1)), expected[:1])
+
+
+def test_categorical_input_matches_sklearn(preprocessor, features_df):
+    fused = FusedPreprocessor.from_column_transformer(preprocessor)
+    categorical_df = to_categorical(features_df.copy())
+    assert np.array_equal(fused.transform(categorical_df), preprocessor.transform(features_df))
+
+
+def test_writes_into_given_buffer(preprocessor, features_df):
+    fused = FusedPreprocessor(CompiledPreprocessor.from_column_transformer(preprocessor))
+    out = np.empty((len(features_df), fused.n_output), dtype=np.float32)
+    result = fused.transform(features_df, out=out)
+    assert np.shares_memory(result, out)
+    assert np.array_equal(out, preprocessor.transform(features_df).astype(np.float32))
+
+
+def test_reused_buffer_does_not_leak_rows(preprocessor, features_df):
+    # The per-thread buffer is reused across calls; a smaller batch after a
+    # larger one must not pick up the previous rows.
+    fused = FusedPreprocessor.from_column_transformer(preprocessor)
+    fused.transform(features_df)
+    small = features_df.tail(3)
+    assert np.array_equal(fused.transform(small), preprocessor.transform(small))
+
+
+def test_build_validates_against_sklearn(preprocessor, features_df):
+    fused = build_fused_preprocessor(preprocessor, features_df)
+    assert fused is not None
+    assert np.array_equal(fused.transform(features_df), preprocessor.transform(features_df))
@@ -0,0 +1,31 @@
+import pytest
+
+from src.exception import CustomException, InvalidInputError
+from src.pipeline.micro_batcher import MicroBatcher
+
+
+class StubPipeline:
+    # Batch scoring always fails, so every record takes the per-record path.
+    def __init__(self, error):
+        self.error = error
+
+    def load_artifacts(self):
+        raise RuntimeError("batch path unavailable")
+
+    def predict_record(self, record):
+        raise self.error
+
+
+@pytest.mark.parametrize("error, expected", [
+    (InvalidInputError("Unknown category"), InvalidInputError),
+    (RuntimeError("model file is corrupt"), CustomException),
+])
+def test_per_record_fallback_keeps_input_errors(error, expected):
+    batcher = MicroBatcher(predict_pipeline=StubPipeline(error))
+    try:
+        with pytest.raises(expected) as info:
+            batcher.predict({"gender": "female"}, timeout=5)
+    finally:
+        batcher.stop()
+    if expected is InvalidInputError:
+        assert info.value is error
@@ -0,0 +1,58 @@
+import json
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from src.components.compiled_trees import CompiledTreeEnsemble
+from src.exception import CustomException
+from src.utils import load_object_mmap, remove_object_mmap, save_object_mmap
+
+
+@pytest.fixture(scope="module")
+def forest(X, y):
+    return RandomForestRegressor(n_estimators=8, random_state=0).fit(X, y)
+
+
+@pytest.fixture
+def manifest_path(forest, tmp_path):
+    path = str(tmp_path / "model_mmap" / "model.json")
+    save_object_mmap(path, CompiledTreeEnsemble.from_model(forest), {"model_name": "Random Forest"})
+    return path
+
+
+@pytest.mark.parametrize("n_rows", [1, None])
+def test_round_trip_predicts_like_model(forest, manifest_path, X, n_rows):
+    loaded = load_object_mmap(manifest_path)
+    assert np.array_equal(loaded.predict(X[:n_rows]), forest.predict(X[:n_rows]))
+
+
+def test_arrays_are_mapped_not_copied(manifest_path):
+    loaded = load_object_mmap(manifest_path)
+    for name in ("feature", "threshold", "children", "value"):
+        array = getattr(loaded, name)
+        assert not array.flags.owndata
+        assert not array.flags.writeable
+
+
+def test_manifest_keeps_metadata(manifest_path):
+    with open(manifest_path) as file_obj:
+        assert json.load(file_obj)["model_name"] == "Random Forest"
+
+
+def test_corrupted_buffer_is_rejected(manifest_path):
+    with open(manifest_path) as file_obj:
+        buffers_file = json.load(file_obj)["buffers_file"]
+    path = os.path.join(os.path.dirname(manifest_path), buffers_file)
+    with open(path, "r+b") as file_obj:
+        first = file_obj.read(1)
+        file_obj.seek(0)
+        file_obj.write(bytes([first[0] ^ 0xFF]))
+    with pytest.raises(CustomException):
+        load_object_mmap(manifest_path)
+
+
+def test_remove_drops_manifest_and_data_files(manifest_path):
+    remove_object_mmap(manifest_path)
+    assert os.listdir(os.path.dirname(manifest_path)) == []
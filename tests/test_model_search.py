@@ -0,0 +1,21 @@
+import numpy as np
+from sklearn.ensemble import GradientBoostingRegressor
+
+from src.components.model_search import SearchBudget, search_models, split_validation
+
+
+def test_validation_slice_comes_from_training_fold():
+    train_idx = np.arange(200, 1000)
+    fit_idx, val_idx = split_validation(train_idx, 0.1, 42)
+    assert len(val_idx) == 80
+    assert np.array_equal(np.sort(np.concatenate([fit_idx, val_idx])), train_idx)
+    fit_again, val_again = split_validation(train_idx, 0.1, 42)
+    assert np.array_equal(val_idx, val_again) and np.array_equal(fit_idx, fit_again)
+
+
+def test_staged_early_stopping_scores_within_grid(X, y):
+    models = {"GB": GradientBoostingRegressor(random_state=0)}
+    param = {"GB": {"n_estimators": [8, 64]}}
+    results = search_models(X, y, models, param, strategy="staged", budget=SearchBudget(early_stopping_rounds=4))
+    best = results["GB"]["best_params"]["n_estimators"]
+    assert 1 <= best <= 64
@@ -0,0 +1,56 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.components.native_model import NativeBoosterPredictor, export_native_model
+from src.exception import CustomException
+
+
+def xgboost_model(X, y):
+    from xgboost import XGBRegressor
+
+    return XGBRegressor(n_estimators=20, max_depth=4, n_jobs=1).fit(X, y)
+
+
+def catboost_model(X, y):
+    from catboost import CatBoostRegressor
+
+    return CatBoostRegressor(iterations=20, depth=4, verbose=False, allow_writing_files=False,
+                             thread_count=1).fit(X, y)
+
+
+@pytest.fixture(scope="module", params=[xgboost_model, catboost_model], ids=["xgboost", "catboost"])
+def booster_model(request, X, y):
+    return request.param(X, y)
+
+
+@pytest.mark.parametrize("n_rows", [1, None])
+def test_round_trip_predicts_like_wrapper(booster_model, X, tmp_path, n_rows):
+    manifest_path = str(tmp_path / "model_native.json")
+    assert export_native_model(manifest_path, booster_model, {"model_name": "test"}, X_check=X) == manifest_path
+
+    predictor = NativeBoosterPredictor.load(manifest_path)
+    rows = X[:n_rows]
+    np.testing.assert_allclose(predictor.predict(rows), booster_model.predict(rows), rtol=1e-6, atol=1e-6)
+    assert predictor.manifest["model_name"] == "test"
+
+
+def test_tampered_model_file_is_rejected(booster_model, X, tmp_path):
+    manifest_path = str(tmp_path / "model_native.json")
+    export_native_model(manifest_path, booster_model)
+    model_file = next(p for p in os.listdir(tmp_path) if p != "model_native.json")
+    with open(tmp_path / model_file, "ab") as file_obj:
+        file_obj.write(b"\0")
+    with pytest.raises(CustomException):
+        NativeBoosterPredictor.load(manifest_path)
+
+
+def test_other_models_remove_previous_export(booster_model, X, y, tmp_path):
+    manifest_path = str(tmp_path / "model_native.json")
+    export_native_model(manifest_path, booster_model)
+    assert os.listdir(tmp_path)
+
+    assert export_native_model(manifest_path, LinearRegression().fit(X, y)) is None
+    assert os.listdir(tmp_path) == []
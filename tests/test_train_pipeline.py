@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from src.pipeline.train_pipeline import TrainPipeline
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def stage_code(out_of_core):
+    pipeline = TrainPipeline()
+    pipeline.train_pipeline_config.out_of_core = out_of_core
+    return {stage.name: {os.path.relpath(path, ROOT) for path in stage.code} for stage in pipeline.stages()}
+
+
+@pytest.mark.parametrize("out_of_core", [False, True])
+def test_stage_code_covers_executed_modules(out_of_core):
+    code = stage_code(out_of_core)
+    assert {"src/components/compiled_preprocessor.py", "src/components/fused_preprocessor.py"} <= \
+        code["transformation"]
+    assert {"src/utils.py", "src/components/fit_cache.py", "src/components/compiled_trees.py",
+            "src/components/native_model.py", "src/components/prediction_table.py"} <= code["training"]
+
+
+def test_script_entry_points_are_not_stage_code():
+    # data_ingestion's __main__ block runs the whole pipeline; editing the
+    # trainer must not invalidate ingestion.
+    assert "src/components/model_trainer.py" not in stage_code(False)["ingestion"]